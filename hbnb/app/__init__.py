@@ -1,34 +1,81 @@
 # app/__init__.py
 
-from flask import Flask
-from flask_restx import Api
-from app.api.v1.users import api as users_ns
-from app.api.v1.amenities import api as amenities_ns
-from app.api.v1.places import api as places_ns
-from app.api.v1.reviews import api as reviews_ns
+import os
 
 
-def create_app():
+def create_app(config_name=None):
+    """
+    Build the Flask application.
+
+    Flask, flask-restx and the API namespaces are imported here rather than at module
+    level so that importing the `app` package (models, services, tools) stays cheap
+    and the namespaces are only built when an application is actually created.
+
+    Args:
+        config_name (str, optional): Key into config.config. Defaults to the FLASK_CONFIG
+            environment variable, or 'default'.
+
+    Returns:
+        Flask: The configured application.
+    """
+    from flask import Flask
+    from flask_restx import Api
+    from config import config
+
     app = Flask(__name__)
-    
-    # Initialize the Flask-RESTx API
-    api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API')
-
-    # Placeholder for API namespaces (endpoints will be added later)
-    # from .api.v1.users import api as users_ns
-    # from .api.v1.places import api as places_ns
-    # from .api.v1.reviews import api as reviews_ns
-    # from .api.v1.amenities import api as amenities_ns
-
-    # Add namespaces to the API (will be uncommented and implemented later)
-    # api.add_namespace(users_ns)
-    # api.add_namespace(places_ns)
-    # api.add_namespace(reviews_ns)
-    # api.add_namespace(amenities_ns)
+    app.config.from_object(config[config_name or os.getenv('FLASK_CONFIG', 'default')])
+
+    # Initialize the Flask-RESTx API; Swagger UI and spec routes are skipped when disabled
+    swagger = app.config['SWAGGER_ENABLED']
+    api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API',
+              doc='/' if swagger else False, add_specs=swagger)
+
+    # Installed first so that profiled requests include the other hooks
+    from .api.profiling import Profiler
+    Profiler(app)
+
+    # One unit of work per request: the facade loads each entity at most once per request
+    from flask import g
+    from .services import identity
+
+    @app.before_request
+    def begin_unit_of_work():
+        g.identity_token = identity.begin()
+
+    @app.teardown_request
+    def end_unit_of_work(exc=None):
+        token = g.pop('identity_token', None)
+        if token is not None:
+            identity.end(token)
+
+    from .api.ratelimit import RateLimiter
+    RateLimiter(app)
+
+    from .api.compression import Compressor
+    Compressor(app)
+
+    if app.config.get('REVIEW_ARCHIVE_PATH'):
+        from .services.facade import HBnBFacade
+        HBnBFacade.enable_review_archive(app.config['REVIEW_ARCHIVE_PATH'],
+                                         app.config['REVIEW_ARCHIVE_AFTER_DAYS'],
+                                         app.config['REVIEW_ARCHIVE_INTERVAL'])
+
+    if app.config.get('INTEGRITY_SWEEP_INTERVAL'):
+        from .services.facade import HBnBFacade
+        HBnBFacade.start_sweeper(app.config['INTEGRITY_SWEEP_INTERVAL'], app.config['INTEGRITY_SWEEP_BATCH'])
+
+    from .api.v1.users import api as users_ns
+    from .api.v1.amenities import api as amenities_ns
+    from .api.v1.places import api as places_ns
+    from .api.v1.reviews import api as reviews_ns
+    from .api.v1.changes import api as changes_ns
+    from .api.v1.batch import api as batch_ns
+
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
+    api.add_namespace(changes_ns, path='/api/v1/changes')
+    api.add_namespace(batch_ns, path='/api/v1/batch')
 
-    
     return app
\ No newline at end of file
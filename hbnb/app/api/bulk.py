@@ -0,0 +1,62 @@
+from flask_restx import fields
+from app.api import sparse
+
+# Upper bound on the number of IDs accepted by one batch lookup
+MAX_BATCH_IDS = 100
+
+
+def ids_model(api):
+    """
+    Register the request body model of the POST batch lookups on a namespace.
+
+    Args:
+        api (Namespace): The namespace to register the model on.
+
+    Returns:
+        Model: The model.
+    """
+    return api.model('BatchIds', {
+        'ids': fields.List(fields.String, required=True, description='IDs to retrieve, at most %d' % MAX_BATCH_IDS),
+        'fields': fields.List(fields.String, description='Fields to return')
+    })
+
+
+def validate_ids(ids):
+    """
+    Check a list of IDs requested in one batch.
+
+    Args:
+        ids (list): The requested IDs.
+
+    Returns:
+        str: An error message, or None if the list is valid.
+    """
+    if not isinstance(ids, list) or not all(isinstance(obj_id, str) for obj_id in ids):
+        return 'ids must be a list of strings'
+    if not ids:
+        return 'ids must not be empty'
+    if len(ids) > MAX_BATCH_IDS:
+        return f'At most {MAX_BATCH_IDS} ids can be requested at once'
+    return None
+
+
+def batch_response(lookup, ids, fields=None, serialize=None):
+    """
+    Run a batched facade lookup and build the response.
+
+    Args:
+        lookup (callable): Facade method returning (objects, missing_ids) for a list of IDs.
+        ids (list): The requested IDs, already validated.
+        fields (tuple, optional): Sparse fieldset applied to every item.
+        serialize (callable, optional): Builds an item from an object. Defaults to its to_dict().
+
+    Returns:
+        tuple: (body, status_code), where the body lists the items in request order
+            and the IDs that were not found.
+    """
+    objects, missing = lookup(ids)
+    serialize = serialize or (lambda obj: obj.to_dict())
+    return {
+        'items': [sparse.select_fields(serialize(obj), fields) for obj in objects],
+        'missing': missing
+    }, 200
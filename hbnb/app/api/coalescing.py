@@ -0,0 +1,53 @@
+import functools
+from flask import current_app, request
+from app.services.facade import get_facade
+
+# Request headers that change the representation of a read, besides the URL
+VARYING_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+
+def request_key(**view_args):
+    """
+    Default coalescing key: the method, path and query arguments of the current
+    request, plus the conditional headers, which decide between 200 and 304.
+
+    Args:
+        **view_args: The arguments the view was called with; they are part of the path.
+
+    Returns:
+        tuple: The key.
+    """
+    return (request.method, request.path,
+            tuple(sorted(request.args.items(multi=True))),
+            tuple(request.headers.get(name) for name in VARYING_HEADERS))
+
+
+def coalesced(key=request_key):
+    """
+    Decorate a read-only view so that concurrent identical requests share one run of it.
+
+    The view's return value, a (body, status, headers) tuple or anything else Flask
+    turns into a response, is handed to every request sharing the run, so it must
+    not be a Response object, which the after-request hooks modify. See
+    HBnBFacade.coalesce().
+
+    Configuration (app.config):
+        COALESCING_ENABLED (bool): Turn coalescing on. Defaults to True.
+
+    Args:
+        key (callable, optional): Called with the view's arguments in the request
+            context, returns the hashable key identifying the request; requests with
+            equal keys must get equal responses. Defaults to request_key().
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('COALESCING_ENABLED', True):
+                return view(*args, **kwargs)
+            view_key = (view.__qualname__, key(**kwargs))
+            return get_facade().coalesce(view_key, lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+import gzip
+from flask import request
+from app.persistence.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Response types worth compressing; images and the like are already compressed
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class Compressor:
+    """
+    Negotiated response compression, installed as an after_request hook.
+
+    Responses are compressed with brotli (when installed) or gzip, according to the
+    client's Accept-Encoding, once they reach a minimum size. Responses carrying an
+    ETag are immutable for that tag, so their compressed bodies are cached by
+    (URL, ETag, encoding) and compressed only once. The ETag of a compressed response gets
+    an encoding suffix so that it stays strong and distinct per representation; the
+    conditional request helpers understand the suffix.
+
+    Configuration (app.config):
+        COMPRESSION_ENABLED (bool): Turn compression on.
+        COMPRESSION_MIN_SIZE (int): Smallest body, in bytes, that gets compressed.
+        COMPRESSION_LEVEL (int): Compression level (gzip 1-9, brotli quality 0-11).
+        COMPRESSION_CACHE_SIZE (int): Number of compressed bodies kept.
+    """
+    def __init__(self, app=None):
+        """
+        Initialize the compressor.
+
+        Args:
+            app (Flask, optional): The application to install on.
+        """
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Read the configuration and register the after_request hook.
+
+        Args:
+            app (Flask): The application to install on.
+        """
+        if not app.config.get('COMPRESSION_ENABLED'):
+            return
+        self.min_size = app.config['COMPRESSION_MIN_SIZE']
+        self.level = app.config['COMPRESSION_LEVEL']
+        self.cache = LRUCache(app.config['COMPRESSION_CACHE_SIZE'])
+        app.after_request(self._compress)
+
+    def _choose_encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, data, encoding):
+        """
+        Compress a body with the given encoding.
+
+        Args:
+            data (bytes): The body to compress.
+            encoding (str): 'gzip' or 'br'.
+
+        Returns:
+            bytes: The compressed body.
+        """
+        if encoding == 'br':
+            return brotli.compress(data, quality=min(self.level, 11))
+        # mtime=0 keeps the output deterministic for a given body
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def _compress(self, response):
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        encoding = self._choose_encoding()
+        if encoding is None or (response.content_length or 0) < self.min_size:
+            return response
+
+        # The ETag identifies the entity state, the path and query the representation
+        etag, weak = response.get_etag()
+        key = (request.full_path, etag, encoding) if etag and not weak else None
+        body = self.cache.get(key) if key else None
+        if body is None:
+            body = self.compress(response.get_data(), encoding)
+            if key:
+                self.cache.set(key, body)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
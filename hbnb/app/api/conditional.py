@@ -0,0 +1,155 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import request
+from werkzeug.http import http_date
+
+# Suffixes appended to the ETag of a compressed representation (see app.api.compression)
+ENCODING_SUFFIXES = ('', '-gzip', '-br')
+
+
+def _digest(entities):
+    state = ';'.join(f"{entity.id}:{entity.version}" for entity in entities if entity)
+    return hashlib.sha1(state.encode('utf-8')).hexdigest()
+
+
+def make_etag(*entities):
+    """
+    Build a strong ETag from the id and version of every entity in a representation.
+
+    The first entity is the resource itself and the others the relations embedded in
+    it. The tag starts with the resource's own digest, followed by '.' and a digest of
+    the relations if there are any, so that If-Match can be checked against the
+    resource alone: a change to an embedded review must not fail an update of the place.
+
+    Args:
+        *entities (BaseModel): The entities whose state makes up the response body.
+
+    Returns:
+        str: The unquoted ETag value.
+    """
+    etag = _digest(entities[:1])
+    if len(entities) > 1:
+        etag += '.' + _digest(entities[1:])
+    return etag
+
+
+def last_modified(*entities):
+    """
+    Return the most recent updated_at of the given entities as an aware UTC datetime.
+
+    Args:
+        *entities (BaseModel): The entities whose state makes up the response body.
+
+    Returns:
+        datetime: The latest modification time truncated to whole seconds, or None.
+    """
+    stamps = [entity.updated_at for entity in entities
+              if entity and isinstance(entity.updated_at, datetime)]
+    if not stamps:
+        return None
+    # HTTP dates only carry whole seconds
+    return max(stamps).astimezone(timezone.utc).replace(microsecond=0)
+
+
+def validator_headers(etag, modified=None):
+    """
+    Build the ETag and Last-Modified response headers.
+
+    Args:
+        etag (str): The unquoted ETag value.
+        modified (datetime, optional): The Last-Modified time.
+
+    Returns:
+        dict: The response headers.
+    """
+    headers = {'ETag': f'"{etag}"'}
+    if modified:
+        headers['Last-Modified'] = http_date(modified)
+    return headers
+
+
+def is_not_modified(etag, modified=None):
+    """
+    Evaluate If-None-Match and If-Modified-Since against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when the
+    client did not send an entity tag.
+
+    Args:
+        etag (str): The unquoted ETag value of the current representation.
+        modified (datetime, optional): The Last-Modified time of the current representation.
+
+    Returns:
+        bool: True if the client's cached copy is still fresh (respond with 304).
+    """
+    if request.if_none_match:
+        return any(request.if_none_match.contains_weak(etag + suffix) for suffix in ENCODING_SUFFIXES)
+    if request.if_modified_since and modified:
+        return modified <= request.if_modified_since
+    return False
+
+
+def is_precondition_failed(etag):
+    """
+    Evaluate If-Match against the current ETag of the resource itself.
+
+    Only the resource's own part of the tags sent is compared (see make_etag), so any
+    ETag the client got for the resource, whatever it embedded or however it was
+    encoded, is accepted as long as the resource did not change.
+
+    The check alone is not atomic with the write that follows it: pass
+    expected_version() to the update so that the repository compares the version
+    again under its lock.
+
+    Args:
+        etag (str): The unquoted ETag value of the resource, make_etag(resource).
+
+    Returns:
+        bool: True if the client sent If-Match and it does not match (respond with 412).
+    """
+    if not request.if_match:
+        return False
+    if request.if_match.star_tag:
+        return False
+    resource_etag = etag.split('.', 1)[0]
+    return not any(_resource_part(tag) == resource_etag for tag in request.if_match.as_set())
+
+
+def _resource_part(tag):
+    # Digests are hexadecimal, so '.' and '-' only appear as separators
+    return tag.split('.', 1)[0].split('-', 1)[0]
+
+
+def expected_version(entity):
+    """
+    Return the version an update must find the entity at, given the If-Match header.
+
+    Call it once is_precondition_failed() has accepted the request for the entity.
+
+    Args:
+        entity (BaseModel): The entity as it was when the precondition was evaluated.
+
+    Returns:
+        int: The entity's version if the client sent If-Match, otherwise None.
+    """
+    return entity.version if request.if_match else None
+
+
+def not_modified_response(etag, modified=None):
+    """
+    Build an empty 304 response carrying the current validators.
+
+    Returns:
+        tuple: (body, status_code, headers)
+    """
+    return '', 304, validator_headers(etag, modified)
+
+
+def precondition_failed_response(etag):
+    """
+    Build a 412 response carrying the current ETag.
+
+    Returns:
+        tuple: (body, status_code, headers)
+    """
+    return {'error': 'Precondition failed'}, 412, validator_headers(etag)
@@ -0,0 +1,199 @@
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from flask import Response, g, request
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stacks of registered threads.
+
+    A single background thread wakes up every `interval` seconds while at least one
+    thread is registered, reads the current frame of each registered thread with
+    sys._current_frames() and counts its stack. Stacks are kept collapsed, one
+    'label;outer;...;inner' string per distinct stack, the input format of flame
+    graph tools. The profiled threads themselves run untouched, so the cost is the
+    sampler's own work, and nothing at all runs while no thread is registered.
+
+    Attributes:
+        interval (float): Seconds between two samples.
+        max_stacks (int): Number of distinct stacks kept; samples of new stacks beyond it are dropped.
+        dropped (int): Number of samples dropped because max_stacks was reached.
+    """
+    def __init__(self, interval=0.005, max_stacks=10000):
+        """
+        Initialize the profiler; the sampler thread starts with the first registration.
+
+        Args:
+            interval (float, optional): Seconds between two samples. Defaults to 0.005.
+            max_stacks (int, optional): Number of distinct stacks kept. Defaults to 10000.
+        """
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.dropped = 0
+        self._stacks = Counter()
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._sampler = None
+
+    def register(self, label, thread_id=None):
+        """
+        Start sampling a thread, attributing its samples to `label`.
+
+        Args:
+            label (str): Root of the collapsed stacks, e.g. the endpoint.
+            thread_id (int, optional): The thread to sample. Defaults to the calling thread.
+        """
+        with self._lock:
+            self._threads[thread_id or threading.get_ident()] = label
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._sampler.start()
+            self._active.set()
+
+    def unregister(self, thread_id=None):
+        """
+        Stop sampling a thread.
+
+        Args:
+            thread_id (int, optional): The thread to stop sampling. Defaults to the calling thread.
+        """
+        with self._lock:
+            self._threads.pop(thread_id or threading.get_ident(), None)
+            if not self._threads:
+                self._active.clear()
+
+    def _run(self):
+        while True:
+            # Blocks while no thread is registered
+            self._active.wait()
+            self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self):
+        with self._lock:
+            threads = dict(self._threads)
+        frames = sys._current_frames()
+        collapsed = []
+        for thread_id, label in threads.items():
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            names.append(label)
+            collapsed.append(';'.join(reversed(names)))
+        with self._lock:
+            for stack in collapsed:
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self.dropped += 1
+
+    def collapsed(self, prefix=None):
+        """
+        Return the aggregated samples as collapsed stacks.
+
+        Args:
+            prefix (str, optional): Only return the stacks whose label starts with this.
+
+        Returns:
+            str: One 'stack count' line per distinct stack, most frequent first.
+        """
+        with self._lock:
+            items = self._stacks.most_common()
+        return ''.join(f"{stack} {count}\n" for stack, count in items
+                       if prefix is None or stack.startswith(prefix))
+
+    def reset(self):
+        """
+        Drop the samples collected so far.
+        """
+        with self._lock:
+            self._stacks.clear()
+            self.dropped = 0
+
+
+class Profiler:
+    """
+    Opt-in request profiling, installed as before/teardown request hooks.
+
+    A request is profiled when it carries the admin token in the X-Profile-Token
+    header, or otherwise with probability PROFILING_SAMPLE_RATE. Samples of a
+    profiled request are attributed to 'METHOD rule', so each endpoint gets its own
+    flame graph. The collapsed stacks are served to holders of the token at
+    GET /api/v1/admin/profile (optionally ?endpoint=GET /api/v1/places/<place_id>),
+    and DELETE on the same URL resets them. When profiling is disabled no hook is
+    installed at all.
+
+    Configuration (app.config):
+        PROFILING_ENABLED (bool): Install the profiler.
+        PROFILING_SAMPLE_RATE (float): Fraction of requests profiled without the header.
+        PROFILING_TOKEN (str): Token for the header and the admin endpoint; without it the
+            endpoint is not served and only sampled requests are profiled.
+        PROFILING_INTERVAL (float): Seconds between two stack samples.
+        PROFILING_MAX_STACKS (int): Number of distinct stacks kept.
+    """
+    def __init__(self, app=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            app (Flask, optional): The application to install on.
+        """
+        self.sampler = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Read the configuration and register the request hooks and the admin endpoint.
+
+        Args:
+            app (Flask): The application to install on.
+        """
+        if not app.config.get('PROFILING_ENABLED'):
+            return
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0)
+        self.token = app.config.get('PROFILING_TOKEN')
+        self.sampler = SamplingProfiler(app.config.get('PROFILING_INTERVAL', 0.005),
+                                        app.config.get('PROFILING_MAX_STACKS', 10000))
+
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+        if self.token:
+            app.add_url_rule('/api/v1/admin/profile', 'admin_profile', self._report, methods=['GET', 'DELETE'])
+
+    def _authorized(self):
+        supplied = request.headers.get('X-Profile-Token')
+        return bool(self.token and supplied and hmac.compare_digest(supplied, self.token))
+
+    def _start(self):
+        if request.endpoint == 'admin_profile':
+            return
+        if self._authorized() or random.random() < self.sample_rate:
+            rule = request.url_rule.rule if request.url_rule else request.path
+            self.sampler.register(f"{request.method} {rule}")
+            g.profiled = True
+
+    def _stop(self, exc=None):
+        if g.pop('profiled', False):
+            self.sampler.unregister()
+
+    def _report(self):
+        if not self._authorized():
+            return {'error': 'Forbidden'}, 403
+        if request.method == 'DELETE':
+            self.sampler.reset()
+            return '', 204
+        body = self.sampler.collapsed(request.args.get('endpoint'))
+        return Response(body, mimetype='text/plain',
+                        headers={'X-Profile-Dropped-Samples': str(self.sampler.dropped)})
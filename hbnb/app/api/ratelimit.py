@@ -0,0 +1,149 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import g, request
+
+
+class InMemoryBucketStore:
+    """
+    Token buckets kept in process memory, one per client key.
+
+    Any object exposing the same take() method can be passed to RateLimiter instead,
+    for example one backed by a cache server shared between workers.
+
+    Buckets are kept in least recently used order and the least recently used one
+    is evicted once more than `max_keys` clients are tracked, so a client cycling
+    through keys costs O(1) per request. An evicted client starts again from a full
+    bucket, which the least recently seen one has usually refilled anyway.
+
+    Attributes:
+        max_keys (int): Number of tracked clients.
+    """
+    def __init__(self, max_keys=100000):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_keys (int, optional): Number of tracked clients. Defaults to 100000.
+        """
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, cost, rate, burst):
+        """
+        Try to take `cost` tokens from the bucket of `key`.
+
+        Args:
+            key (str): The client key.
+            cost (float): Number of tokens the request costs.
+            rate (float): Tokens added to the bucket per second.
+            burst (float): Bucket capacity.
+
+        Returns:
+            tuple: (allowed, retry_after) where retry_after is the number of seconds until
+                enough tokens are available (0 when allowed).
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets
+            tokens, last = buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            # Reinserted, so the bucket moves to the most recently used end
+            if tokens >= cost:
+                buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0
+            else:
+                buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            while len(buckets) > self.max_keys:
+                buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class RateLimiter:
+    """
+    Admission control for the API, installed as before/teardown request hooks.
+
+    Two checks run before each request, in this order:
+        - a global cap on in-flight requests, answered with 503 when reached, so
+          load is shed before latency collapses; a shed request costs no token;
+        - a per-client token bucket, where each route has a cost (unpaginated list
+          endpoints cost more), answered with 429 when the bucket is empty.
+    Both responses carry a Retry-After header.
+
+    Configuration (app.config):
+        RATE_LIMIT_ENABLED (bool): Turn the limiter on.
+        RATE_LIMIT_RATE (float): Tokens refilled per second and client.
+        RATE_LIMIT_BURST (float): Bucket capacity per client.
+        RATE_LIMIT_COSTS (dict): Cost per 'METHOD rule', e.g. 'GET /api/v1/places/'. Defaults to 1.
+        MAX_CONCURRENT_REQUESTS (int): In-flight request cap, 0 to disable.
+        RATE_LIMIT_KEY_HEADER (str): Request header identifying the client, e.g. set by an
+            authenticating proxy. Unset by default: clients are told apart by remote
+            address, as the API does not authenticate them and any header they send
+            themselves can change on every request.
+    """
+    def __init__(self, app=None, store=None, key_func=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            app (Flask, optional): The application to install on.
+            store (optional): Bucket store exposing take(). Defaults to an InMemoryBucketStore.
+            key_func (callable, optional): Returns the client key for the current request.
+                Defaults to the RATE_LIMIT_KEY_HEADER header if configured, otherwise the
+                remote address.
+        """
+        self.store = store or InMemoryBucketStore()
+        self.key_func = key_func
+        self.key_header = None
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def _default_key(self):
+        if self.key_header:
+            return request.headers.get(self.key_header) or request.remote_addr
+        return request.remote_addr
+
+    def init_app(self, app):
+        """
+        Read the configuration and register the request hooks.
+
+        Args:
+            app (Flask): The application to install on.
+        """
+        if not app.config.get('RATE_LIMIT_ENABLED'):
+            return
+        self.rate = app.config['RATE_LIMIT_RATE']
+        self.burst = app.config['RATE_LIMIT_BURST']
+        self.costs = app.config.get('RATE_LIMIT_COSTS', {})
+        self.key_header = app.config.get('RATE_LIMIT_KEY_HEADER')
+        if self.key_func is None:
+            self.key_func = self._default_key
+        max_concurrent = app.config.get('MAX_CONCURRENT_REQUESTS', 0)
+        if max_concurrent:
+            self._slots = threading.BoundedSemaphore(max_concurrent)
+
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+
+    def _admit(self):
+        # The in-flight cap first: a request shed with 503 must not cost the client a token
+        if self._slots is not None:
+            if not self._slots.acquire(blocking=False):
+                return {'error': 'Server busy'}, 503, {'Retry-After': '1'}
+            g.rate_limit_slot = True
+
+        rule = request.url_rule.rule if request.url_rule else request.path
+        cost = self.costs.get(f"{request.method} {rule}", 1)
+        allowed, retry_after = self.store.take(self.key_func(), cost, self.rate, self.burst)
+        if not allowed:
+            # The slot is given back by _release() when the request is torn down
+            return ({'error': 'Too many requests'}, 429,
+                    {'Retry-After': str(max(1, math.ceil(retry_after)))})
+
+    def _release(self, exc=None):
+        if g.pop('rate_limit_slot', False):
+            self._slots.release()
@@ -0,0 +1,44 @@
+from flask_restx import reqparse
+
+
+def parse_list(value):
+    """
+    Split a comma-separated query parameter.
+
+    Args:
+        value (str): The raw parameter, e.g. 'title,price'.
+
+    Returns:
+        tuple: The non-empty names, or None if the parameter was not given.
+    """
+    if value is None:
+        return None
+    return tuple(name.strip() for name in value.split(',') if name.strip())
+
+
+def select_fields(data, fields):
+    """
+    Keep only the requested top-level keys of a representation; the id is always kept.
+
+    Args:
+        data (dict): The full representation.
+        fields (tuple): The requested keys, or None for all of them.
+
+    Returns:
+        dict: The trimmed representation.
+    """
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key == 'id' or key in fields}
+
+
+def fields_parser():
+    """
+    Build a request parser accepting the `fields` sparse fieldset parameter.
+
+    Returns:
+        RequestParser: A parser that endpoints can extend with their own arguments.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('fields', type=str, help='Comma-separated list of fields to return')
+    return parser
@@ -1,5 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from werkzeug.local import LocalProxy
+from app.services.facade import get_facade
+from app.api import bulk, conditional, sparse
+from app.models.validation import validate_amenity
+from app.persistence.repository import StaleWriteError
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,7 +13,14 @@ amenity_model = api.model('Amenity', {
     'description': fields.String(description='Description of the amenity')  # Added field
 })
 
-facade = HBnBFacade()
+fields_parser = sparse.fields_parser()
+
+list_parser = sparse.fields_parser()
+list_parser.add_argument('ids', type=str, help='Comma-separated IDs to retrieve in one batch')
+batch_ids_model = bulk.ids_model(api)
+
+# Resolved on first use so importing the namespace does not build the facade
+facade = LocalProxy(get_facade)
 
 @api.route('/')
 class AmenityList(Resource):
@@ -31,10 +42,15 @@ class AmenityList(Resource):
             status_code (int): 201 if creation is successful, otherwise 400 if input data is invalid.
         """
         amenity_data = api.payload
+        errors = validate_amenity(amenity_data)
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
         new_amenity = facade.create_amenity(amenity_data)
         return {'id': str(new_amenity.id), 'message': 'Amenity created successfully'}, 201
 
+    @api.expect(list_parser)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid input data')
     def get(self):
         """
         Retrieve a list of all amenities.
@@ -43,17 +59,56 @@ class AmenityList(Resource):
 
         Returns:
             response (list): A list of amenity objects with their details.
-            status_code (int): 200 if retrieval is successful.
+                With `ids`, only those amenities are returned, as {'items': [...], 'missing': [...]}.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
         """
+        args = list_parser.parse_args()
+        fields = sparse.parse_list(args['fields'])
+        if args['ids'] is not None:
+            ids = list(sparse.parse_list(args['ids']))
+            error = bulk.validate_ids(ids)
+            if error:
+                return {'error': error}, 400
+            return bulk.batch_response(facade.get_amenities_by_ids, ids, fields)
+
         amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        return [sparse.select_fields(amenity.to_dict(), fields) for amenity in amenities], 200
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    """
+    Resource for retrieving many amenities by ID in one request.
+    """
+    @api.expect(batch_ids_model)
+    @api.response(200, 'Amenities retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def post(self):
+        """
+        Retrieve amenities by ID.
+
+        This endpoint is the POST variant of `GET ?ids=` for lists of IDs too long for a URL.
+        The amenities are returned in the order of the requested IDs.
+
+        Returns:
+            response (dict): The amenities found under 'items' and the IDs not found under 'missing'.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
+        """
+        data = api.payload or {}
+        ids = data.get('ids')
+        error = bulk.validate_ids(ids)
+        if error:
+            return {'error': error}, 400
+        fields = data.get('fields')
+        return bulk.batch_response(facade.get_amenities_by_ids, ids, tuple(fields) if fields else None)
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     """
     Resource for handling individual amenity operations such as retrieving and updating an amenity.
     """
+    @api.expect(fields_parser)
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity not modified')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """
@@ -66,17 +121,24 @@ class AmenityResource(Resource):
 
         Returns:
             response (dict): The amenity's details.
-            status_code (int): 200 if retrieval is successful, otherwise 404 if the amenity is not found.
+            status_code (int): 200 if retrieval is successful, 304 if the client's copy is current, otherwise 404 if the amenity is not found.
         """
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return amenity.to_dict(), 200
+
+        etag = conditional.make_etag(amenity)
+        modified = conditional.last_modified(amenity)
+        if conditional.is_not_modified(etag, modified):
+            return conditional.not_modified_response(etag, modified)
+        fields = sparse.parse_list(fields_parser.parse_args()['fields'])
+        return sparse.select_fields(amenity.to_dict(), fields), 200, conditional.validator_headers(etag, modified)
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
     @api.response(404, 'Amenity not found')
     @api.response(400, 'Invalid input data')
+    @api.response(412, 'Amenity was modified by another request')
     def put(self, amenity_id):
         """
         Update an amenity's information.
@@ -88,16 +150,46 @@ class AmenityResource(Resource):
 
         Returns:
             response (dict): A success message indicating that the amenity was updated.
-            status_code (int): 200 if update is successful, otherwise 404 if the amenity is not found or 400 if input data is invalid.
+            status_code (int): 200 if update is successful, otherwise 404 if the amenity is not found, 400 if input data is invalid
+                or 412 if the If-Match header does not match the current ETag.
         """
         amenity_data = api.payload
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
 
-        if not all([amenity_data.get('name'), amenity_data.get('description')]):
-            return {'error': 'Invalid input data'}, 400
+        etag = conditional.make_etag(amenity)
+        if conditional.is_precondition_failed(etag):
+            return conditional.precondition_failed_response(etag)
+
+        errors = validate_amenity(amenity_data, required=('name', 'description'))
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
+
+        # Update the amenity's details; the repository compares the version again, atomically with the write
+        try:
+            amenity = facade.update_amenity(amenity_id, amenity_data, conditional.expected_version(amenity))
+        except StaleWriteError:
+            return conditional.precondition_failed_response(conditional.make_etag(facade.get_amenity(amenity_id)))
+        return {'message': 'Amenity updated successfully'}, 200, conditional.validator_headers(conditional.make_etag(amenity))
+
+    @api.response(204, 'Amenity deleted successfully')
+    @api.response(404, 'Amenity not found')
+    def delete(self, amenity_id):
+        """
+        Delete a amenity.
+
+        This endpoint deletes a specific amenity based on its ID. The places offering
+        it are kept and stop listing it.
+
+        Args:
+            amenity_id (str): The ID of the amenity to delete.
 
-        # Update the amenity's details
-        facade.update_amenity(amenity_id, amenity_data)
-        return {'message': 'Amenity updated successfully'}, 200
\ No newline at end of file
+        Returns:
+            status_code (int): 204 if deletion is successful, otherwise 404 if the amenity is not found.
+        """
+        try:
+            facade.delete_amenity(amenity_id)
+            return '', 204
+        except ValueError as e:
+            return {'error': str(e)}, 404
\ No newline at end of file
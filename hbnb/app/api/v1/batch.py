@@ -0,0 +1,194 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, request
+from flask_restx import Namespace, Resource, fields
+from werkzeug.exceptions import HTTPException
+
+api = Namespace('batch', description='Batch operations')
+
+# Upper bound on the number of sub-requests in one batch
+MAX_BATCH_OPERATIONS = 20
+# Threads used to run independent reads of one batch concurrently
+MAX_PARALLEL_READS = 4
+
+operation_model = api.model('BatchOperation', {
+    'method': fields.String(required=True, description='HTTP method, e.g. GET or POST'),
+    'path': fields.String(required=True, description='Path of an API endpoint, e.g. /api/v1/places/'),
+    'body': fields.Raw(description='JSON body of the sub-request'),
+    'name': fields.String(description='Name other operations can use to reference this one')
+})
+
+batch_model = api.model('Batch', {
+    'operations': fields.List(fields.Nested(operation_model), required=True,
+                              description='Sub-requests, run in order')
+})
+
+# ${ref.path} where ref is an operation index or name and path walks its response body
+REFERENCE = re.compile(r'\$\{([^}.]+)((?:\.[^}.]+)*)\}')
+
+
+class BatchReferenceError(Exception):
+    """
+    Raised when a sub-request references a result that is missing or failed.
+    """
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+def _resolve(value, results, names):
+    """
+    Replace ${ref.path} references in a path or JSON body with values from earlier results.
+
+    A string that is exactly one reference is replaced by the referenced value itself,
+    so numbers and objects keep their type; references inside longer strings are
+    formatted into the string.
+    """
+    if isinstance(value, dict):
+        return {key: _resolve(item, results, names) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results, names) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    def lookup(match):
+        ref, path = match.group(1), match.group(2)
+        index = names.get(ref, int(ref) if ref.isdigit() else None)
+        if index is None or index not in results:
+            raise BatchReferenceError(f"Unknown reference: {ref}", 400)
+        result = results[index]
+        if result['status'] >= 400:
+            raise BatchReferenceError(f"Referenced operation {ref} failed", 424)
+        current = result['body']
+        for key in path.split('.')[1:]:
+            try:
+                current = current[int(key)] if isinstance(current, list) else current[key]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise BatchReferenceError(f"Reference {match.group(0)} does not resolve", 400)
+        return current
+
+    whole = REFERENCE.fullmatch(value)
+    if whole:
+        return lookup(whole)
+    return REFERENCE.sub(lambda match: str(lookup(match)), value)
+
+
+def _references(operation, names):
+    """
+    Return the indexes of the operations an operation references.
+    """
+    text = json.dumps([operation.get('path'), operation.get('body')])
+    refs = set()
+    for ref, _ in REFERENCE.findall(text):
+        index = names.get(ref, int(ref) if ref.isdigit() else None)
+        if index is not None:
+            refs.add(index)
+    return refs
+
+
+def _dispatch(app, method, path, body, headers):
+    """
+    Run one sub-request through the matching view function, without going through WSGI
+    or the request hooks (rate limiting and compression apply to the batch as a whole).
+
+    The sub-request gets an application context, hence a `g`, of its own: the teardown
+    hooks still run when its request context is popped, and must not release the
+    batch request's unit of work or concurrency slot.
+    """
+    with app.app_context(), app.test_request_context(path, method=method, json=body, headers=headers):
+        try:
+            adapter = app.url_map.bind_to_environ(request.environ)
+            endpoint, view_args = adapter.match()
+            response = app.make_response(app.view_functions[endpoint](**view_args))
+        except HTTPException as e:
+            return {'status': e.code, 'body': getattr(e, 'data', None) or {'error': e.description}}
+        except Exception:
+            # Earlier operations may have been applied already: report this one as failed
+            # rather than failing the whole batch and hiding their results
+            app.logger.exception('Batch operation %s %s failed', method, path)
+            return {'status': 500, 'body': {'error': 'Internal server error'}}
+
+        data = response.get_json(silent=True) if response.is_json else None
+        return {'status': response.status_code, 'body': data}
+
+
+@api.route('/')
+class BatchRequest(Resource):
+    """
+    Resource for running several API calls in one HTTP round-trip.
+    """
+    @api.expect(batch_model)
+    @api.response(200, 'Batch executed; see the per-operation statuses')
+    @api.response(400, 'Invalid input data')
+    def post(self):
+        """
+        Execute an ordered list of sub-requests.
+
+        Each operation names a method and path of this API and an optional JSON body.
+        Paths and bodies may reference earlier results with ${ref.path}, where ref is the
+        index or name of an earlier operation and path walks its response body, e.g.
+        "${0.id}" or "/api/v1/places/${place.id}". Consecutive reads that do not depend
+        on each other run concurrently. An operation referencing a failed one is not run
+        and gets status 424.
+
+        Returns:
+            response (dict): One {'status', 'body'} entry per operation, in request order.
+            status_code (int): 200 if the batch was executed, otherwise 400 if input data is invalid.
+        """
+        operations = (api.payload or {}).get('operations')
+        if not isinstance(operations, list) or not operations:
+            return {'error': 'operations must be a non-empty list'}, 400
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return {'error': f'At most {MAX_BATCH_OPERATIONS} operations can be batched'}, 400
+
+        names = {}
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict) or not operation.get('method') or not operation.get('path'):
+                return {'error': f'Operation {index} needs a method and a path'}, 400
+            if not operation['path'].startswith('/api/'):
+                return {'error': f'Operation {index} must target an API path'}, 400
+            if operation.get('name'):
+                names[operation['name']] = index
+
+        app = current_app._get_current_object()
+        # Sub-requests act on behalf of the same client
+        headers = {key: value for key, value in request.headers.items()
+                   if key.lower() in ('authorization', 'x-user-id', 'accept-language')}
+        batch_path = request.path.rstrip('/')
+        results = {}
+
+        def run(index):
+            operation = operations[index]
+            try:
+                path = _resolve(operation['path'], results, names)
+                body = _resolve(operation.get('body'), results, names)
+            except BatchReferenceError as e:
+                return {'status': e.status, 'body': {'error': str(e)}}
+            if path.split('?')[0].rstrip('/') == batch_path:
+                return {'status': 400, 'body': {'error': 'Batches cannot be nested'}}
+            return _dispatch(app, operation['method'].upper(), path, body, headers)
+
+        # Group consecutive independent reads into waves that run concurrently
+        waves = []
+        for index, operation in enumerate(operations):
+            wave = waves[-1] if waves else None
+            is_read = operation['method'].upper() == 'GET'
+            if (wave and is_read and wave['reads']
+                    and not _references(operation, names) & set(wave['indexes'])):
+                wave['indexes'].append(index)
+            else:
+                waves.append({'indexes': [index], 'reads': is_read})
+
+        pool = None
+        for wave in waves:
+            if len(wave['indexes']) == 1:
+                results[wave['indexes'][0]] = run(wave['indexes'][0])
+                continue
+            pool = pool or ThreadPoolExecutor(max_workers=MAX_PARALLEL_READS)
+            for index, result in zip(wave['indexes'], pool.map(run, wave['indexes'])):
+                results[index] = result
+        if pool:
+            pool.shutdown()
+
+        return {'results': [results[index] for index in range(len(operations))]}, 200
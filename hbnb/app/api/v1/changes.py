@@ -0,0 +1,49 @@
+from flask_restx import Namespace, Resource, reqparse
+from werkzeug.local import LocalProxy
+from app.services.facade import get_facade
+
+api = Namespace('changes', description='Change data capture operations')
+
+# Long-poll waits are capped so a worker is never held indefinitely
+MAX_WAIT = 30
+MAX_LIMIT = 1000
+
+changes_parser = reqparse.RequestParser()
+changes_parser.add_argument('since', type=int, default=0, help='Last sequence number already consumed')
+changes_parser.add_argument('limit', type=int, default=100, help='Maximum number of events to return')
+changes_parser.add_argument('wait', type=float, default=0, help='Seconds to wait for new events (long-poll)')
+
+# Resolved on first use so importing the namespace does not build the facade
+facade = LocalProxy(get_facade)
+
+@api.route('/')
+class ChangeList(Resource):
+    """
+    Resource for tailing the ordered stream of changes made to users, places, reviews and amenities.
+    """
+    @api.expect(changes_parser)
+    @api.response(200, 'Change events retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def get(self):
+        """
+        Retrieve the change events published after a sequence number.
+
+        This endpoint returns events in publication order. Consumers resume by passing the
+        returned `next` value as `since`. With `wait` set, the request blocks until at least
+        one new event is available or the wait expires. If `truncated` is true, events were
+        evicted from the bounded log before being read and the consumer must resynchronise.
+
+        Returns:
+            response (dict): The events, the sequence number to resume from and the truncation flag.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if input data is invalid.
+        """
+        args = changes_parser.parse_args()
+        if args['since'] < 0 or args['limit'] <= 0 or args['wait'] < 0:
+            return {'error': 'Invalid input data'}, 400
+
+        events, next_seq, truncated = facade.change_log.read(
+            since=args['since'],
+            limit=min(args['limit'], MAX_LIMIT),
+            timeout=min(args['wait'], MAX_WAIT)
+        )
+        return {'events': events, 'next': next_seq, 'truncated': truncated}, 200
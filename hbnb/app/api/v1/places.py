@@ -1,5 +1,10 @@
-from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
+from werkzeug.local import LocalProxy
+from app.services.facade import get_facade
+from app.api import bulk, conditional, sparse
+from app.api.coalescing import coalesced
+from app.models.validation import validate_booking, validate_place
+from app.persistence.repository import ConflictError, StaleWriteError
 
 api = Namespace('places', description='Place operations')
 
@@ -10,10 +15,68 @@ place_model = api.model('Place', {
     'price': fields.Float(required=True, description='Price per night'),
     'latitude': fields.Float(required=True, description='Latitude of the place'),
     'longitude': fields.Float(required=True, description='Longitude of the place'),
-    'owner_id': fields.String(required=True, description='ID of the owner')
+    'owner_id': fields.String(required=True, description='ID of the owner'),
+    'amenities': fields.List(fields.String, description='IDs of the amenities offered')
 })
 
-facade = HBnBFacade()
+# Query parameters for ordered and filtered listings
+list_parser = sparse.fields_parser()
+list_parser.add_argument('sort', choices=('price', '-price', 'rating', 'newest'), help='Sort order')
+list_parser.add_argument('min_price', type=float, help='Minimum price per night')
+list_parser.add_argument('max_price', type=float, help='Maximum price per night')
+list_parser.add_argument('min_rating', type=float, help='Minimum average rating')
+list_parser.add_argument('max_rating', type=float, help='Maximum average rating')
+list_parser.add_argument('limit', type=int, help='Maximum number of places to return')
+list_parser.add_argument('amenities', type=str, help='Comma-separated amenity IDs the places must all offer')
+list_parser.add_argument('any_amenities', type=str, help='Comma-separated amenity IDs the places must offer one of')
+list_parser.add_argument('ids', type=str, help='Comma-separated IDs to retrieve in one batch')
+batch_ids_model = bulk.ids_model(api)
+
+# Query parameters for the place detail representation
+detail_parser = sparse.fields_parser()
+detail_parser.add_argument('embed', type=str, help='Comma-separated relations to embed: owner, amenities, reviews')
+detail_parser.add_argument('reviews_limit', type=int, help='Embed only the most recent reviews, up to this number')
+
+# Query parameters for the review feed of a place
+REVIEW_PAGE_SIZE = 20
+MAX_REVIEW_PAGE_SIZE = 100
+feed_parser = sparse.fields_parser()
+feed_parser.add_argument('limit', type=int, default=REVIEW_PAGE_SIZE, help='Maximum number of reviews to return')
+feed_parser.add_argument('before', type=str, help='Cursor from the previous page; returns older reviews')
+
+booking_model = api.model('Booking', {
+    'user_id': fields.String(required=True, description='ID of the user booking the place'),
+    'check_in': fields.String(required=True, description='Day of arrival (YYYY-MM-DD)'),
+    'check_out': fields.String(required=True, description='Day of departure (YYYY-MM-DD)')
+})
+
+# Query parameters for the bookings of a place
+bookings_parser = reqparse.RequestParser()
+bookings_parser.add_argument('start', type=inputs.date_from_iso8601, help='Only bookings overlapping this day or later')
+bookings_parser.add_argument('end', type=inputs.date_from_iso8601, help='Only bookings overlapping days before this one')
+
+# Query parameters for similar places
+SIMILAR_PAGE_SIZE = 10
+MAX_SIMILAR_PAGE_SIZE = 50
+similar_parser = sparse.fields_parser()
+similar_parser.add_argument('limit', type=int, default=SIMILAR_PAGE_SIZE, help='Maximum number of places to return')
+
+# Query parameters for the availability search
+available_parser = sparse.fields_parser()
+available_parser.add_argument('check_in', type=inputs.date_from_iso8601, required=True, help='Day of arrival')
+available_parser.add_argument('check_out', type=inputs.date_from_iso8601, required=True, help='Day of departure')
+available_parser.add_argument('min_price', type=float, help='Minimum price per night')
+available_parser.add_argument('max_price', type=float, help='Maximum price per night')
+available_parser.add_argument('min_latitude', type=float, help='Southern edge of the area')
+available_parser.add_argument('max_latitude', type=float, help='Northern edge of the area')
+available_parser.add_argument('min_longitude', type=float, help='Western edge of the area')
+available_parser.add_argument('max_longitude', type=float, help='Eastern edge of the area')
+available_parser.add_argument('limit', type=int, help='Maximum number of places to return')
+available_parser.add_argument('amenities', type=str, help='Comma-separated amenity IDs the places must all offer')
+available_parser.add_argument('any_amenities', type=str, help='Comma-separated amenity IDs the places must offer one of')
+
+# Resolved on first use so importing the namespace does not build the facade
+facade = LocalProxy(get_facade)
 
 @api.route('/')
 class PlaceList(Resource):
@@ -32,10 +95,14 @@ class PlaceList(Resource):
 
         Returns:
             response (dict): Contains the ID of the newly created place and a success message.
-            status_code (int): 201 if creation is successful, otherwise 400 if input data is invalid or owner not found.
+            status_code (int): 201 if creation is successful, otherwise 400 if input data is invalid
+                or the owner or an amenity is not found.
         """
         place_data = api.payload
-        
+        errors = validate_place(place_data)
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
+
         owner_id = place_data.get('owner_id')
         owner = facade.get_user(owner_id)
 
@@ -45,77 +112,162 @@ class PlaceList(Resource):
         # Populate the 'owner' field with the retrieved user object
         place_data['owner'] = owner.to_dict()
 
-        new_place = facade.create_place(place_data)
+        try:
+            new_place = facade.create_place(place_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return {'id': str(new_place.id), 'message': 'Place created successfully'}, 201
 
+    @api.expect(list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid input data')
     def get(self):
         """
         Retrieve a list of all places.
 
-        This endpoint retrieves a list of all places with basic details.
+        This endpoint retrieves a list of all places with basic details. When a sort order,
+        a price/rating range or an amenity filter is given, the places are read from the ordered
+        indexes instead and also include their price and average rating. `amenities` keeps the
+        places offering all the listed amenities, `any_amenities` those offering at least one.
 
         Returns:
             response (list): A list of place objects with their basic details.
-            status_code (int): 200 if retrieval is successful.
+                With `ids`, only those places are returned, as {'items': [...], 'missing': [...]}.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if input data is invalid.
         """
-        places = facade.get_all_places()
+        args = list_parser.parse_args()
+        fields = sparse.parse_list(args.pop('fields'))
+        ids = args.pop('ids')
+        if ids is not None:
+            ids = list(sparse.parse_list(ids))
+            error = bulk.validate_ids(ids)
+            if error:
+                return {'error': error}, 400
+            return bulk.batch_response(facade.get_places_by_ids, ids, fields, facade.serialize_place)
+
+        if any(value is not None for value in args.values()):
+            if args['limit'] is not None and args['limit'] <= 0:
+                return {'error': 'Invalid input data'}, 400
+            places = facade.get_places_sorted(
+                sort=args['sort'] or 'newest',
+                min_price=args['min_price'],
+                max_price=args['max_price'],
+                min_rating=args['min_rating'],
+                max_rating=args['max_rating'],
+                limit=args['limit'],
+                amenities=sparse.parse_list(args['amenities']),
+                any_amenities=sparse.parse_list(args['any_amenities'])
+            )
+            return [
+                sparse.select_fields({
+                    'id': place.id,
+                    'title': place.title,
+                    'latitude': place.latitude,
+                    'longitude': place.longitude,
+                    'price': place.price,
+                    'rating': facade.get_place_rating(place.id)
+                }, fields)
+                for place in places
+            ], 200
+
+        # The summary does not include relations, so none are fetched
+        places = facade.get_all_places(embed=())
         return [
-            {
+            sparse.select_fields({
                 'id': str(place.get('id')),  # Ensure it's a dictionary
                 'title': place.get('title'),
                 'latitude': place.get('latitude'),
                 'longitude': place.get('longitude')
-            }
+            }, fields)
             for place in places
         ], 200
 
+@api.route('/batch')
+class PlaceBatch(Resource):
+    """
+    Resource for retrieving many places by ID in one request.
+    """
+    @api.expect(batch_ids_model)
+    @api.response(200, 'Places retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def post(self):
+        """
+        Retrieve places by ID.
+
+        This endpoint is the POST variant of `GET ?ids=` for lists of IDs too long for a URL.
+        The places are returned in the order of the requested IDs, with amenity and review IDs
+        rather than embedded objects.
+
+        Returns:
+            response (dict): The places found under 'items' and the IDs not found under 'missing'.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
+        """
+        data = api.payload or {}
+        ids = data.get('ids')
+        error = bulk.validate_ids(ids)
+        if error:
+            return {'error': error}, 400
+        fields = data.get('fields')
+        return bulk.batch_response(facade.get_places_by_ids, ids, tuple(fields) if fields else None,
+                                   facade.serialize_place)
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     """
     Resource for handling individual place operations such as retrieving and updating a place.
     """
+    @api.expect(detail_parser)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Place not modified')
+    @api.response(400, 'Invalid input data')
     @api.response(404, 'Place not found')
+    @coalesced()
     def get(self, place_id):
         """
         Get place details by ID.
 
         This endpoint retrieves the details of a specific place based on its ID. It includes
-        information about the owner, amenities, and reviews.
+        information about the owner, amenities, and reviews. `fields` restricts the place
+        attributes returned, `embed` the relations included (all by default) and
+        `reviews_limit` the number of most recent reviews embedded.
 
         Args:
             place_id (str): The ID of the place to retrieve.
 
         Returns:
             response (dict): The place's details, including owner, amenities, and reviews.
-            status_code (int): 200 if retrieval is successful, otherwise 404 if the place is not found.
+            status_code (int): 200 if retrieval is successful, 304 if the client's copy is current, otherwise 404 if the place is not found
+                or 400 if input data is invalid.
         """
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404
-
-        # Ensure place is a dictionary
-        place_data = place if isinstance(place, dict) else place.to_dict()
+        args = detail_parser.parse_args()
+        embed = sparse.parse_list(args['embed'])
+        if embed is None:
+            embed = facade.PLACE_EMBEDS
+        elif not set(embed) <= set(facade.PLACE_EMBEDS):
+            return {'error': 'Invalid input data'}, 400
 
-        # Add owner details to the response
-        owner = facade.get_user(place_data['owner_id'])
-        place_data['owner'] = owner.to_dict() if owner else {}
+        # Evaluate the validators before building the (expensive) representation; they
+        # only cover the place and the relations embedded, which are the only ones fetched
+        entities = facade.get_place_entities(place_id, embed=embed, reviews_limit=args['reviews_limit'])
+        if not entities:
+            return {'error': 'Place not found'}, 404
 
-        # Add amenities details to the response
-        place_data['amenities'] = [facade.get_amenity(amenity_id).to_dict()
-                                   for amenity_id in place_data.get('amenities', [])]
+        etag = conditional.make_etag(*entities)
+        modified = conditional.last_modified(*entities)
+        if conditional.is_not_modified(etag, modified):
+            return conditional.not_modified_response(etag, modified)
 
-        # Add reviews to the response
-        reviews = facade.get_reviews_for_place(place_id)
-        place_data['reviews'] = [review.to_dict() for review in reviews]
+        # The facade builds the owner, amenities and reviews only if they are embedded
+        place_data = facade.get_place(place_id, fields=sparse.parse_list(args['fields']),
+                                      embed=embed, reviews_limit=args['reviews_limit'])
 
-        return place_data, 200
+        return place_data, 200, conditional.validator_headers(etag, modified)
 
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
     @api.response(404, 'Place not found')
     @api.response(400, 'Invalid input data')
+    @api.response(412, 'Place was modified by another request')
     def put(self, place_id):
         """
         Update a place's information.
@@ -127,12 +279,300 @@ class PlaceResource(Resource):
 
         Returns:
             response (dict): A success message indicating that the place was updated.
-            status_code (int): 200 if update is successful, otherwise 404 if the place is not found or 400 if input data is invalid.
+            status_code (int): 200 if update is successful, otherwise 404 if the place is not found, 400 if input data
+                is invalid or an amenity is not found, or 412 if the If-Match header does not match the current ETag.
         """
         place_data = api.payload
-        place = facade.get_place(place_id)
-        if not place:
+        entities = facade.get_place_entities(place_id, embed=())
+        if not entities:
+            return {'error': 'Place not found'}, 404
+
+        # Only the place's own state: a new review or an owner edit does not fail the update
+        place = entities[0]
+        etag = conditional.make_etag(place)
+        if conditional.is_precondition_failed(etag):
+            return conditional.precondition_failed_response(etag)
+
+        # Only the fields given are updated
+        errors = validate_place(place_data, required=())
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
+
+        # The repository compares the version again, atomically with the write
+        try:
+            facade.update_place(place_id, place_data, conditional.expected_version(place))
+        except StaleWriteError:
+            return conditional.precondition_failed_response(conditional.make_etag(*(facade.get_place_entities(place_id, embed=()) or ())))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        etag = conditional.make_etag(place)
+        return {'message': 'Place updated successfully'}, 200, conditional.validator_headers(etag)
+
+    @api.response(204, 'Place deleted successfully')
+    @api.response(404, 'Place not found')
+    def delete(self, place_id):
+        """
+        Delete a place.
+
+        This endpoint deletes a specific place based on its ID. Its reviews and bookings
+        disappear at once and are removed in the background.
+
+        Args:
+            place_id (str): The ID of the place to delete.
+
+        Returns:
+            status_code (int): 204 if deletion is successful, otherwise 404 if the place is not found.
+        """
+        try:
+            facade.delete_place(place_id)
+            return '', 204
+        except ValueError as e:
+            return {'error': str(e)}, 404
+
+@api.route('/<place_id>/reviews')
+class PlaceReviewList(Resource):
+    """
+    Resource for paging through the reviews of a place.
+    """
+    @api.expect(feed_parser)
+    @api.response(200, 'Reviews retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    @api.response(404, 'Place not found')
+    @coalesced()
+    def get(self, place_id):
+        """
+        Get the reviews of a place, newest first.
+
+        This endpoint returns one page of reviews. To get the next page, pass the `next`
+        cursor of the response as `before`; it is None on the last page.
+
+        Args:
+            place_id (str): The ID of the place whose reviews are retrieved.
+
+        Returns:
+            response (dict): The reviews under 'items' and the cursor of the next page under 'next'.
+            status_code (int): 200 if retrieval is successful, otherwise 404 if the place is not found
+                or 400 if input data is invalid.
+        """
+        args = feed_parser.parse_args()
+        if not 0 < args['limit'] <= MAX_REVIEW_PAGE_SIZE:
+            return {'error': f'limit must be between 1 and {MAX_REVIEW_PAGE_SIZE}'}, 400
+        if not facade.has_place(place_id):
+            return {'error': 'Place not found'}, 404
+
+        try:
+            reviews, next_cursor = facade.get_review_page(place_id, args['limit'], args['before'])
+        except ValueError:
+            return {'error': 'Invalid cursor'}, 400
+
+        fields = sparse.parse_list(args['fields'])
+        return {
+            'items': [sparse.select_fields(review.to_dict(), fields) for review in reviews],
+            'next': next_cursor
+        }, 200
+
+@api.route('/<place_id>/similar')
+class PlaceSimilarList(Resource):
+    """
+    Resource for the places similar to a place.
+    """
+    @api.expect(similar_parser)
+    @api.response(200, 'Similar places retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    @api.response(404, 'Place not found')
+    @coalesced()
+    def get(self, place_id):
+        """
+        Get the places most similar to a place.
+
+        Places are compared on price, location, average rating and amenities; the most
+        similar come first, each with its cosine similarity.
+
+        Args:
+            place_id (str): The ID of the reference place.
+
+        Returns:
+            response (list): The similar places with their price, location, rating and similarity.
+            status_code (int): 200 if retrieval is successful, otherwise 404 if the place is not found
+                or 400 if input data is invalid.
+        """
+        args = similar_parser.parse_args()
+        if not 0 < args['limit'] <= MAX_SIMILAR_PAGE_SIZE:
+            return {'error': f'limit must be between 1 and {MAX_SIMILAR_PAGE_SIZE}'}, 400
+
+        similar = facade.get_similar_places(place_id, args['limit'])
+        if similar is None:
+            return {'error': 'Place not found'}, 404
+
+        fields = sparse.parse_list(args['fields'])
+        return [
+            sparse.select_fields({
+                'id': place.id,
+                'title': place.title,
+                'latitude': place.latitude,
+                'longitude': place.longitude,
+                'price': place.price,
+                'rating': facade.get_place_rating(place.id),
+                'similarity': round(score, 4)
+            }, fields)
+            for place, score in similar
+        ], 200
+
+@api.route('/available')
+class PlaceAvailability(Resource):
+    """
+    Resource for searching the places free for a stay.
+    """
+    @api.expect(available_parser)
+    @api.response(200, 'Available places retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def get(self):
+        """
+        Search the places free for every night of a stay.
+
+        This endpoint combines the booking calendars with the price index, an optional
+        latitude/longitude area and optional amenity filters (`amenities`: all of them,
+        `any_amenities`: at least one). The places are returned cheapest first.
+
+        Returns:
+            response (list): The available places with their price and location.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if input data is invalid.
+        """
+        args = available_parser.parse_args()
+        if args['limit'] is not None and args['limit'] <= 0:
+            return {'error': 'Invalid input data'}, 400
+        edges = (args['min_latitude'], args['max_latitude'], args['min_longitude'], args['max_longitude'])
+        bounds = None
+        if any(edge is not None for edge in edges):
+            bounds = (
+                -90 if edges[0] is None else edges[0], 90 if edges[1] is None else edges[1],
+                -180 if edges[2] is None else edges[2], 180 if edges[3] is None else edges[3]
+            )
+
+        try:
+            places = facade.search_available_places(args['check_in'], args['check_out'],
+                                                    min_price=args['min_price'], max_price=args['max_price'],
+                                                    bounds=bounds, limit=args['limit'],
+                                                    amenities=sparse.parse_list(args['amenities']),
+                                                    any_amenities=sparse.parse_list(args['any_amenities']))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        fields = sparse.parse_list(args['fields'])
+        return [
+            sparse.select_fields({
+                'id': place.id,
+                'title': place.title,
+                'latitude': place.latitude,
+                'longitude': place.longitude,
+                'price': place.price
+            }, fields)
+            for place in places
+        ], 200
+
+@api.route('/<place_id>/bookings')
+class PlaceBookingList(Resource):
+    """
+    Resource for booking a place and listing its bookings.
+    """
+    @api.expect(booking_model)
+    @api.response(201, 'Booking successfully created')
+    @api.response(400, 'Invalid input data')
+    @api.response(404, 'Place not found')
+    @api.response(409, 'Place already booked for these dates')
+    def post(self, place_id):
+        """
+        Book a place.
+
+        This endpoint books the place from check_in to check_out. The place must be free
+        for every night in between; check_out itself is not booked.
+
+        Args:
+            place_id (str): The ID of the place to book.
+
+        Returns:
+            response (dict): Contains the ID of the new booking and a success message.
+            status_code (int): 201 if creation is successful, otherwise 404 if the place is not found,
+                400 if input data is invalid or 409 if the place is already booked for these dates.
+        """
+        booking_data = api.payload
+        errors = validate_booking(booking_data)
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
+        if not facade.has_place(place_id):
             return {'error': 'Place not found'}, 404
 
-        updated_place = facade.update_place(place_id, place_data)
-        return {'message': 'Place updated successfully'}, 200
\ No newline at end of file
+        try:
+            booking = facade.create_booking(place_id, booking_data)
+        except ConflictError:
+            return {'error': 'Place already booked for these dates'}, 409
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'id': booking.id, 'message': 'Booking created successfully'}, 201
+
+    @api.expect(bookings_parser)
+    @api.response(200, 'Bookings retrieved successfully')
+    @api.response(404, 'Place not found')
+    def get(self, place_id):
+        """
+        Get the bookings of a place.
+
+        This endpoint lists the bookings in check-in order, optionally only those
+        overlapping the window from `start` to `end`.
+
+        Args:
+            place_id (str): The ID of the place.
+
+        Returns:
+            response (list): The bookings of the place.
+            status_code (int): 200 if retrieval is successful, otherwise 404 if the place is not found.
+        """
+        args = bookings_parser.parse_args()
+        try:
+            bookings = facade.get_bookings_for_place(place_id, args['start'], args['end'])
+        except ValueError as e:
+            return {'error': str(e)}, 404
+        return [booking.to_dict() for booking in bookings], 200
+
+@api.route('/<place_id>/bookings/<booking_id>')
+class PlaceBookingResource(Resource):
+    """
+    Resource for retrieving and cancelling a booking.
+    """
+    @api.response(200, 'Booking retrieved successfully')
+    @api.response(404, 'Booking not found')
+    def get(self, place_id, booking_id):
+        """
+        Get booking details by ID.
+
+        Args:
+            place_id (str): The ID of the booked place.
+            booking_id (str): The ID of the booking.
+
+        Returns:
+            response (dict): The booking's details.
+            status_code (int): 200 if retrieval is successful, otherwise 404 if the booking is not found.
+        """
+        booking = facade.get_booking(booking_id)
+        if not booking or booking.place_id != place_id:
+            return {'error': 'Booking not found'}, 404
+        return booking.to_dict(), 200
+
+    @api.response(204, 'Booking cancelled successfully')
+    @api.response(404, 'Booking not found')
+    def delete(self, place_id, booking_id):
+        """
+        Cancel a booking.
+
+        Args:
+            place_id (str): The ID of the booked place.
+            booking_id (str): The ID of the booking.
+
+        Returns:
+            status_code (int): 204 if cancellation is successful, otherwise 404 if the booking is not found.
+        """
+        booking = facade.get_booking(booking_id)
+        if not booking or booking.place_id != place_id:
+            return {'error': 'Booking not found'}, 404
+        facade.cancel_booking(booking_id)
+        return '', 204
\ No newline at end of file
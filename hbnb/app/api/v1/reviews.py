@@ -1,5 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from werkzeug.local import LocalProxy
+from app.services.facade import get_facade
+from app.api import bulk, conditional, sparse
+from app.models.validation import validate_review
+from app.persistence.repository import StaleWriteError
 
 api = Namespace('reviews', description='Review operations')
 
@@ -11,7 +15,14 @@ review_model = api.model('Review', {
     'user_id': fields.String(required=True, description='ID of the user')
 })
 
-facade = HBnBFacade()
+fields_parser = sparse.fields_parser()
+
+list_parser = sparse.fields_parser()
+list_parser.add_argument('ids', type=str, help='Comma-separated IDs to retrieve in one batch')
+batch_ids_model = bulk.ids_model(api)
+
+# Resolved on first use so importing the namespace does not build the facade
+facade = LocalProxy(get_facade)
 
 @api.route('/')
 class ReviewList(Resource):
@@ -33,13 +44,18 @@ class ReviewList(Resource):
             status_code (int): 201 if creation is successful, otherwise 400 if input data is invalid.
         """
         review_data = api.payload
+        errors = validate_review(review_data)
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
         try:
             new_review = facade.create_review(review_data)
             return {'id': str(new_review.id), 'message': 'Review created successfully'}, 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(list_parser)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid input data')
     def get(self):
         """
         Retrieve a list of all reviews.
@@ -48,26 +64,65 @@ class ReviewList(Resource):
 
         Returns:
             response (list): A list of review objects with their details.
-            status_code (int): 200 if retrieval is successful.
+                With `ids`, only those reviews are returned, as {'items': [...], 'missing': [...]}.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
         """
+        args = list_parser.parse_args()
+        fields = sparse.parse_list(args['fields'])
+        if args['ids'] is not None:
+            ids = list(sparse.parse_list(args['ids']))
+            error = bulk.validate_ids(ids)
+            if error:
+                return {'error': error}, 400
+            return bulk.batch_response(facade.get_reviews_by_ids, ids, fields)
+
         reviews = facade.get_all_reviews()
         return [
-            {
-                'id': str(review.id),  # Ensure it's a dictionary
-                'text': review.get('text'),
-                'rating': review.get('rating'),
-                'place_id': review.get('place_id'),
-                'user_id': review.get('user_id')
-            }
+            sparse.select_fields({
+                'id': str(review.id),
+                'text': review.text,
+                'rating': review.rating,
+                'place_id': review.place_id,
+                'user_id': review.user_id
+            }, fields)
             for review in reviews
         ], 200
 
+@api.route('/batch')
+class ReviewBatch(Resource):
+    """
+    Resource for retrieving many reviews by ID in one request.
+    """
+    @api.expect(batch_ids_model)
+    @api.response(200, 'Reviews retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def post(self):
+        """
+        Retrieve reviews by ID.
+
+        This endpoint is the POST variant of `GET ?ids=` for lists of IDs too long for a URL.
+        The reviews are returned in the order of the requested IDs.
+
+        Returns:
+            response (dict): The reviews found under 'items' and the IDs not found under 'missing'.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
+        """
+        data = api.payload or {}
+        ids = data.get('ids')
+        error = bulk.validate_ids(ids)
+        if error:
+            return {'error': error}, 400
+        fields = data.get('fields')
+        return bulk.batch_response(facade.get_reviews_by_ids, ids, tuple(fields) if fields else None)
+
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     """
     Resource for handling individual review operations such as retrieving, updating, and deleting a review.
     """
+    @api.expect(fields_parser)
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review not modified')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """
@@ -80,18 +135,25 @@ class ReviewResource(Resource):
 
         Returns:
             response (dict): The review's details if found.
-            status_code (int): 200 if retrieval is successful, otherwise 404 if the review is not found.
+            status_code (int): 200 if retrieval is successful, 304 if the client's copy is current, otherwise 404 if the review is not found.
         """
         try:
             review = facade.get_review(review_id)
-            return review.to_dict(), 200
         except ValueError as e:
             return {'error': str(e)}, 404
 
+        etag = conditional.make_etag(review)
+        modified = conditional.last_modified(review)
+        if conditional.is_not_modified(etag, modified):
+            return conditional.not_modified_response(etag, modified)
+        fields = sparse.parse_list(fields_parser.parse_args()['fields'])
+        return sparse.select_fields(review.to_dict(), fields), 200, conditional.validator_headers(etag, modified)
+
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
     @api.response(404, 'Review not found')
     @api.response(400, 'Invalid input data')
+    @api.response(412, 'Review was modified by another request')
     def put(self, review_id):
         """
         Update a review's information.
@@ -103,12 +165,27 @@ class ReviewResource(Resource):
 
         Returns:
             response (dict): A success message indicating that the review was updated.
-            status_code (int): 200 if update is successful, otherwise 404 if the review is not found or 400 if input data is invalid.
+            status_code (int): 200 if update is successful, otherwise 404 if the review is not found, 400 if input data is invalid
+                or 412 if the If-Match header does not match the current ETag.
         """
         review_data = api.payload
         try:
-            updated_review = facade.update_review(review_id, **review_data)
-            return {'message': 'Review updated successfully'}, 200
+            review = facade.get_review(review_id)
+            etag = conditional.make_etag(review)
+            if conditional.is_precondition_failed(etag):
+                return conditional.precondition_failed_response(etag)
+
+            # Only the fields given are updated
+            errors = validate_review(review_data, required=())
+            if errors:
+                return {'error': 'Invalid input data', 'details': errors}, 400
+
+            # The repository compares the version again, atomically with the write
+            changes = {key: review_data[key] for key in ('rating', 'text') if key in review_data}
+            updated_review = facade.update_review(review_id, conditional.expected_version(review), **changes)
+            return {'message': 'Review updated successfully'}, 200, conditional.validator_headers(conditional.make_etag(updated_review))
+        except StaleWriteError:
+            return conditional.precondition_failed_response(conditional.make_etag(facade.get_review(review_id)))
         except ValueError as e:
             return {'error': str(e)}, 404
 
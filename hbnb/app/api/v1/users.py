@@ -1,5 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from werkzeug.local import LocalProxy
+from app.services.facade import get_facade
+from app.persistence.repository import ConflictError, StaleWriteError
+from app.models.validation import validate_user
+from app.api import bulk, conditional, sparse
 
 api = Namespace('users', description='User operations')
 
@@ -11,7 +15,14 @@ user_model = api.model('User', {
     'is_admin': fields.Boolean(description='Whether the user has admin privileges')  # Added field
 })
 
-facade = HBnBFacade()
+fields_parser = sparse.fields_parser()
+
+list_parser = sparse.fields_parser()
+list_parser.add_argument('ids', type=str, help='Comma-separated IDs to retrieve in one batch')
+batch_ids_model = bulk.ids_model(api)
+
+# Resolved on first use so importing the namespace does not build the facade
+facade = LocalProxy(get_facade)
 
 @api.route('/')
 class UserList(Resource):
@@ -20,34 +31,35 @@ class UserList(Resource):
     """
     @api.expect(user_model)
     @api.response(201, 'User successfully created')
-    @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
+    @api.response(409, 'Email already registered')
     def post(self):
         """
         Register a new user.
 
-        This endpoint allows for the creation of a new user. It checks if the provided email is already registered, 
-        validates the input data, and then creates a new user.
+        This endpoint allows for the creation of a new user. It validates the input data and creates
+        a new user; the repository rejects emails that are already registered, ignoring case.
 
         Returns:
             response (dict): Contains the ID of the newly created user and a success message.
-            status_code (int): 201 if creation is successful, otherwise 400 if email is already registered or if input data is invalid.
+            status_code (int): 201 if creation is successful, otherwise 400 if input data is invalid or 409 if email is already registered.
         """
         user_data = api.payload
 
-        # Simulate email uniqueness check
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
-            return {'error': 'Email already registered'}, 400
-
         # Validate input data
-        if not all([user_data.get('first_name'), user_data.get('last_name'), user_data.get('email'), user_data.get('password')]):
-            return {'error': 'Invalid input data'}, 400
-
-        new_user = facade.create_user(user_data)
+        errors = validate_user(user_data)
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
+
+        try:
+            new_user = facade.create_user(user_data)
+        except ConflictError:
+            return {'error': 'Email already registered'}, 409
         return {'id': str(new_user.id), 'message': 'User created successfully'}, 201
 
+    @api.expect(list_parser)
     @api.response(200, 'Users retrieved successfully')
+    @api.response(400, 'Invalid input data')
     def get(self):
         """
         Retrieve all users.
@@ -56,18 +68,85 @@ class UserList(Resource):
 
         Returns:
             response (list): A list of user objects with their IDs, first names, last names, and emails.
-            status_code (int): 200 if retrieval is successful.
+                With `ids`, only those users are returned, as {'items': [...], 'missing': [...]}.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
         """
+        args = list_parser.parse_args()
+        fields = sparse.parse_list(args['fields'])
+        if args['ids'] is not None:
+            ids = list(sparse.parse_list(args['ids']))
+            error = bulk.validate_ids(ids)
+            if error:
+                return {'error': error}, 400
+            return bulk.batch_response(facade.get_users_by_ids, ids, fields)
+
         users = facade.get_all_users()
-        return [{'id': str(user.id), 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email} for user in users], 200
+        return [sparse.select_fields({'id': str(user.id), 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email}, fields)
+                for user in users], 200
 
 
+@api.route('/batch')
+class UserBatch(Resource):
+    """
+    Resource for retrieving many users by ID in one request.
+    """
+    @api.expect(batch_ids_model)
+    @api.response(200, 'Users retrieved successfully')
+    @api.response(400, 'Invalid input data')
+    def post(self):
+        """
+        Retrieve users by ID.
+
+        This endpoint is the POST variant of `GET ?ids=` for lists of IDs too long for a URL.
+        The users are returned in the order of the requested IDs.
+
+        Returns:
+            response (dict): The users found under 'items' and the IDs not found under 'missing'.
+            status_code (int): 200 if retrieval is successful, otherwise 400 if the ids are invalid.
+        """
+        data = api.payload or {}
+        ids = data.get('ids')
+        error = bulk.validate_ids(ids)
+        if error:
+            return {'error': error}, 400
+        fields = data.get('fields')
+        return bulk.batch_response(facade.get_users_by_ids, ids, tuple(fields) if fields else None)
+
+@api.route('/<user_id>/dashboard')
+class UserDashboard(Resource):
+    """
+    Resource for a host's overview of their places.
+    """
+    @api.response(200, 'Dashboard retrieved successfully')
+    @api.response(404, 'User not found')
+    def get(self, user_id):
+        """
+        Get a user's dashboard.
+
+        This endpoint lists the user's places with their review count, average rating and
+        latest reviews, along with totals over all of them. It is served from a view the
+        facade keeps up to date as places and reviews change.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            response (dict): The dashboard.
+            status_code (int): 200 if retrieval is successful, otherwise 404 if the user is not found.
+        """
+        dashboard = facade.get_user_dashboard(user_id)
+        if dashboard is None:
+            return {'error': 'User not found'}, 404
+        return dashboard, 200
+
 @api.route('/<user_id>')
 class UserResource(Resource):
     """
     Resource for handling individual user operations such as retrieving, updating, and deleting a user.
     """
+    @api.expect(fields_parser)
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'User not modified')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """
@@ -80,17 +159,25 @@ class UserResource(Resource):
 
         Returns:
             response (dict): The user's details.
-            status_code (int): 200 if retrieval is successful, otherwise 404 if the user is not found.
+            status_code (int): 200 if retrieval is successful, 304 if the client's copy is current, otherwise 404 if the user is not found.
         """
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return user.to_dict(), 200
+
+        etag = conditional.make_etag(user)
+        modified = conditional.last_modified(user)
+        if conditional.is_not_modified(etag, modified):
+            return conditional.not_modified_response(etag, modified)
+        fields = sparse.parse_list(fields_parser.parse_args()['fields'])
+        return sparse.select_fields(user.to_dict(), fields), 200, conditional.validator_headers(etag, modified)
 
     @api.expect(user_model)
     @api.response(200, 'User updated successfully')
     @api.response(404, 'User not found')
     @api.response(400, 'Invalid input data')
+    @api.response(409, 'Email already registered')
+    @api.response(412, 'User was modified by another request')
     def put(self, user_id):
         """
         Update user information.
@@ -102,22 +189,51 @@ class UserResource(Resource):
 
         Returns:
             response (dict): A success message indicating that the user was updated.
-            status_code (int): 200 if update is successful, otherwise 404 if the user is not found or 400 if input data is invalid.
+            status_code (int): 200 if update is successful, otherwise 404 if the user is not found, 400 if input data is invalid,
+                409 if the email is registered to another user or 412 if the If-Match header does not match the current ETag.
         """
         user_data = api.payload
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
 
-        if not all([user_data.get('first_name'), user_data.get('last_name'), user_data.get('email')]):
-            return {'error': 'Invalid input data'}, 400
+        etag = conditional.make_etag(user)
+        if conditional.is_precondition_failed(etag):
+            return conditional.precondition_failed_response(etag)
+
+        errors = validate_user(user_data, required=('first_name', 'last_name', 'email'))
+        if errors:
+            return {'error': 'Invalid input data', 'details': errors}, 400
 
         # Update the user's profile with new data
-        user.update_profile(
-            first_name=user_data.get('first_name'),
-            last_name=user_data.get('last_name'),
-            email=user_data.get('email'),
-            password=user_data.get('password')
-        )
-        facade.update_user(user)  
-        return {'message': 'User updated successfully'}, 200
\ No newline at end of file
+        # The repository compares the version again, atomically with the write
+        try:
+            facade.update_user(user_id, user_data, conditional.expected_version(user))
+        except StaleWriteError:
+            return conditional.precondition_failed_response(conditional.make_etag(facade.get_user(user_id)))
+        except ConflictError:
+            return {'error': 'Email already registered'}, 409
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'message': 'User updated successfully'}, 200, conditional.validator_headers(conditional.make_etag(user))
+
+    @api.response(204, 'User deleted successfully')
+    @api.response(404, 'User not found')
+    def delete(self, user_id):
+        """
+        Delete a user.
+
+        This endpoint deletes a specific user based on its ID. Their places, reviews
+        and bookings disappear at once and are removed in the background.
+
+        Args:
+            user_id (str): The ID of the user to delete.
+
+        Returns:
+            status_code (int): 204 if deletion is successful, otherwise 404 if the user is not found.
+        """
+        try:
+            facade.delete_user(user_id)
+            return '', 204
+        except ValueError as e:
+            return {'error': str(e)}, 404
\ No newline at end of file
@@ -1,4 +1,5 @@
 from app.models.base import BaseModel
+from app.models.interning import intern_string
 
 class Amenity(BaseModel):
     """
@@ -10,6 +11,8 @@ class Amenity(BaseModel):
         name (str): The name of the amenity.
         description (str): A brief description of the amenity.
     """
+    INTERNED = BaseModel.INTERNED + ('name', 'description')
+
     def __init__(self, name, description):
         """
         Initialize a new instance of Amenity.
@@ -19,8 +22,8 @@ class Amenity(BaseModel):
             description (str): A brief description of the amenity.
         """
         super().__init__()
-        self.name = name
-        self.description = description
+        self.name = intern_string(name)
+        self.description = intern_string(description)
 
     def update(self, name=None, description=None):
         """
@@ -31,9 +34,9 @@ class Amenity(BaseModel):
             description (str, optional): New description for the amenity. Defaults to None.
         """
         if name is not None:
-            self.name = name
+            self.name = intern_string(name)
         if description is not None:
-            self.description = description
+            self.description = intern_string(description)
 
     def to_dict(self):
         """
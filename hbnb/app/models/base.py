@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from app.models.interning import intern_string
 
 class BaseModel:
     """
@@ -9,26 +10,43 @@ class BaseModel:
         id (str): Unique identifier for each instance, generated using UUID.
         created_at (datetime): Timestamp indicating when the instance was created.
         updated_at (datetime): Timestamp indicating when the instance was last updated.
+        version (int): Monotonically increasing counter, bumped on every persisted change.
     """
+    # Attributes whose strings repeat across objects (IDs referenced by other objects,
+    # names, descriptions); they are interned so that equal values share one object
+    INTERNED = ('id',)
+
     def __init__(self):
         """
         Initialize a new instance of BaseModel.
 
-        Generates a unique id and sets the created_at and updated_at timestamps
-        to the current date and time.
+        Generates a unique id, sets the created_at and updated_at timestamps
+        to the current date and time and starts the version at 1.
         """
-        self.id = str(uuid.uuid4())
+        # The canonical copy, which the references to this object are interned into
+        self.id = intern_string(str(uuid.uuid4()))
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
+        self.version = 1
+
+    def intern_strings(self):
+        """
+        Replace the values of the INTERNED attributes by their canonical copies.
+        """
+        for name in type(self).INTERNED:
+            value = getattr(self, name, None)
+            if value is not None:
+                setattr(self, name, intern_string(value))
 
     def save(self):
         """
-        Update the updated_at timestamp.
+        Update the updated_at timestamp and bump the version.
 
         This method should be called whenever the instance is modified to 
         reflect the current date and time.
         """
         self.updated_at = datetime.now()
+        self.version += 1
 
     def to_dict(self):
         """
@@ -0,0 +1,74 @@
+from datetime import date
+from app.models.base import BaseModel
+from app.models.interning import intern_string
+
+class Booking(BaseModel):
+    """
+    Booking represents a stay reserved by a user at a place.
+
+    Inherits from BaseModel to include id, created_at, and updated_at attributes.
+
+    Attributes:
+        place_id (str): The ID of the booked place.
+        user_id (str): The ID of the user who booked.
+        check_in (date): The day of arrival.
+        check_out (date): The day of departure; the place is free again that night.
+    """
+    INTERNED = BaseModel.INTERNED + ('place_id', 'user_id')
+
+    def __init__(self, place_id, user_id, check_in, check_out):
+        """
+        Initialize a new instance of Booking.
+
+        Args:
+            place_id (str): The ID of the booked place.
+            user_id (str): The ID of the user who booked.
+            check_in (date or str): The day of arrival, as a date or an ISO date string.
+            check_out (date or str): The day of departure, as a date or an ISO date string.
+
+        Raises:
+            ValueError: If a date is invalid or check_out is not after check_in.
+        """
+        super().__init__()
+        self.place_id = intern_string(place_id)
+        self.user_id = intern_string(user_id)
+        self.check_in = date.fromisoformat(check_in) if isinstance(check_in, str) else check_in
+        self.check_out = date.fromisoformat(check_out) if isinstance(check_out, str) else check_out
+
+        self.validate_dates()
+
+    def validate_dates(self):
+        """
+        Validate that the stay lasts at least one night.
+
+        Raises:
+            ValueError: If check_out is not after check_in.
+        """
+        if self.check_out <= self.check_in:
+            raise ValueError("check_out must be after check_in")
+
+    @property
+    def nights(self):
+        """
+        Get the length of the stay.
+
+        Returns:
+            int: The number of nights booked.
+        """
+        return (self.check_out - self.check_in).days
+
+    def to_dict(self):
+        """
+        Override to_dict to include the place, user and dates.
+
+        Returns:
+            dict: A dictionary containing the booking's details, with the dates as ISO strings.
+        """
+        booking_dict = super().to_dict()
+        booking_dict.update({
+            "place_id": self.place_id,
+            "user_id": self.user_id,
+            "check_in": self.check_in.isoformat(),
+            "check_out": self.check_out.isoformat()
+        })
+        return booking_dict
@@ -0,0 +1,70 @@
+import sys
+
+# Canonical copy of every interned string, keyed by itself
+_pool = {}
+# Pool size after the last prune; the next prune happens once it has doubled
+_pruned_size = 1024
+
+
+def intern_string(value):
+    """
+    Return the canonical copy of a string, so that equal strings share one object.
+
+    Unlike sys.intern(), which makes interned strings immortal on some Python
+    versions, the pool forgets strings nothing else references any more: it is
+    pruned whenever it has doubled in size since the last prune, so it stays within
+    twice the number of strings in use at an amortized O(1) cost per call.
+
+    Lists of strings are interned element by element, in place. Other values,
+    including str subclasses, are returned unchanged.
+
+    Args:
+        value: The value to intern.
+
+    Returns:
+        The canonical copy of value.
+    """
+    if type(value) is str:
+        canonical = _pool.get(value)
+        if canonical is None:
+            # setdefault is atomic, so racing threads agree on the canonical copy
+            canonical = _pool.setdefault(value, value)
+            if len(_pool) >= 2 * _pruned_size:
+                prune()
+        return canonical
+    if type(value) is list:
+        for i, item in enumerate(value):
+            if type(item) is str:
+                value[i] = intern_string(item)
+    return value
+
+
+def prune():
+    """
+    Forget the interned strings only the pool still references.
+
+    Returns:
+        int: The number of strings forgotten.
+    """
+    global _pruned_size
+    if not hasattr(sys, 'getrefcount'):
+        return 0
+    # References held here: the pool's key and value, the snapshot list, the loop
+    # variable and getrefcount's argument
+    unused = [value for value in list(_pool) if sys.getrefcount(value) <= 5]
+    for value in unused:
+        # A thread that fetched the string meanwhile keeps a valid copy; equal strings
+        # interned later just get a new canonical one
+        _pool.pop(value, None)
+    _pruned_size = max(1024, len(_pool))
+    return len(unused)
+
+
+def pool_size():
+    """
+    Get the number of strings in the pool.
+
+    Returns:
+        int: The number of interned strings.
+    """
+    return len(_pool)
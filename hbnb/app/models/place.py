@@ -1,4 +1,5 @@
 from app.models.base import BaseModel
+from app.models.interning import intern_string
 from app.models.amenity import Amenity
 from app.models.user import User
 from app.models.review import Review
@@ -20,6 +21,8 @@ class Place(BaseModel):
         amenities (list): A list of amenities available at the place.
         reviews (list): A list of reviews associated with the place.
     """
+    INTERNED = BaseModel.INTERNED + ('title', 'description', 'owner_id', 'amenities')
+
     def __init__(self, title, description, price, latitude, longitude, owner_id):
         """
         Initialize a new instance of Place.
@@ -33,12 +36,12 @@ class Place(BaseModel):
             owner_id (str): The ID of the user who owns the place.
         """
         super().__init__()
-        self.title = title
-        self.description = description
+        self.title = intern_string(title)
+        self.description = intern_string(description)
         self.price = price
         self.latitude = latitude
         self.longitude = longitude
-        self.owner_id = owner_id
+        self.owner_id = intern_string(owner_id)
         self.amenities = []
         self.reviews = []
 
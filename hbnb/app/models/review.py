@@ -1,4 +1,5 @@
 from app.models.base import BaseModel
+from app.models.interning import intern_string
 
 class Review(BaseModel):
     """
@@ -12,6 +13,8 @@ class Review(BaseModel):
         place_id (str): The ID of the place being reviewed.
         user_id (str): The ID of the user who wrote the review.
     """
+    INTERNED = BaseModel.INTERNED + ('place_id', 'user_id')
+
     def __init__(self, text, rating, place_id, user_id):
         """
         Initialize a new instance of Review.
@@ -28,8 +31,8 @@ class Review(BaseModel):
         super().__init__()
         self.text = text
         self.rating = rating
-        self.place_id = place_id
-        self.user_id = user_id
+        self.place_id = intern_string(place_id)
+        self.user_id = intern_string(user_id)
 
          # Validate the rating upon initialization
         self.validate_rating()
@@ -1,5 +1,6 @@
 from app.models.base import BaseModel
-import re
+from app.models.interning import intern_string
+from app.models.validation import EMAIL_PATTERN
 
 class User(BaseModel):
     """
@@ -14,6 +15,8 @@ class User(BaseModel):
         password (str): The user's password.
         is_admin (bool): Indicates if the user has admin privileges.
     """
+    INTERNED = BaseModel.INTERNED + ('first_name', 'last_name')
+
     def __init__(self, first_name, last_name, email, password, is_admin=False):
         """
         Initialize a new instance of User.
@@ -26,21 +29,36 @@ class User(BaseModel):
             is_admin (bool, optional): If True, the user has admin privileges. Defaults to False.
         """
         super().__init__()
-        self.first_name = first_name
-        self.last_name = last_name
+        self.first_name = intern_string(first_name)
+        self.last_name = intern_string(last_name)
         self.email = email
         self.password = password
         self.is_admin = is_admin
 
-    def validate_email(self):
+    @staticmethod
+    def normalize_email(email):
+        """
+        Normalize an email address for uniqueness checks.
+
+        Args:
+            email (str): The email address.
+
+        Returns:
+            str: The address without surrounding whitespace, in lower case.
+        """
+        return email.strip().lower()
+
+    def validate_email(self, email=None):
         """
         Validate the email format.
 
+        Args:
+            email (str, optional): The address to validate. Defaults to the user's email.
+
         Raises:
             ValueError: If the email format is invalid.
         """
-        email_regex = r'^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        if not re.match(email_regex, self.email):
+        if not EMAIL_PATTERN.match(self.email if email is None else email):
             raise ValueError("Invalid email format")
 
     def to_dict(self):
@@ -93,8 +111,11 @@ class User(BaseModel):
 
     def delete(self):
         """
-        Simulate user deletion.
+        Delete the user along with their places, reviews and bookings.
 
-        Additional deletion logic can be added here.
+        The user disappears from every read at once; the facade's sweeper removes
+        the dependents in the background.
         """
-        pass
\ No newline at end of file
+        # Imported here: the facade imports the models
+        from app.services.facade import get_facade
+        get_facade().delete_user(self.id)
\ No newline at end of file
@@ -0,0 +1,172 @@
+import re
+
+# Compiled once; User.validate_email and the user schema share it
+EMAIL_PATTERN = re.compile(r'^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class Field:
+    """
+    Declarative description of one payload field.
+
+    Attributes:
+        kind (type): str, int, float, bool or list (of strings). float accepts integers too;
+            bool is never a number.
+        required (bool): Whether the field must be present and non-empty.
+        nullable (bool): Whether null or an empty string may be given to leave the field unset.
+            Defaults to the opposite of `required`: a field that has to be set on creation
+            cannot be cleared by a partial update either.
+        minimum (float): Inclusive lower bound of a number.
+        maximum (float): Inclusive upper bound of a number.
+        pattern (Pattern): Compiled regular expression a string must match.
+        message (str): Error reported when a bound or the pattern is not met.
+    """
+    def __init__(self, kind, required=False, minimum=None, maximum=None, pattern=None, message=None,
+                 nullable=None):
+        self.kind = kind
+        self.required = required
+        self.nullable = not required if nullable is None else nullable
+        self.minimum = minimum
+        self.maximum = maximum
+        self.pattern = pattern
+        self.message = message
+
+
+def _compile_field(field):
+    """
+    Build a function returning the error message for a present value, or None if it is valid.
+
+    Only the checks a field declares end up in its function, so validating a value
+    costs a type check plus the bounds or pattern it actually has.
+    """
+    if field.kind is bool:
+        return lambda value: None if isinstance(value, bool) else 'Must be a boolean'
+
+    if field.kind is list:
+        return lambda value: (None if isinstance(value, list) and all(isinstance(item, str) for item in value)
+                              else 'Must be a list of strings')
+
+    if field.kind is str:
+        pattern = field.pattern
+        if pattern is None:
+            return lambda value: None if isinstance(value, str) else 'Must be a string'
+        match = pattern.match
+        message = field.message or 'Invalid format'
+        return lambda value: ('Must be a string' if not isinstance(value, str)
+                              else None if match(value) else message)
+
+    types = (int,) if field.kind is int else (int, float)
+    type_message = 'Must be an integer' if field.kind is int else 'Must be a number'
+    low = float('-inf') if field.minimum is None else field.minimum
+    high = float('inf') if field.maximum is None else field.maximum
+    message = field.message or f'Must be between {low} and {high}'
+
+    def check(value):
+        if not isinstance(value, types) or isinstance(value, bool):
+            return type_message
+        return None if low <= value <= high else message
+    return check
+
+
+def compile_schema(schema):
+    """
+    Compile a schema into a validator function.
+
+    Args:
+        schema (dict): Field names mapped to Field descriptions.
+
+    Returns:
+        function: validate(data, required=None) returning a list of {'field', 'error'} dicts,
+            empty if data is valid. `required` overrides the names of the required fields;
+            pass () to validate a partial update.
+    """
+    checks = tuple((name, field.nullable, _compile_field(field)) for name, field in schema.items())
+    default_required = frozenset(name for name, field in schema.items() if field.required)
+
+    def validate(data, required=None):
+        if not isinstance(data, dict):
+            return [{'field': None, 'error': 'Payload must be a JSON object'}]
+        required = default_required if required is None else required
+        errors = []
+        for name, nullable, check in checks:
+            value = data.get(name)
+            if value is None or value == '':
+                if name in required:
+                    errors.append({'field': name, 'error': 'Field is required'})
+                elif name in data and not nullable:
+                    # Given explicitly, e.g. {"price": null} in a partial update
+                    errors.append({'field': name, 'error': 'Field must not be empty'})
+                continue
+            error = check(value)
+            if error:
+                errors.append({'field': name, 'error': error})
+        return errors
+    return validate
+
+
+def validate_many(validate, items, required=None):
+    """
+    Validate an array of payloads in one pass.
+
+    Args:
+        validate (function): A validator built by compile_schema.
+        items (list): The payloads.
+        required (iterable, optional): Overrides the required fields, as for validate.
+
+    Returns:
+        list: {'index', 'errors'} for every invalid payload, empty if all are valid.
+    """
+    if not isinstance(items, list):
+        return [{'index': None, 'errors': [{'field': None, 'error': 'Payload must be a JSON array'}]}]
+    invalid = []
+    for index, item in enumerate(items):
+        errors = validate(item, required)
+        if errors:
+            invalid.append({'index': index, 'errors': errors})
+    return invalid
+
+
+USER_SCHEMA = {
+    'first_name': Field(str, required=True),
+    'last_name': Field(str, required=True),
+    'email': Field(str, required=True, pattern=EMAIL_PATTERN, message='Invalid email format'),
+    'password': Field(str, required=True),
+    'is_admin': Field(bool)
+}
+
+AMENITY_SCHEMA = {
+    'name': Field(str, required=True),
+    'description': Field(str)
+}
+
+PLACE_SCHEMA = {
+    'title': Field(str, required=True),
+    'description': Field(str),
+    'price': Field(float, required=True, minimum=0, message='Price must be a non-negative value'),
+    'latitude': Field(float, required=True, minimum=-90, maximum=90,
+                      message='Latitude must be between -90 and 90'),
+    'longitude': Field(float, required=True, minimum=-180, maximum=180,
+                       message='Longitude must be between -180 and 180'),
+    'owner_id': Field(str, required=True),
+    'amenities': Field(list)
+}
+
+REVIEW_SCHEMA = {
+    'text': Field(str, required=True),
+    'rating': Field(int, required=True, minimum=1, maximum=5, message='Rating must be between 1 and 5'),
+    'place_id': Field(str, required=True),
+    'user_id': Field(str, required=True)
+}
+
+BOOKING_SCHEMA = {
+    'user_id': Field(str, required=True),
+    'check_in': Field(str, required=True, pattern=DATE_PATTERN, message='Must be a date (YYYY-MM-DD)'),
+    'check_out': Field(str, required=True, pattern=DATE_PATTERN, message='Must be a date (YYYY-MM-DD)')
+}
+
+# Compiled at import, once per model
+validate_user = compile_schema(USER_SCHEMA)
+validate_amenity = compile_schema(AMENITY_SCHEMA)
+validate_place = compile_schema(PLACE_SCHEMA)
+validate_review = compile_schema(REVIEW_SCHEMA)
+validate_booking = compile_schema(BOOKING_SCHEMA)
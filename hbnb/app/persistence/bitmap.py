@@ -0,0 +1,144 @@
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+CHUNK_BYTES = (1 << CHUNK_BITS) // 8
+
+
+class Bitmap:
+    """
+    Compressed set of non-negative integers, split in 65536-bit chunks.
+
+    As in roaring bitmaps, the high bits of an integer select a chunk and the low
+    bits a position in it; only non-empty chunks are stored. A chunk is a Python
+    int used as a bitset, so AND/OR of two bitmaps are one C-level big-integer
+    operation per shared chunk, and sparse regions of the integer space cost nothing.
+    """
+    __slots__ = ('_chunks',)
+
+    def __init__(self, chunks=None):
+        """
+        Initialize a bitmap.
+
+        Args:
+            chunks (dict, optional): Chunk number mapped to a non-zero int bitset.
+        """
+        self._chunks = chunks or {}
+
+    def add(self, n):
+        """
+        Add an integer to the set.
+
+        Args:
+            n (int): The integer.
+        """
+        high = n >> CHUNK_BITS
+        self._chunks[high] = self._chunks.get(high, 0) | (1 << (n & CHUNK_MASK))
+
+    def update(self, values):
+        """
+        Add several integers, rebuilding each touched chunk once.
+
+        Args:
+            values (iterable): The integers.
+        """
+        buffers = {}
+        for n in values:
+            high = n >> CHUNK_BITS
+            buffer = buffers.get(high)
+            if buffer is None:
+                buffer = buffers[high] = bytearray(self._chunks.get(high, 0).to_bytes(CHUNK_BYTES, 'little'))
+            low = n & CHUNK_MASK
+            buffer[low >> 3] |= 1 << (low & 7)
+        for high, buffer in buffers.items():
+            self._chunks[high] = int.from_bytes(buffer, 'little')
+
+    def discard(self, n):
+        """
+        Remove an integer from the set if present.
+
+        Args:
+            n (int): The integer.
+        """
+        high = n >> CHUNK_BITS
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            return
+        chunk &= ~(1 << (n & CHUNK_MASK))
+        if chunk:
+            self._chunks[high] = chunk
+        else:
+            del self._chunks[high]
+
+    def __contains__(self, n):
+        return bool(self._chunks.get(n >> CHUNK_BITS, 0) >> (n & CHUNK_MASK) & 1)
+
+    def __len__(self):
+        return sum(chunk.bit_count() for chunk in self._chunks.values())
+
+    def __bool__(self):
+        return bool(self._chunks)
+
+    def __iter__(self):
+        for high in sorted(self._chunks):
+            base = high << CHUNK_BITS
+            # Least significant bit first; str.find skips the zeros at C speed
+            bits = bin(self._chunks[high])[:1:-1]
+            i = bits.find('1')
+            while i != -1:
+                yield base + i
+                i = bits.find('1', i + 1)
+
+    def __and__(self, other):
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        chunks = {}
+        for high, chunk in small.items():
+            common = chunk & large.get(high, 0)
+            if common:
+                chunks[high] = common
+        return Bitmap(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self._chunks)
+        for high, chunk in other._chunks.items():
+            chunks[high] = chunks.get(high, 0) | chunk
+        return Bitmap(chunks)
+
+    def copy(self):
+        """
+        Return a shallow copy; chunks are immutable ints, so it is independent.
+        """
+        return Bitmap(dict(self._chunks))
+
+    @staticmethod
+    def intersection(bitmaps):
+        """
+        Intersect bitmaps, smallest first so that the intermediate results stay small.
+
+        Args:
+            bitmaps (list): At least one Bitmap.
+
+        Returns:
+            Bitmap: The integers present in every bitmap.
+        """
+        bitmaps = sorted(bitmaps, key=lambda bitmap: len(bitmap._chunks))
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result if len(bitmaps) > 1 else result.copy()
+
+    @staticmethod
+    def union(bitmaps):
+        """
+        Unite bitmaps.
+
+        Args:
+            bitmaps (iterable): The bitmaps.
+
+        Returns:
+            Bitmap: The integers present in any bitmap.
+        """
+        result = Bitmap()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
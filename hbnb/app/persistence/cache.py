@@ -0,0 +1,509 @@
+import pickle
+import socket
+import threading
+import time
+from collections import OrderedDict
+from app.persistence.repository import Repository
+
+# Marker stored in the local tier for IDs known not to exist
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used cache with optional per-entry expiry.
+
+    Attributes:
+        capacity (int): Maximum number of entries kept.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            capacity (int, optional): Maximum number of entries kept. Defaults to 1024.
+        """
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Retrieve an entry and mark it as recently used.
+
+        Args:
+            key (str): The key to look up.
+            default: Value returned when the key is absent or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store an entry, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (str): The key to store.
+            value: The value to store.
+            ttl (float, optional): Seconds before the entry expires. Defaults to never.
+        """
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove an entry if present.
+
+        Args:
+            key (str): The key to remove.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class MemcachedClient:
+    """
+    Minimal client for the memcached text protocol (get/set/delete), used as the shared
+    cache tier. Values are pickled. Any connection or protocol error is treated as a
+    cache miss so that an unavailable cache server never fails a request.
+
+    Attributes:
+        host (str): The server host.
+        port (int): The server port.
+        timeout (float): Socket timeout in seconds.
+    """
+    def __init__(self, host='127.0.0.1', port=11211, timeout=0.5):
+        """
+        Initialize the client. The connection is opened lazily.
+
+        Args:
+            host (str, optional): The server host. Defaults to '127.0.0.1'.
+            port (int, optional): The server port. Defaults to 11211.
+            timeout (float, optional): Socket timeout in seconds. Defaults to 0.5.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), self.timeout)
+            self._file = self._sock.makefile('rb')
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _call(self, request, read_reply):
+        with self._lock:
+            try:
+                self._connect()
+                self._sock.sendall(request)
+                return read_reply()
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+                # Drop the connection, it is reopened on the next call
+                self._close()
+                return None
+
+    def get(self, key):
+        """
+        Retrieve a value.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            The unpickled value, or None on a miss or error.
+        """
+        def read_reply():
+            header = self._file.readline()
+            if header == b'END\r\n':
+                return None
+            parts = header.split()
+            if len(parts) != 4 or parts[0] != b'VALUE':
+                raise ValueError(f"Unexpected reply: {header!r}")
+            data = self._file.read(int(parts[3]) + 2)[:-2]
+            if self._file.readline() != b'END\r\n':
+                raise ValueError("Missing END marker")
+            return pickle.loads(data)
+        return self._call(f"get {key}\r\n".encode(), read_reply)
+
+    def get_many(self, keys):
+        """
+        Retrieve several values in one round trip.
+
+        Args:
+            keys (list): The keys to look up.
+
+        Returns:
+            dict: The unpickled values of the keys found; empty on error.
+        """
+        if not keys:
+            return {}
+
+        def read_reply():
+            values = {}
+            while True:
+                header = self._file.readline()
+                if header == b'END\r\n':
+                    return values
+                parts = header.split()
+                if len(parts) != 4 or parts[0] != b'VALUE':
+                    raise ValueError(f"Unexpected reply: {header!r}")
+                data = self._file.read(int(parts[3]) + 2)[:-2]
+                values[parts[1].decode()] = pickle.loads(data)
+        return self._call(f"get {' '.join(keys)}\r\n".encode(), read_reply) or {}
+
+    def set(self, key, value, ttl=0):
+        """
+        Store a value.
+
+        Args:
+            key (str): The key to store.
+            value: The value to store; it must be picklable.
+            ttl (int, optional): Seconds before the entry expires, 0 for never. Defaults to 0.
+
+        Returns:
+            bool: True if the server stored the value.
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        request = f"set {key} 0 {int(ttl)} {len(data)}\r\n".encode() + data + b"\r\n"
+        return self._call(request, lambda: self._file.readline() == b'STORED\r\n') or False
+
+    def delete(self, key):
+        """
+        Remove a value.
+
+        Args:
+            key (str): The key to remove.
+        """
+        self._call(f"delete {key}\r\n".encode(), lambda: self._file.readline())
+
+
+class _Flight:
+    """
+    A load in progress for one key, shared by every caller that asks for it meanwhile.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # Set when a write invalidates the key while the load is running
+        self.stale = False
+
+
+class CachedRepository(Repository):
+    """
+    Read-through cache in front of another repository.
+
+    Lookups by ID go through an in-process LRU tier, then an optional shared tier
+    (for example a MemcachedClient), then the wrapped repository. Writes go to the
+    wrapped repository first and then invalidate both tiers. IDs that are not found
+    are cached for a short time (negative caching), and concurrent misses for the
+    same ID are collapsed into a single backend load (single-flight), whether they
+    come from get() or get_many().
+
+    Local entries expire after local_ttl seconds: writes made through another
+    process only invalidate the shared tier, so this bounds how long this process
+    can serve an outdated copy.
+
+    Attributes:
+        backend (Repository): The wrapped repository.
+        local (LRUCache): The in-process tier.
+        shared: The optional shared tier, exposing get/set/delete.
+    """
+    def __init__(self, backend, capacity=1024, shared=None, namespace='', ttl=300, negative_ttl=5,
+                 local_ttl=30):
+        """
+        Initialize the cache.
+
+        Args:
+            backend (Repository): The wrapped repository.
+            capacity (int, optional): Size of the in-process tier. Defaults to 1024.
+            shared (optional): Shared tier client with get/set/delete. Defaults to None.
+            namespace (str, optional): Prefix for shared tier keys, e.g. the entity type. Defaults to ''.
+            ttl (int, optional): Seconds an entity stays in the shared tier. Defaults to 300.
+            negative_ttl (float, optional): Seconds a missing ID stays cached. Defaults to 5.
+            local_ttl (float, optional): Seconds an entity stays in the in-process tier. Defaults to 30.
+        """
+        self.backend = backend
+        self.local = LRUCache(capacity)
+        self.shared = shared
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.local_ttl = local_ttl
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def _shared_key(self, obj_id):
+        key = f"{self.namespace}:{obj_id}"
+        # memcached keys are limited to 250 printable characters without whitespace
+        if len(key) > 250 or not key.isprintable() or any(c.isspace() for c in key):
+            return None
+        return key
+
+    def _load(self, obj_id):
+        """
+        Load an object from the shared tier, falling back to the backend.
+        """
+        key = self._shared_key(obj_id) if self.shared else None
+        obj = self.shared.get(key) if key else None
+        if obj is None:
+            obj = self.backend.get(obj_id)
+            if obj is not None and key:
+                self.shared.set(key, obj, self.ttl)
+        return obj
+
+    def _load_many(self, obj_ids):
+        """
+        Load several objects with one shared tier lookup, then one backend get_many()
+        for the shared misses.
+        """
+        keys = {}
+        if self.shared:
+            keys = {obj_id: key for obj_id in obj_ids
+                    for key in (self._shared_key(obj_id),) if key}
+        found = self.shared.get_many(list(keys.values())) if keys else {}
+        objs = {obj_id: found.get(keys[obj_id]) for obj_id in keys}
+        misses = [obj_id for obj_id in obj_ids if objs.get(obj_id) is None]
+        if misses:
+            for obj_id, obj in zip(misses, self.backend.get_many(misses)):
+                objs[obj_id] = obj
+                if obj is not None and obj_id in keys:
+                    self.shared.set(keys[obj_id], obj, self.ttl)
+        return objs
+
+    def _lookup(self, obj_id):
+        """
+        Look an ID up in the local tier.
+
+        Returns:
+            tuple: (True, object or None) on a hit, (False, None) on a miss.
+        """
+        cached = self.local.get(obj_id)
+        if cached is _MISSING:
+            return True, None
+        return cached is not None, cached
+
+    def _join(self, obj_id):
+        """
+        Return the load in flight for an ID and whether the caller must run it.
+        """
+        with self._flights_lock:
+            flight = self._flights.get(obj_id)
+            if flight is None:
+                flight = self._flights[obj_id] = _Flight()
+                return flight, True
+            return flight, False
+
+    def _land(self, obj_id, flight):
+        """
+        Complete a load run by the caller: cache its result unless a write made it
+        stale, and wake the callers waiting for it.
+        """
+        with self._flights_lock:
+            del self._flights[obj_id]
+            # A load that raced with a write may be outdated, so it is not cached
+            if not flight.error and not flight.stale:
+                if flight.result is None:
+                    self.local.set(obj_id, _MISSING, self.negative_ttl)
+                else:
+                    self.local.set(obj_id, flight.result, self.local_ttl)
+        flight.done.set()
+
+    @staticmethod
+    def _wait(flight):
+        flight.done.wait()
+        if flight.error:
+            raise flight.error
+        return flight.result
+
+    def _invalidate(self, obj_id):
+        with self._flights_lock:
+            flight = self._flights.get(obj_id)
+            if flight:
+                flight.stale = True
+        self.local.delete(obj_id)
+        if self.shared:
+            key = self._shared_key(obj_id)
+            if key:
+                self.shared.delete(key)
+
+    def add(self, obj):
+        """
+        Add an object to the backend and drop any cached (negative) entry for its ID.
+
+        Args:
+            obj (BaseModel): The object to add.
+        """
+        self.backend.add(obj)
+        self._invalidate(obj.id)
+
+    def add_many(self, objs):
+        """
+        Add several objects to the backend in one call and drop cached entries for their IDs.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            list: (obj, ConflictError) pairs for the objects the backend rejected.
+        """
+        objs = list(objs)
+        rejected = self.backend.add_many(objs)
+        for obj in objs:
+            self._invalidate(obj.id)
+        return rejected
+
+    def get(self, obj_id):
+        """
+        Retrieve an object by its ID through the cache tiers.
+
+        Args:
+            obj_id (str): The ID of the object to retrieve.
+
+        Returns:
+            BaseModel: The object with the specified ID, or None if not found.
+        """
+        hit, cached = self._lookup(obj_id)
+        if hit:
+            return cached
+
+        flight, leader = self._join(obj_id)
+        if not leader:
+            return self._wait(flight)
+
+        try:
+            flight.result = self._load(obj_id)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(obj_id, flight)
+        return flight.result
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects through the cache tiers.
+
+        The local-tier misses already being loaded by another caller are waited for;
+        the others are loaded together, with one shared tier lookup and one backend
+        get_many() for the shared misses.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        results = {}
+        led = {}
+        joined = {}
+        for obj_id in dict.fromkeys(obj_ids):
+            hit, cached = self._lookup(obj_id)
+            if hit:
+                results[obj_id] = cached
+                continue
+            flight, leader = self._join(obj_id)
+            (led if leader else joined)[obj_id] = flight
+
+        if led:
+            try:
+                loaded = self._load_many(list(led))
+            except Exception as e:
+                for flight in led.values():
+                    flight.error = e
+                raise
+            else:
+                for obj_id, flight in led.items():
+                    flight.result = results[obj_id] = loaded.get(obj_id)
+            finally:
+                for obj_id, flight in led.items():
+                    self._land(obj_id, flight)
+        for obj_id, flight in joined.items():
+            results[obj_id] = self._wait(flight)
+        return [results[obj_id] for obj_id in obj_ids]
+
+    def get_all(self):
+        """
+        Retrieve all objects from the backend.
+
+        Returns:
+            list: A list of all objects in the repository.
+        """
+        return self.backend.get_all()
+
+    def update(self, obj_id, data, expected_version=None):
+        """
+        Update an object in the backend, then invalidate its cached copies.
+
+        Args:
+            obj_id (str): The ID of the object to update.
+            data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this version.
+
+        Raises:
+            KeyError: If the object with the specified ID is not found.
+            StaleWriteError: If the object is no longer at expected_version.
+        """
+        try:
+            self.backend.update(obj_id, data, expected_version)
+        finally:
+            self._invalidate(obj_id)
+
+    def delete(self, obj_id):
+        """
+        Delete an object from the backend, then invalidate its cached copies.
+
+        Args:
+            obj_id (str): The ID of the object to delete.
+        """
+        try:
+            self.backend.delete(obj_id)
+        finally:
+            self._invalidate(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve an object by a specific attribute from the backend.
+
+        Args:
+            attr_name (str): The name of the attribute to search by.
+            attr_value: The value of the attribute to match.
+
+        Returns:
+            BaseModel: The object with the specified attribute value, or None if not found.
+        """
+        return self.backend.get_by_attribute(attr_name, attr_value)
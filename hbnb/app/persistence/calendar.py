@@ -0,0 +1,127 @@
+import threading
+from bisect import bisect_left
+from app.persistence.repository import ConflictError
+
+
+class _PlaceCalendar:
+    """
+    The bookings of one place as disjoint [check_in, check_out) intervals sorted by check_in.
+    """
+    def __init__(self):
+        self.starts = []
+        self.entries = []
+        self.lock = threading.Lock()
+
+    def overlaps(self, start, end):
+        # Intervals are disjoint and sorted, so only the neighbours of start can overlap
+        i = bisect_left(self.starts, start)
+        if i > 0 and self.entries[i - 1][1] > start:
+            return True
+        return i < len(self.starts) and self.starts[i] < end
+
+
+class BookingCalendar:
+    """
+    Per-place booking calendars answering overlap queries in O(log n).
+
+    Bookings of a place never overlap, so each calendar is a sorted list of disjoint
+    intervals: an overlap check is a binary search for the neighbours of the new
+    interval. Every place has its own lock, so the check and the insertion it guards
+    are atomic without serializing bookings of different places.
+    """
+    def __init__(self):
+        """
+        Initialize an empty calendar.
+        """
+        self._calendars = {}
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def _calendar(self, place_id):
+        calendar = self._calendars.get(place_id)
+        if calendar is None:
+            with self._lock:
+                calendar = self._calendars.setdefault(place_id, _PlaceCalendar())
+        return calendar
+
+    def reserve(self, place_id, booking_id, check_in, check_out):
+        """
+        Reserve the nights from check_in to check_out for a booking.
+
+        Args:
+            place_id (str): The ID of the booked place.
+            booking_id (str): The ID of the booking.
+            check_in (date): The day of arrival.
+            check_out (date): The day of departure.
+
+        Raises:
+            ConflictError: If the place is already booked for one of the nights.
+        """
+        calendar = self._calendar(place_id)
+        with calendar.lock:
+            if calendar.overlaps(check_in, check_out):
+                raise ConflictError('dates', f"{check_in.isoformat()}/{check_out.isoformat()}")
+            i = bisect_left(calendar.starts, check_in)
+            calendar.starts.insert(i, check_in)
+            calendar.entries.insert(i, (check_in, check_out, booking_id))
+            self._starts[booking_id] = (place_id, check_in)
+
+    def release(self, booking_id):
+        """
+        Free the nights held by a booking, if any.
+
+        Args:
+            booking_id (str): The ID of the booking.
+        """
+        place_id, check_in = self._starts.pop(booking_id, (None, None))
+        if place_id is None:
+            return
+        calendar = self._calendar(place_id)
+        with calendar.lock:
+            i = bisect_left(calendar.starts, check_in)
+            if i < len(calendar.entries) and calendar.entries[i][2] == booking_id:
+                del calendar.starts[i]
+                del calendar.entries[i]
+
+    def is_free(self, place_id, check_in, check_out):
+        """
+        Check whether a place is free for every night from check_in to check_out.
+
+        Args:
+            place_id (str): The ID of the place.
+            check_in (date): The day of arrival.
+            check_out (date): The day of departure.
+
+        Returns:
+            bool: True if no booking overlaps the stay.
+        """
+        calendar = self._calendars.get(place_id)
+        if calendar is None:
+            return True
+        with calendar.lock:
+            return not calendar.overlaps(check_in, check_out)
+
+    def booking_ids(self, place_id, start=None, end=None):
+        """
+        Return the IDs of a place's bookings overlapping [start, end), by check-in date.
+
+        Args:
+            place_id (str): The ID of the place.
+            start (date, optional): Start of the window; None for unbounded.
+            end (date, optional): End of the window; None for unbounded.
+
+        Returns:
+            list: The booking IDs in check-in order.
+        """
+        calendar = self._calendars.get(place_id)
+        if calendar is None:
+            return []
+        with calendar.lock:
+            first = 0
+            if start is not None:
+                first = bisect_left(calendar.starts, start)
+                # The booking starting before the window may still run into it
+                if first > 0 and calendar.entries[first - 1][1] > start:
+                    first -= 1
+            last = len(calendar.starts) if end is None else bisect_left(calendar.starts, end)
+            return [booking_id for _, _, booking_id in calendar.entries[first:last]]
@@ -0,0 +1,222 @@
+import threading
+from app.persistence.bitmap import Bitmap
+
+
+class AmenityCatalog:
+    """
+    Amenities and places encoded as dense integers for set filtering.
+
+    Every amenity gets a small code when it is created and every place a code when
+    its amenities are first set. A place's amenities are kept as an int bitset of
+    amenity codes, and every amenity has a posting Bitmap of the codes of the places
+    offering it. "Places with wifi AND pool" is then an intersection of two postings
+    instead of a scan of every place's amenity list.
+
+    Codes are never reused: a removed place leaves its code unused, so selections
+    computed before the removal stay meaningful.
+    """
+    def __init__(self):
+        """
+        Initialize an empty catalog.
+        """
+        self._codes = {}
+        self._amenity_ids = []
+        self._postings = []
+        self._place_codes = {}
+        self._place_ids = []
+        self._place_bits = []
+        self._lock = threading.Lock()
+
+    def register(self, amenity_id):
+        """
+        Assign a code to an amenity, if it has none yet.
+
+        Args:
+            amenity_id (str): The ID of the amenity.
+
+        Returns:
+            int: The amenity's code.
+        """
+        code = self._codes.get(amenity_id)
+        if code is None:
+            with self._lock:
+                code = self._register(amenity_id)
+        return code
+
+    def code(self, amenity_id):
+        """
+        Return the code of an amenity.
+
+        Args:
+            amenity_id (str): The ID of the amenity.
+
+        Returns:
+            int: The amenity's code, or None if it has none.
+        """
+        return self._codes.get(amenity_id)
+
+    def _register(self, amenity_id):
+        code = self._codes.get(amenity_id)
+        if code is None:
+            code = self._codes[amenity_id] = len(self._postings)
+            self._amenity_ids.append(amenity_id)
+            self._postings.append(Bitmap())
+        return code
+
+    def unregister(self, amenity_id):
+        """
+        Forget an amenity: filters on it match no place from now on.
+
+        Args:
+            amenity_id (str): The ID of the amenity.
+        """
+        with self._lock:
+            code = self._codes.pop(amenity_id, None)
+            if code is not None:
+                self._amenity_ids[code] = None
+                self._postings[code] = Bitmap()
+
+    def _place_code(self, place_id):
+        code = self._place_codes.get(place_id)
+        if code is None:
+            code = self._place_codes[place_id] = len(self._place_ids)
+            self._place_ids.append(place_id)
+            self._place_bits.append(0)
+        return code
+
+    def set_place(self, place_id, amenity_ids):
+        """
+        Record the amenities of a place, replacing the previous ones.
+
+        Args:
+            place_id (str): The ID of the place.
+            amenity_ids (iterable): The IDs of its amenities.
+        """
+        with self._lock:
+            code = self._place_code(place_id)
+            bits = 0
+            for amenity_id in amenity_ids:
+                bits |= 1 << self._register(amenity_id)
+            old = self._place_bits[code]
+            for amenity_code in _codes_of(old & ~bits):
+                self._postings[amenity_code].discard(code)
+            for amenity_code in _codes_of(bits & ~old):
+                self._postings[amenity_code].add(code)
+            self._place_bits[code] = bits
+
+    def set_places(self, places):
+        """
+        Record the amenities of new places in bulk, rebuilding each posting chunk once.
+
+        Args:
+            places (iterable): (place_id, amenity_ids) pairs of places not in the catalog yet.
+        """
+        with self._lock:
+            additions = {}
+            for place_id, amenity_ids in places:
+                code = self._place_code(place_id)
+                bits = 0
+                for amenity_id in amenity_ids:
+                    amenity_code = self._register(amenity_id)
+                    bits |= 1 << amenity_code
+                    additions.setdefault(amenity_code, []).append(code)
+                self._place_bits[code] = bits
+            for amenity_code, place_codes in additions.items():
+                self._postings[amenity_code].update(place_codes)
+
+    def remove_place(self, place_id):
+        """
+        Drop a place from the postings.
+
+        Args:
+            place_id (str): The ID of the place.
+        """
+        with self._lock:
+            code = self._place_codes.pop(place_id, None)
+            if code is None:
+                return
+            for amenity_code in _codes_of(self._place_bits[code]):
+                self._postings[amenity_code].discard(code)
+            self._place_bits[code] = 0
+            self._place_ids[code] = None
+
+    def select(self, all_of=(), any_of=()):
+        """
+        Compute the places offering every amenity of all_of and at least one of any_of.
+
+        Unknown amenity IDs are offered by no place: one in all_of empties the
+        selection, while in any_of it is simply never matched.
+
+        Args:
+            all_of (iterable, optional): Amenity IDs combined with AND.
+            any_of (iterable, optional): Amenity IDs combined with OR.
+
+        Returns:
+            Bitmap: The codes of the matching places; test membership with contains().
+        """
+        with self._lock:
+            required = []
+            for amenity_id in all_of:
+                code = self._codes.get(amenity_id)
+                if code is None:
+                    return Bitmap()
+                required.append(self._postings[code])
+            any_codes = [self._codes[amenity_id] for amenity_id in any_of if amenity_id in self._codes]
+            if any_of:
+                required.append(Bitmap.union(self._postings[code] for code in any_codes))
+            if not required:
+                return Bitmap.union(self._postings)
+            return Bitmap.intersection(required)
+
+    def contains(self, selection, place_id):
+        """
+        Check whether a place is in a selection.
+
+        Args:
+            selection (Bitmap): A result of select().
+            place_id (str): The ID of the place.
+
+        Returns:
+            bool: True if the place matched.
+        """
+        code = self._place_codes.get(place_id)
+        return code is not None and code in selection
+
+    def place_ids(self, selection):
+        """
+        Decode a selection into place IDs.
+
+        Args:
+            selection (Bitmap): A result of select().
+
+        Returns:
+            list: The IDs of the places, in the order their codes were assigned.
+        """
+        place_ids = self._place_ids
+        return [place_ids[code] for code in selection if place_ids[code] is not None]
+
+    def amenity_ids(self, place_id):
+        """
+        Decode the amenities of a place.
+
+        Args:
+            place_id (str): The ID of the place.
+
+        Returns:
+            list: The IDs of its amenities, in code order.
+        """
+        code = self._place_codes.get(place_id)
+        if code is None:
+            return []
+        amenity_ids = (self._amenity_ids[amenity_code] for amenity_code in _codes_of(self._place_bits[code]))
+        return [amenity_id for amenity_id in amenity_ids if amenity_id is not None]
+
+
+def _codes_of(bits):
+    """
+    Yield the positions of the set bits of a small int bitset.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -0,0 +1,335 @@
+import math
+import threading
+from array import array
+from app.persistence.repository import Repository, StaleWriteError
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; queries fall back to plain loops over the arrays
+    np = None
+
+
+# Marks an attribute a row's object did not have
+_MISSING = object()
+
+
+class ColumnarRepository(Repository):
+    """
+    Repository storing objects column by column rather than as Python objects.
+
+    Each object gets a row. Every attribute is kept in a list per attribute name,
+    which saves the per-object instance dictionary, and the hot numeric attributes
+    (for example Place.price, latitude and longitude, or Review.rating) are also
+    kept as `array('d')` columns, so that range filters and aggregates scan flat
+    memory. When NumPy is installed the scans are vectorized over zero-copy views of
+    the columns.
+
+    Objects are materialized from their row only when a read returns them. They
+    are copies: changing one does not change the stored row, update() does.
+
+    Attributes:
+        columns (tuple): Names of the numeric attributes stored as columns.
+    """
+    def __init__(self, columns):
+        """
+        Initialize an empty repository.
+
+        Args:
+            columns (iterable): Names of the numeric attributes to store as columns.
+        """
+        self.columns = tuple(columns)
+        self._data = {name: array('d') for name in self.columns}
+        # Attribute name mapped to its value in every row, _MISSING where unset
+        self._fields = {}
+        self._classes = []
+        self._ids = []
+        self._rows = {}
+        # Views handed to NumPy pin the buffers, so resizes and scans must not overlap
+        self._lock = threading.RLock()
+
+    def _values(self, obj):
+        values = []
+        for name in self.columns:
+            value = getattr(obj, name, None)
+            values.append(float(value) if value is not None else math.nan)
+        return values
+
+    def add(self, obj):
+        """
+        Add an object to the repository, or replace the stored object with the same ID.
+
+        Args:
+            obj (BaseModel): The object to add.
+        """
+        obj.intern_strings()
+        with self._lock:
+            row = self._rows.get(obj.id)
+            if row is None:
+                row = self._rows[obj.id] = len(self._ids)
+                self._ids.append(obj.id)
+                self._classes.append(None)
+                for values in self._fields.values():
+                    values.append(_MISSING)
+                for name in self.columns:
+                    self._data[name].append(math.nan)
+            self._write_row(row, obj)
+
+    def _write_row(self, row, obj):
+        self._classes[row] = type(obj)
+        attributes = vars(obj)
+        for name, values in self._fields.items():
+            values[row] = attributes.get(name, _MISSING)
+        for name, value in attributes.items():
+            if name not in self._fields:
+                values = self._fields[name] = [_MISSING] * len(self._ids)
+                values[row] = value
+        for name, value in zip(self.columns, self._values(obj)):
+            self._data[name][row] = value
+
+    def _materialize(self, row):
+        """
+        Build a new object from a stored row.
+        """
+        obj = self._classes[row].__new__(self._classes[row])
+        attributes = obj.__dict__
+        for name, values in self._fields.items():
+            value = values[row]
+            if value is not _MISSING:
+                # Lists are copied so that changing the object leaves the row alone
+                attributes[name] = value[:] if type(value) is list else value
+        return obj
+
+    def get(self, obj_id):
+        """
+        Retrieve an object by its ID.
+
+        Args:
+            obj_id (str): The ID of the object to retrieve.
+
+        Returns:
+            BaseModel: A copy of the object with the specified ID, or None if not found.
+        """
+        with self._lock:
+            row = self._rows.get(obj_id)
+            return self._materialize(row) if row is not None else None
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs in one call.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        with self._lock:
+            return [self.get(obj_id) for obj_id in obj_ids]
+
+    def get_all(self):
+        """
+        Retrieve all objects from the repository.
+
+        Returns:
+            list: A list of all objects in the repository.
+        """
+        with self._lock:
+            return [self._materialize(row) for row in range(len(self._ids))]
+
+    def update(self, obj_id, data, expected_version=None):
+        """
+        Update an object's attributes and its column values.
+
+        Args:
+            obj_id (str): The ID of the object to update.
+            data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this version.
+
+        Raises:
+            KeyError: If the object with the specified ID is not found.
+            StaleWriteError: If the object is no longer at expected_version.
+        """
+        with self._lock:
+            row = self._rows.get(obj_id)
+            if row is None:
+                raise KeyError("Object not found")
+            obj = self._materialize(row)
+            if expected_version is not None and obj.version != expected_version:
+                raise StaleWriteError(obj_id, expected_version, obj.version)
+            for key, value in data.items():
+                setattr(obj, key, value)
+            obj.save()
+            obj.intern_strings()
+            self._write_row(row, obj)
+
+    def delete(self, obj_id):
+        """
+        Delete an object by its ID.
+
+        The last row is moved into the freed slot so the columns stay dense.
+
+        Args:
+            obj_id (str): The ID of the object to delete.
+        """
+        with self._lock:
+            row = self._rows.pop(obj_id, None)
+            if row is None:
+                return
+            last = len(self._ids) - 1
+            stored = (self._ids, self._classes, *self._fields.values(), *self._data.values())
+            if row != last:
+                self._rows[self._ids[last]] = row
+                for values in stored:
+                    values[row] = values[last]
+            for values in stored:
+                values.pop()
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve an object by a specific attribute.
+
+        Args:
+            attr_name (str): The name of the attribute to search by.
+            attr_value: The value of the attribute to match.
+
+        Returns:
+            BaseModel: The object with the specified attribute value, or None if not found.
+        """
+        with self._lock:
+            if attr_name in self._data:
+                rows = self._match(((attr_name, attr_value, attr_value),))
+                return self._materialize(rows[0]) if rows else None
+            values = self._fields.get(attr_name)
+            if values is not None:
+                row = next((row for row, value in enumerate(values) if value == attr_value), None)
+                return self._materialize(row) if row is not None else None
+            # A property computed from other attributes: materialize the rows to evaluate it
+            return next((obj for obj in map(self._materialize, range(len(self._ids)))
+                         if getattr(obj, attr_name, None) == attr_value), None)
+
+    def _match(self, ranges):
+        """
+        Return the rows whose column values fall within every (name, low, high) range.
+        A bound of None leaves that side open.
+        """
+        with self._lock:
+            if not self._ids:
+                return []
+            if np is not None:
+                mask = np.ones(len(self._ids), dtype=bool)
+                for name, low, high in ranges:
+                    column = np.frombuffer(self._data[name], dtype=np.float64)
+                    if low is not None:
+                        mask &= column >= low
+                    if high is not None:
+                        mask &= column <= high
+                return np.flatnonzero(mask).tolist()
+
+            rows = range(len(self._ids))
+            for name, low, high in ranges:
+                column = self._data[name]
+                rows = [row for row in rows
+                        if (low is None or column[row] >= low) and (high is None or column[row] <= high)]
+            return list(rows)
+
+    def filter(self, **ranges):
+        """
+        Retrieve the objects whose column values fall within the given ranges.
+
+        Args:
+            **ranges: Column name mapped to a (low, high) tuple; either bound may be None.
+                Example: filter(price=(50, 150), latitude=(40.0, 41.0))
+
+        Returns:
+            list: The matching objects.
+
+        Raises:
+            KeyError: If a range names an attribute that is not a column.
+        """
+        with self._lock:
+            rows = self._match(self._parse_ranges(ranges))
+            return [self._materialize(row) for row in rows]
+
+    def aggregate(self, column, func, **ranges):
+        """
+        Compute an aggregate over a column, optionally restricted to the rows matching ranges.
+
+        Args:
+            column (str): The column to aggregate.
+            func (str): One of 'count', 'sum', 'min', 'max' or 'mean'.
+            **ranges: Optional filters, as for filter().
+
+        Returns:
+            float: The aggregate, or None for min/max/mean over no rows.
+
+        Raises:
+            KeyError: If column or a range names an attribute that is not a column.
+            ValueError: If func is not supported.
+        """
+        if func not in ('count', 'sum', 'min', 'max', 'mean'):
+            raise ValueError(f"Unsupported aggregate: {func}")
+        with self._lock:
+            values = self._column_values(column, self._parse_ranges(ranges))
+            if np is not None:
+                values = values[~np.isnan(values)]
+                if func == 'count':
+                    return int(values.size)
+                if values.size == 0:
+                    return 0.0 if func == 'sum' else None
+                return float(getattr(np, func)(values))
+
+        values = [value for value in values if not math.isnan(value)]
+        if func == 'count':
+            return len(values)
+        if not values:
+            return 0.0 if func == 'sum' else None
+        if func == 'mean':
+            return math.fsum(values) / len(values)
+        return float({'sum': math.fsum, 'min': min, 'max': max}[func](values))
+
+    def histogram(self, column, **ranges):
+        """
+        Count the occurrences of each distinct value of a column, e.g. a rating distribution.
+
+        Args:
+            column (str): The column to count.
+            **ranges: Optional filters, as for filter().
+
+        Returns:
+            dict: Value mapped to its number of occurrences, in ascending value order.
+        """
+        with self._lock:
+            values = self._column_values(column, self._parse_ranges(ranges))
+            if np is not None:
+                values = values[~np.isnan(values)]
+                distinct, counts = np.unique(values, return_counts=True)
+                return dict(zip(distinct.tolist(), counts.tolist()))
+
+        counts = {}
+        for value in values:
+            if not math.isnan(value):
+                counts[value] = counts.get(value, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def _parse_ranges(self, ranges):
+        parsed = []
+        for name, (low, high) in ranges.items():
+            if name not in self._data:
+                raise KeyError(f"{name} is not a column")
+            parsed.append((name, low, high))
+        return parsed
+
+    def _column_values(self, column, ranges):
+        """
+        Return the values of a column for the rows matching ranges, as a NumPy array
+        when available (the caller holds the lock) or a list otherwise.
+        """
+        data = self._data[column]
+        if np is not None:
+            if not data:
+                return np.empty(0)
+            values = np.frombuffer(data, dtype=np.float64)
+            return values[self._match(ranges)] if ranges else values.copy()
+        if ranges:
+            return [data[row] for row in self._match(ranges)]
+        return data.tolist()
@@ -0,0 +1,110 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+
+
+class ReviewFeed:
+    """
+    Per-place review feeds kept in creation order.
+
+    Each place has a list of (created_at, review_id) entries. Reviews are created with
+    increasing timestamps, so adding one is normally an append. Pages are read newest
+    first with keyset pagination: the cursor is the position of the last review returned,
+    so reading a page costs O(log n + limit) however deep the client has scrolled, and
+    reviews added meanwhile do not shift later pages.
+    """
+    def __init__(self):
+        """
+        Initialize an empty feed.
+        """
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def add(self, place_id, review_id, created_at):
+        """
+        Add a review to its place's feed.
+
+        Args:
+            place_id (str): The ID of the reviewed place.
+            review_id (str): The ID of the review.
+            created_at (datetime): The creation time of the review.
+        """
+        entry = (created_at, review_id)
+        with self._lock:
+            feed = self._feeds.setdefault(place_id, [])
+            if not feed or feed[-1] < entry:
+                feed.append(entry)
+            else:
+                insort(feed, entry)
+
+    def remove(self, place_id, review_id, created_at):
+        """
+        Remove a review from its place's feed if present.
+
+        Args:
+            place_id (str): The ID of the reviewed place.
+            review_id (str): The ID of the review.
+            created_at (datetime): The creation time of the review.
+        """
+        entry = (created_at, review_id)
+        with self._lock:
+            feed = self._feeds.get(place_id, [])
+            i = bisect_left(feed, entry)
+            if i < len(feed) and feed[i] == entry:
+                del feed[i]
+
+    def count(self, place_id):
+        """
+        Return the number of reviews in a place's feed.
+        """
+        return len(self._feeds.get(place_id, ()))
+
+    def page(self, place_id, limit, before=None):
+        """
+        Return the IDs of a place's most recent reviews, newest first.
+
+        Args:
+            place_id (str): The ID of the reviewed place.
+            limit (int): Maximum number of review IDs to return.
+            before (str, optional): Cursor returned with the previous page; only older reviews are returned.
+
+        Returns:
+            tuple: (review_ids, next_cursor) where next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        with self._lock:
+            feed = self._feeds.get(place_id, [])
+            end = len(feed) if before is None else bisect_left(feed, self.decode_cursor(before))
+            start = max(0, end - limit)
+            entries = feed[start:end]
+        entries.reverse()
+        next_cursor = self.encode_cursor(*entries[-1]) if entries and start > 0 else None
+        return [review_id for _, review_id in entries], next_cursor
+
+    @staticmethod
+    def encode_cursor(created_at, review_id):
+        """
+        Build the cursor pointing just past a review.
+
+        Returns:
+            str: The cursor, '<created_at ISO timestamp>_<review_id>'.
+        """
+        return f"{created_at.isoformat()}_{review_id}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Parse a cursor built by encode_cursor.
+
+        Returns:
+            tuple: The (created_at, review_id) entry the cursor points at.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        timestamp, sep, review_id = cursor.partition('_')
+        if not sep or not review_id:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return datetime.fromisoformat(timestamp), review_id
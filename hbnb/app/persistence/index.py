@@ -0,0 +1,84 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+
+class SortedIndex:
+    """
+    Ordered secondary index mapping a sortable key to object IDs.
+
+    Entries are kept as (key, obj_id) tuples in a sorted list, so range scans are a
+    binary search followed by a slice: O(log n + k). Ties are broken by ID, which
+    keeps the order stable between requests.
+    """
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self._entries = []
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set(self, obj_id, key):
+        """
+        Insert an object, or move it if its key changed.
+
+        Args:
+            obj_id (str): The ID of the indexed object.
+            key: The sortable key, e.g. a price or a timestamp.
+        """
+        with self._lock:
+            old = self._keys.get(obj_id)
+            if obj_id in self._keys:
+                if old == key:
+                    return
+                self._remove_entry(old, obj_id)
+            self._keys[obj_id] = key
+            insort(self._entries, (key, obj_id))
+
+    def remove(self, obj_id):
+        """
+        Remove an object from the index if present.
+
+        Args:
+            obj_id (str): The ID of the indexed object.
+        """
+        with self._lock:
+            if obj_id in self._keys:
+                self._remove_entry(self._keys.pop(obj_id), obj_id)
+
+    def _remove_entry(self, key, obj_id):
+        i = bisect_left(self._entries, (key, obj_id))
+        if i < len(self._entries) and self._entries[i] == (key, obj_id):
+            del self._entries[i]
+
+    def get_key(self, obj_id):
+        """
+        Return the key an object is indexed under, or None.
+        """
+        return self._keys.get(obj_id)
+
+    def range(self, low=None, high=None, reverse=False, limit=None):
+        """
+        Return the IDs whose key lies within [low, high], in key order.
+
+        Args:
+            low (optional): Inclusive lower bound, None for unbounded.
+            high (optional): Inclusive upper bound, None for unbounded.
+            reverse (bool, optional): Return the highest keys first. Defaults to False.
+            limit (int, optional): Maximum number of IDs to return.
+
+        Returns:
+            list: The matching object IDs.
+        """
+        with self._lock:
+            # (low,) sorts before every (low, id) entry and (high, chr(0x10FFFF)) after every (high, id)
+            start = 0 if low is None else bisect_left(self._entries, (low,))
+            end = len(self._entries) if high is None else bisect_right(self._entries, (high, chr(0x10FFFF)))
+            if reverse:
+                stop = start if limit is None else max(start, end - limit)
+                return [obj_id for _, obj_id in reversed(self._entries[stop:end])]
+            stop = end if limit is None else min(end, start + limit)
+            return [obj_id for _, obj_id in self._entries[start:stop]]
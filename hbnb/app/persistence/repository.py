@@ -1,4 +1,31 @@
+import logging
+import threading
 from abc import ABC, abstractmethod
+from app.models.interning import intern_string
+
+logger = logging.getLogger(__name__)
+
+
+class ConflictError(Exception):
+    """
+    Raised when a write would give two objects the same value for a unique attribute.
+    """
+    def __init__(self, attr_name, attr_value):
+        super().__init__(f"{attr_name} {attr_value!r} is already in use")
+        self.attr_name = attr_name
+        self.attr_value = attr_value
+
+
+class StaleWriteError(Exception):
+    """
+    Raised when an update expects a version of the object that is no longer the current one.
+    """
+    def __init__(self, obj_id, expected_version, current_version):
+        super().__init__(f"Object {obj_id} is at version {current_version}, not {expected_version}")
+        self.obj_id = obj_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
 
 class Repository(ABC):
     """
@@ -7,9 +34,11 @@ class Repository(ABC):
 
     Methods:
         add(obj): Add an object to the repository.
+        add_many(objs): Add several objects in one call.
         get(obj_id): Retrieve an object by its ID.
+        get_many(obj_ids): Retrieve several objects by their IDs in one call.
         get_all(): Retrieve all objects from the repository.
-        update(obj_id, data): Update an object's attributes.
+        update(obj_id, data, expected_version=None): Update an object's attributes.
         delete(obj_id): Delete an object by its ID.
         get_by_attribute(attr_name, attr_value): Retrieve an object by a specific attribute.
     """
@@ -20,9 +49,33 @@ class Repository(ABC):
 
         Args:
             obj (BaseModel): The object to add.
+
+        Raises:
+            ConflictError: If the object duplicates a unique attribute of another object.
         """
         pass
 
+    def add_many(self, objs):
+        """
+        Add several objects in one call.
+
+        Implementations that can write a batch more cheaply than one object at a time
+        should override this; the default falls back to add() per object.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            list: (obj, ConflictError) pairs for the objects that were rejected; the others are added.
+        """
+        rejected = []
+        for obj in objs:
+            try:
+                self.add(obj)
+            except ConflictError as e:
+                rejected.append((obj, e))
+        return rejected
+
     @abstractmethod
     def get(self, obj_id):
         """
@@ -36,6 +89,21 @@ class Repository(ABC):
         """
         pass
 
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs in one call.
+
+        Implementations backed by a remote store should override this with a single
+        batched lookup; the default falls back to get() per ID.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        return [self.get(obj_id) for obj_id in obj_ids]
+
     @abstractmethod
     def get_all(self):
         """
@@ -47,16 +115,24 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def update(self, obj_id, data):
+    def update(self, obj_id, data, expected_version=None):
         """
         Update an object's attributes.
 
         Args:
             obj_id (str): The ID of the object to update.
             data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this
+                version (compare-and-set); None updates it whatever its version.
+
+        Implementations must call the object's save() so that its updated_at
+        and version reflect the persisted change, and compare the version atomically
+        with the write.
 
         Raises:
             KeyError: If the object with the specified ID is not found.
+            ConflictError: If the update duplicates a unique attribute of another object.
+            StaleWriteError: If the object is no longer at expected_version.
         """
         pass
 
@@ -95,29 +171,103 @@ class InMemoryRepository(Repository):
 
     Attributes:
         _storage (dict): A dictionary to store objects with their IDs as keys.
+        _unique (dict): For each unique attribute, its normalized values mapped to object IDs.
 
     Methods:
         add(obj): Add an object to the repository.
         get(obj_id): Retrieve an object by its ID.
         get_all(): Retrieve all objects from the repository.
-        update(obj_id, data): Update an object's attributes.
+        update(obj_id, data, expected_version=None): Update an object's attributes.
         delete(obj_id): Delete an object by its ID.
         get_by_attribute(attr_name, attr_value): Retrieve an object by a specific attribute.
     """
-    def __init__(self):
+    def __init__(self, unique=None):
         """
         Initializes the object with dictionary to store objects with their IDs as keys.
+
+        Args:
+            unique (dict, optional): Attributes whose values must be unique, mapped to a
+                function normalizing a value before comparison (e.g. lower-casing emails).
         """
         self._storage = {}
+        self._normalizers = dict(unique or {})
+        self._unique = {attr_name: {} for attr_name in self._normalizers}
+        # Serializes writes so that a uniqueness check and the write it guards are atomic
+        self._lock = threading.Lock()
+
+    def _unique_keys(self, values):
+        """
+        Normalize the unique attributes among values, skipping unset ones.
+        """
+        return {attr_name: normalize(values[attr_name])
+                for attr_name, normalize in self._normalizers.items()
+                if values.get(attr_name) is not None}
+
+    def _claim(self, obj_id, keys):
+        """
+        Point the unique index at obj_id for the given keys, releasing the ones it held before.
+        Must be called with the lock held.
+
+        Raises:
+            ConflictError: If another object holds one of the keys; nothing is changed then.
+        """
+        for attr_name, key in keys.items():
+            owner = self._unique[attr_name].get(key)
+            if owner is not None and owner != obj_id:
+                raise ConflictError(attr_name, key)
+        current = self._storage.get(obj_id)
+        if current is not None:
+            self._release(obj_id, self._unique_keys(vars(current)))
+        for attr_name, key in keys.items():
+            self._unique[attr_name][key] = obj_id
+
+    def _release(self, obj_id, keys):
+        for attr_name, key in keys.items():
+            if self._unique[attr_name].get(key) == obj_id:
+                del self._unique[attr_name][key]
 
     def add(self, obj):
         """
         Add an object to the repository.
 
+        Its INTERNED attributes are interned, so its ID, the key it is stored under, is
+        the canonical copy the references to it share.
+
         Args:
             obj (BaseModel): The object to add.
+
+        Raises:
+            ConflictError: If the object duplicates a unique attribute of another object.
         """
-        self._storage[obj.id] = obj
+        obj.intern_strings()
+        with self._lock:
+            if self._normalizers:
+                self._claim(obj.id, self._unique_keys(vars(obj)))
+            self._storage[obj.id] = obj
+
+    def add_many(self, objs):
+        """
+        Add several objects under a single lock acquisition.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            list: (obj, ConflictError) pairs for the objects that were rejected; the others are added.
+        """
+        rejected = []
+        with self._lock:
+            storage = self._storage
+            for obj in objs:
+                obj.intern_strings()
+                if self._normalizers:
+                    try:
+                        self._claim(obj.id, self._unique_keys(vars(obj)))
+                    except ConflictError as e:
+                        rejected.append((obj, e))
+                        continue
+                storage[obj.id] = obj
+        return rejected
     
     def get(self, obj_id):
         """
@@ -129,12 +279,20 @@ class InMemoryRepository(Repository):
         Returns:
             BaseModel: The object with the specified ID, or None if not found.
         """
-        obj = self._storage.get(obj_id)
-        if obj:
-            print(f"Retrieved object: {obj_id}")
-        else:
-            print(f"Object not found: {obj_id}")
-        return obj
+        return self._storage.get(obj_id)
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs in one call.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        storage = self._storage
+        return [storage.get(obj_id) for obj_id in obj_ids]
 
     def get_all(self):
         """
@@ -145,25 +303,39 @@ class InMemoryRepository(Repository):
         """
         return list(self._storage.values())
 
-    def update(self, obj_id, data):
+    def update(self, obj_id, data, expected_version=None):
         """
         Update an object's attributes.
 
         Args:
             obj_id (str): The ID of the object to update.
             data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this version.
 
         Raises:
             KeyError: If the object with the specified ID is not found.
+            ConflictError: If the update duplicates a unique attribute of another object;
+                the object is left unchanged.
+            StaleWriteError: If the object is no longer at expected_version; it is left unchanged.
         """
-        if obj_id in self._storage:
-            obj = self._storage[obj_id]
-            # Update the attributes of the object based on the provided data
-            for key, value in data.items():
-                setattr(obj, key, value)
-                print(f"Updated object with ID: {obj_id}")  # Debug output
-        else:
-            raise KeyError("Object not found")
+        with self._lock:
+            if obj_id in self._storage:
+                obj = self._storage[obj_id]
+                if expected_version is not None and obj.version != expected_version:
+                    raise StaleWriteError(obj_id, expected_version, obj.version)
+                interned = type(obj).INTERNED
+                data = {key: intern_string(value) if key in interned else value
+                        for key, value in data.items()}
+                if self._normalizers:
+                    self._claim(obj_id, self._unique_keys({**vars(obj), **data}))
+                # Update the attributes of the object based on the provided data
+                for key, value in data.items():
+                    setattr(obj, key, value)
+                # Stamp the persisted change (updated_at and version)
+                obj.save()
+                logger.debug("Updated object with ID: %s", obj_id)
+            else:
+                raise KeyError("Object not found")
 
     def delete(self, obj_id):
         """
@@ -175,9 +347,11 @@ class InMemoryRepository(Repository):
         Raises:
             KeyError: If the object with the specified ID is not found.
         """
-        if obj_id in self._storage:
-            del self._storage[obj_id]
-            print(f"Deleted object with ID: {obj_id}")  # Debug output
+        with self._lock:
+            if obj_id in self._storage:
+                obj = self._storage.pop(obj_id)
+                self._release(obj_id, self._unique_keys(vars(obj)))
+                logger.debug("Deleted object with ID: %s", obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -189,10 +363,9 @@ class InMemoryRepository(Repository):
 
         Returns:
             BaseModel: The object with the specified attribute value, or None if not found.
+                Unique attributes are looked up in their index, by normalized value.
         """
-        obj = next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
-        if obj:
-            print(f"Found object with {attr_name}: {attr_value}")  # Debug output
-        else:
-            print(f"Object not found with {attr_name}: {attr_value}")  # Debug output
-        return obj
\ No newline at end of file
+        if attr_name in self._unique:
+            obj_id = self._unique[attr_name].get(self._normalizers[attr_name](attr_value))
+            return self._storage.get(obj_id) if obj_id is not None else None
+        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
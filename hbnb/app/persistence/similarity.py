@@ -0,0 +1,226 @@
+import heapq
+import math
+import random
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; queries fall back to an exact scan in plain Python
+    np = None
+
+# Fixed scales keep a place's features independent of the others, so a change
+# only rewrites its own row
+PRICE_SCALE = math.log1p(10000)
+RATING_SCALE = 5.0
+
+
+class SimilarityIndex:
+    """
+    Normalized feature vectors of places and top-K cosine similarity over them.
+
+    Each place is a row of `dims` float32 values: log-scaled price, position on the
+    unit sphere (so that distances wrap around the globe), average rating and its
+    amenities hashed into `amenity_dims` slots, each group weighted, and the row
+    L2-normalized so that a dot product is a cosine similarity. Rows live in one
+    contiguous array; with NumPy a query is a single matrix-vector product over a
+    zero-copy view of it.
+
+    Above `exact_limit` rows queries are approximate (inverted file): rows are
+    clustered around about sqrt(n) centroids, and a query only scores the rows of
+    the `probes` clusters closest to it. The clusters are rebuilt when the number of
+    rows doubled since the last build; rows added in between join their nearest
+    centroid, so updates stay O(dims * clusters).
+
+    Attributes:
+        amenity_dims (int): Slots the amenity codes are hashed into.
+        dims (int): Length of a row.
+        weights (dict): Weight of the 'price', 'location', 'rating' and 'amenities' groups.
+        exact_limit (int): Number of rows up to which queries are exact.
+        probes (int): Number of clusters scored by an approximate query.
+    """
+    def __init__(self, amenity_dims=32, weights=None, exact_limit=50000, probes=8):
+        """
+        Initialize an empty index.
+
+        Args:
+            amenity_dims (int, optional): Slots the amenity codes are hashed into. Defaults to 32.
+            weights (dict, optional): Group weights; missing groups weigh 1.
+            exact_limit (int, optional): Rows up to which queries are exact. Defaults to 50000.
+            probes (int, optional): Clusters scored by an approximate query. Defaults to 8.
+        """
+        self.amenity_dims = amenity_dims
+        self.dims = 5 + amenity_dims
+        self.weights = {'price': 1.0, 'location': 1.0, 'rating': 1.0, 'amenities': 1.0}
+        self.weights.update(weights or {})
+        self.exact_limit = exact_limit
+        self.probes = probes
+        self._data = array('f')
+        self._ids = []
+        self._rows = {}
+        self._clusters = array('i')
+        self._centroids = None
+        self._built_size = 0
+        # Views handed to NumPy pin the buffers, so resizes and scans must not overlap
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def features(self, price, latitude, longitude, rating, amenity_codes):
+        """
+        Compute the normalized feature vector of a place.
+
+        Args:
+            price (float): Price per night.
+            latitude (float): Latitude in degrees.
+            longitude (float): Longitude in degrees.
+            rating (float): Average rating, 0 without reviews.
+            amenity_codes (iterable): Dense codes of its amenities.
+
+        Returns:
+            list: The `dims` values of its row.
+        """
+        weights = self.weights
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        location = weights['location']
+        row = [weights['price'] * math.log1p(max(price, 0.0)) / PRICE_SCALE,
+               location * math.cos(lat) * math.cos(lon),
+               location * math.cos(lat) * math.sin(lon),
+               location * math.sin(lat),
+               weights['rating'] * rating / RATING_SCALE]
+        slots = [0.0] * self.amenity_dims
+        for code in amenity_codes:
+            slots[code % self.amenity_dims] = 1.0
+        filled = sum(slots)
+        if filled:
+            scale = weights['amenities'] / math.sqrt(filled)
+            slots = [slot * scale for slot in slots]
+        row.extend(slots)
+        norm = math.sqrt(sum(value * value for value in row)) or 1.0
+        return [value / norm for value in row]
+
+    def set(self, place_id, vector):
+        """
+        Add a place or replace its vector.
+
+        Args:
+            place_id (str): The ID of the place.
+            vector (list): Its features, as returned by features().
+        """
+        with self._lock:
+            row = self._rows.get(place_id)
+            if row is None:
+                row = self._rows[place_id] = len(self._ids)
+                self._ids.append(place_id)
+                self._data.extend(vector)
+                self._clusters.append(-1)
+            else:
+                self._data[row * self.dims:(row + 1) * self.dims] = array('f', vector)
+            if self._centroids is not None:
+                self._clusters[row] = self._nearest_centroid(vector)
+
+    def set_many(self, items):
+        """
+        Add or replace several places.
+
+        Args:
+            items (iterable): (place_id, vector) pairs.
+        """
+        with self._lock:
+            for place_id, vector in items:
+                self.set(place_id, vector)
+
+    def remove(self, place_id):
+        """
+        Remove a place; the last row moves into its slot so rows stay dense.
+
+        Args:
+            place_id (str): The ID of the place.
+        """
+        with self._lock:
+            row = self._rows.pop(place_id, None)
+            if row is None:
+                return
+            last = len(self._ids) - 1
+            dims = self.dims
+            if row != last:
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+                self._data[row * dims:(row + 1) * dims] = self._data[last * dims:]
+                self._clusters[row] = self._clusters[last]
+            self._ids.pop()
+            del self._data[last * dims:]
+            self._clusters.pop()
+
+    def similar(self, place_id, limit=10):
+        """
+        Return the places most similar to a place.
+
+        Args:
+            place_id (str): The ID of the reference place.
+            limit (int, optional): Number of places to return. Defaults to 10.
+
+        Returns:
+            list: (place_id, similarity) pairs, most similar first, without the place
+                itself; None if the place is not indexed.
+        """
+        with self._lock:
+            row = self._rows.get(place_id)
+            if row is None:
+                return None
+            if np is None:
+                return self._similar_python(row, limit)
+            if len(self._ids) > self.exact_limit and len(self._ids) >= 2 * self._built_size:
+                self._build_clusters()
+            matrix = np.frombuffer(self._data, dtype=np.float32).reshape(len(self._ids), self.dims)
+            query = matrix[row].copy()
+            if self._centroids is not None and len(self._ids) > self.exact_limit:
+                probed = np.zeros(len(self._centroids) + 1, dtype=bool)
+                probed[np.argsort(self._centroids @ query)[::-1][:self.probes]] = True
+                # Rows still unassigned (-1) index the spare last slot and are left out
+                clusters = np.frombuffer(self._clusters, dtype=np.int32)
+                candidates = np.flatnonzero(probed[clusters])
+                scores = matrix[candidates] @ query
+            else:
+                candidates = None
+                scores = matrix @ query
+            count = min(limit + 1, scores.size)
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            rows = candidates[top] if candidates is not None else top
+            return [(self._ids[r], float(scores[t])) for r, t in zip(rows.tolist(), top.tolist())
+                    if r != row][:limit]
+
+    def _similar_python(self, row, limit):
+        data, dims = self._data, self.dims
+        query = data[row * dims:(row + 1) * dims]
+        scored = ((sum(a * b for a, b in zip(query, data[other * dims:(other + 1) * dims])), other)
+                  for other in range(len(self._ids)) if other != row)
+        return [(self._ids[other], score) for score, other in heapq.nlargest(limit, scored)]
+
+    def _nearest_centroid(self, vector):
+        return int(np.argmax(self._centroids @ np.asarray(vector, dtype=np.float32)))
+
+    def _build_clusters(self, iterations=5, chunk=8192):
+        """
+        Cluster the rows with spherical k-means on a sample, then assign every row.
+        """
+        count = len(self._ids)
+        matrix = np.frombuffer(self._data, dtype=np.float32).reshape(count, self.dims)
+        k = max(1, min(4096, int(math.sqrt(count))))
+        sample = matrix[np.asarray(random.Random(count).sample(range(count), min(count, 64 * k)))]
+        centroids = sample[:k].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        clusters = np.frombuffer(self._clusters, dtype=np.int32)
+        for start in range(0, count, chunk):
+            clusters[start:start + chunk] = np.argmax(matrix[start:start + chunk] @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._built_size = count
@@ -0,0 +1,304 @@
+import mmap
+import os
+import pickle
+import threading
+from datetime import datetime
+from app.persistence.repository import Repository
+
+
+class SegmentStore:
+    """
+    Append-only segment file of pickled objects, memory-mapped for reads.
+
+    Objects are appended as length-delimited pickles and located through an
+    in-memory index from ID to offset and length, so a read is one dictionary lookup
+    and one slice of the mapping. The file is only appended to; deleting an object drops
+    its index entry and leaves the bytes in place.
+
+    The index is kept in memory only: the file is truncated when the store is
+    opened, as the hot repositories it complements do not survive a restart either.
+    """
+    def __init__(self, path):
+        """
+        Create or truncate the segment file.
+
+        Args:
+            path (str): Path of the segment file.
+        """
+        self.path = path
+        self._file = open(path, 'w+b')
+        self._map = None
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, obj_id):
+        return obj_id in self._index
+
+    def append(self, objs):
+        """
+        Append objects to the segment and index them.
+
+        Args:
+            objs (iterable): The objects to store.
+        """
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            entries = {}
+            for obj in objs:
+                # Written as they are pickled, so archiving a large batch does not
+                # hold a second copy of it in memory
+                data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+                self._file.write(data)
+                # One int per entry rather than a tuple of two: the index is what
+                # stays in memory for every archived object
+                entries[obj.id] = offset << 32 | len(data)
+                offset += len(data)
+            if not entries:
+                return
+            self._file.flush()
+            # A mapping has a fixed size, so map the grown file again
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index.update(entries)
+
+    def get(self, obj_id):
+        """
+        Read an object from the segment.
+
+        Args:
+            obj_id (str): The ID of the object.
+
+        Returns:
+            BaseModel: A new copy of the stored object, or None if not found.
+        """
+        with self._lock:
+            entry = self._index.get(obj_id)
+            if entry is None:
+                return None
+            offset, length = entry >> 32, entry & 0xFFFFFFFF
+            data = self._map[offset:offset + length]
+        return pickle.loads(data)
+
+    def remove(self, obj_id):
+        """
+        Drop an object from the index.
+
+        Args:
+            obj_id (str): The ID of the object.
+
+        Returns:
+            bool: True if the object was stored.
+        """
+        with self._lock:
+            return self._index.pop(obj_id, None) is not None
+
+    def ids(self):
+        """
+        Return the IDs of the stored objects.
+        """
+        with self._lock:
+            return list(self._index)
+
+    def close(self):
+        """
+        Close the mapping and the file.
+        """
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+class TieredRepository(Repository):
+    """
+    Repository keeping recent objects in a hot repository and older ones in a SegmentStore.
+
+    archive() moves the objects created before a cutoff from the hot repository to
+    the segment file, bounding the memory held by collections that only grow, such
+    as reviews. Reads go to the hot tier first and fall back to the cold one, so
+    callers see a single repository. Objects read from the cold tier are copies;
+    updating one moves it back to the hot tier first.
+
+    Attributes:
+        hot (Repository): The repository holding recent objects.
+        cold (SegmentStore): The segment file holding archived objects.
+        max_age (timedelta): Age after which archive() moves an object to the cold tier.
+    """
+    def __init__(self, hot, cold, max_age):
+        """
+        Initialize the repository.
+
+        Args:
+            hot (Repository): The repository holding recent objects; it may already hold objects.
+            cold (SegmentStore): The segment file holding archived objects.
+            max_age (timedelta): Age after which archive() moves an object to the cold tier.
+        """
+        self.hot = hot
+        self.cold = cold
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def add(self, obj):
+        """
+        Add an object to the hot tier.
+
+        Args:
+            obj (BaseModel): The object to add.
+        """
+        # Writes take the lock so that archive() never works from an outdated snapshot
+        with self._lock:
+            self.hot.add(obj)
+
+    def add_many(self, objs):
+        """
+        Add several objects to the hot tier.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            list: (obj, ConflictError) pairs for the objects that were rejected.
+        """
+        with self._lock:
+            return self.hot.add_many(objs)
+
+    def get(self, obj_id):
+        """
+        Retrieve an object by its ID from the hot tier, then the cold one.
+
+        Args:
+            obj_id (str): The ID of the object to retrieve.
+
+        Returns:
+            BaseModel: The object with the specified ID, or None if not found.
+        """
+        obj = self.hot.get(obj_id)
+        return obj if obj is not None else self.cold.get(obj_id)
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs, reading only the hot misses from the cold tier.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        objs = self.hot.get_many(obj_ids)
+        return [obj if obj is not None else self.cold.get(obj_id)
+                for obj_id, obj in zip(obj_ids, objs)]
+
+    def get_all(self):
+        """
+        Retrieve all objects, reading every archived object from disk.
+
+        Returns:
+            list: A list of all objects in the repository.
+        """
+        archived = (self.cold.get(obj_id) for obj_id in self.cold.ids())
+        return self.hot.get_all() + [obj for obj in archived if obj is not None]
+
+    def update(self, obj_id, data, expected_version=None):
+        """
+        Update an object's attributes, moving it back to the hot tier if it was archived.
+
+        Args:
+            obj_id (str): The ID of the object to update.
+            data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this version.
+
+        Raises:
+            KeyError: If the object with the specified ID is not found.
+            StaleWriteError: If the object is no longer at expected_version.
+        """
+        with self._lock:
+            if self.hot.get(obj_id) is None:
+                obj = self.cold.get(obj_id)
+                if obj is None:
+                    raise KeyError("Object not found")
+                self.hot.add(obj)
+                self.cold.remove(obj_id)
+            # Under the lock so that archive() cannot write out the object mid-update
+            self.hot.update(obj_id, data, expected_version)
+
+    def delete(self, obj_id):
+        """
+        Delete an object by its ID from whichever tier holds it.
+
+        Args:
+            obj_id (str): The ID of the object to delete.
+        """
+        # Under the lock, or archive() could write an object deleted after its snapshot
+        # to the cold tier, bringing it back
+        with self._lock:
+            if not self.cold.remove(obj_id):
+                self.hot.delete(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve an object by a specific attribute, scanning the cold tier on a hot miss.
+
+        Args:
+            attr_name (str): The name of the attribute to search by.
+            attr_value: The value of the attribute to match.
+
+        Returns:
+            BaseModel: The object with the specified attribute value, or None if not found.
+        """
+        obj = self.hot.get_by_attribute(attr_name, attr_value)
+        if obj is not None:
+            return obj
+        return next((obj for obj in map(self.cold.get, self.cold.ids())
+                     if obj is not None and getattr(obj, attr_name, None) == attr_value), None)
+
+    def archive(self, now=None):
+        """
+        Move the objects older than max_age from the hot tier to the cold one.
+
+        Args:
+            now (datetime, optional): The current time. Defaults to datetime.now().
+
+        Returns:
+            int: The number of objects archived.
+        """
+        cutoff = (now or datetime.now()) - self.max_age
+        with self._lock:
+            old = [obj for obj in self.hot.get_all()
+                   if isinstance(obj.created_at, datetime) and obj.created_at < cutoff]
+            # Write first so that readers find each object in at least one tier
+            self.cold.append(old)
+            for obj in old:
+                self.hot.delete(obj.id)
+        return len(old)
+
+    def start_archiver(self, interval):
+        """
+        Run archive() every `interval` seconds in a daemon thread.
+
+        Args:
+            interval (float): Seconds between two archive runs.
+
+        Returns:
+            Thread: The started thread.
+        """
+        def run():
+            while not self._stop.wait(interval):
+                self.archive()
+
+        thread = threading.Thread(target=run, name='review-archiver', daemon=True)
+        thread.start()
+        return thread
+
+    def stop_archiver(self):
+        """
+        Stop the thread started by start_archiver().
+        """
+        self._stop.set()
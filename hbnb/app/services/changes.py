@@ -0,0 +1,103 @@
+import threading
+from collections import deque
+from itertools import islice
+from datetime import datetime
+
+
+class ChangeLog:
+    """
+    Bounded, in-process log of change events published by the facade's write methods.
+
+    Every event gets a monotonically increasing sequence number. Only the most recent
+    `capacity` events are retained, so memory stays bounded; consumers that fall
+    further behind are told so and must resynchronise with a full read.
+
+    Writers hold `lock` across a repository write and the publish() reporting it, so
+    sequence numbers follow the order in which the writes were committed and an event
+    carries the version its write produced.
+
+    Attributes:
+        capacity (int): Maximum number of events retained.
+        lock (RLock): Held by writers from their write to its publish().
+    """
+    def __init__(self, capacity=10000):
+        """
+        Initialize an empty change log.
+
+        Args:
+            capacity (int, optional): Maximum number of events retained. Defaults to 10000.
+        """
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._seq = 0
+        self.lock = threading.RLock()
+        self._cond = threading.Condition(self.lock)
+
+    @property
+    def last_seq(self):
+        """
+        Get the sequence number of the most recently published event.
+
+        Returns:
+            int: The last sequence number, or 0 if nothing was published yet.
+        """
+        return self._seq
+
+    def publish(self, op, entity_type, entity, changed_fields):
+        """
+        Append a change event and wake up waiting consumers.
+
+        Args:
+            op (str): One of 'create', 'update' or 'delete'.
+            entity_type (str): The kind of entity ('user', 'place', 'review', 'amenity').
+            entity (BaseModel): The entity that changed.
+            changed_fields (iterable): Names of the attributes that changed.
+
+        Returns:
+            dict: The published event.
+        """
+        with self._cond:
+            self._seq += 1
+            event = {
+                "seq": self._seq,
+                "op": op,
+                "type": entity_type,
+                "id": entity.id,
+                "version": entity.version,
+                "fields": sorted(changed_fields),
+                "timestamp": datetime.now().isoformat()
+            }
+            self._events.append(event)
+            self._cond.notify_all()
+        return event
+
+    def read(self, since=0, limit=100, timeout=0):
+        """
+        Return the events published after `since`, optionally waiting for new ones.
+
+        Args:
+            since (int, optional): The last sequence number the consumer has seen. Defaults to 0.
+            limit (int, optional): Maximum number of events to return. Defaults to 100.
+            timeout (float, optional): Seconds to wait when no event is available yet. Defaults to 0.
+
+        Returns:
+            tuple: (events, next_seq, truncated) where next_seq is the value to pass as `since`
+                on the next call and truncated is True if events after `since` were already evicted.
+        """
+        with self._cond:
+            if timeout and self._seq <= since:
+                self._cond.wait_for(lambda: self._seq > since, timeout)
+
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            # Either events were evicted or the consumer holds a sequence from a previous process
+            truncated = since + 1 < oldest or since > self._seq
+            # Sequence numbers are contiguous, so the first wanted event is found by offset
+            start = max(since + 1 - oldest, 0)
+            events = list(islice(self._events, start, start + limit))
+            last_seq = self._seq
+
+        if events:
+            next_seq = events[-1]["seq"]
+        else:
+            next_seq = last_seq if truncated else since
+        return events, next_seq, truncated
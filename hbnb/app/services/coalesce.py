@@ -0,0 +1,93 @@
+import threading
+
+
+class _Call:
+    """
+    One computation in flight and the callers waiting for it.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations into one.
+
+    The first caller of do() for a key runs the computation; callers arriving with
+    the same key while it runs wait for it and get the same result, or the same
+    exception. Nothing is kept once the computation returns, so this is not a cache:
+    it only bounds the work done for one key at a time to one computation.
+
+    invalidate() is called after every write: callers arriving after a write never
+    join a computation started before it, so they cannot be handed data older than
+    their own request.
+
+    Only the threading primitives are used, which greenlet based servers (gevent,
+    eventlet) patch, and a waiting caller does not depend on the thread or context
+    of the one computing, so it works with threaded and cooperative servers alike.
+
+    Attributes:
+        calls (int): Computations run.
+        shared (int): Callers served by another caller's computation.
+    """
+    def __init__(self):
+        """
+        Initialize with nothing in flight.
+        """
+        self.calls = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute):
+        """
+        Run compute() once for all concurrent callers with the same key.
+
+        Args:
+            key (hashable): Identifies the computation; equal keys must produce equal results.
+            compute (callable): Takes no argument and returns the result.
+
+        Returns:
+            The result of compute(); callers sharing a computation get the same object,
+            which must therefore not be modified.
+
+        Raises:
+            Exception: Whatever compute() raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # invalidate() may have replaced the table meanwhile
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def invalidate(self):
+        """
+        Let callers arriving from now on start new computations instead of joining
+        the ones in flight, which still complete for the callers already waiting.
+        """
+        if self._calls:
+            with self._lock:
+                self._calls = {}
@@ -0,0 +1,182 @@
+import threading
+from collections import OrderedDict
+
+
+class _DashboardView:
+    """
+    The materialized dashboard of one user.
+
+    Place entries are replaced rather than modified, and the payload only
+    references the list of entries, so a payload handed out keeps a consistent
+    snapshot of each entry while writers move on.
+    """
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.places = []
+        self.positions = {}
+        self.sums = {}
+        self.review_count = 0
+        self.rating_sum = 0
+
+    def set(self, entry, count, rating_sum):
+        place_id = entry['id']
+        old_count, old_sum = self.sums.get(place_id, (0, 0))
+        self.review_count += count - old_count
+        self.rating_sum += rating_sum - old_sum
+        self.sums[place_id] = (count, rating_sum)
+        position = self.positions.get(place_id)
+        if position is None:
+            self.positions[place_id] = len(self.places)
+            self.places.append(entry)
+        else:
+            self.places[position] = entry
+
+    def remove(self, place_id):
+        position = self.positions.pop(place_id, None)
+        if position is None:
+            return
+        count, rating_sum = self.sums.pop(place_id)
+        self.review_count -= count
+        self.rating_sum -= rating_sum
+        # A new list, so that payloads already handed out keep theirs
+        self.places = self.places[:position] + self.places[position + 1:]
+        for moved in self.places[position:]:
+            self.positions[moved['id']] -= 1
+
+    def payload(self):
+        return {
+            'user_id': self.user_id,
+            'place_count': len(self.places),
+            'review_count': self.review_count,
+            'average_rating': self.rating_sum / self.review_count if self.review_count else 0.0,
+            'places': self.places
+        }
+
+
+class DashboardViews:
+    """
+    Denormalized per-user dashboards, maintained incrementally by the write paths.
+
+    A dashboard lists a user's places with their review count, average rating and
+    latest reviews, plus portfolio totals. It is built once from the repositories,
+    then every write touching one of the places replaces that place's entry, so
+    serving it never depends on the size of the portfolio. Only the `max_users` most
+    recently served dashboards are kept; writes to the others are ignored and an
+    evicted dashboard is rebuilt on its next read.
+
+    Attributes:
+        max_users (int): Number of dashboards kept in memory.
+        hits (int): Reads served from a kept dashboard.
+        misses (int): Reads that had to build one.
+    """
+    def __init__(self, max_users=1024):
+        """
+        Initialize an empty set of dashboards.
+
+        Args:
+            max_users (int, optional): Number of dashboards kept in memory. Defaults to 1024.
+        """
+        self.max_users = max_users
+        self.hits = 0
+        self.misses = 0
+        self._views = OrderedDict()
+        # user_id -> [writes seen during the builds in progress, number of such builds]
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, build):
+        """
+        Return a user's dashboard, building it if it is not in memory.
+
+        Args:
+            user_id (str): The ID of the user.
+            build (callable): Returns the (entry, review_count, rating_sum) triples of the
+                user's places.
+
+        Returns:
+            dict: The dashboard; its 'places' list must not be modified.
+        """
+        with self._lock:
+            view = self._views.get(user_id)
+            if view is not None:
+                self._views.move_to_end(user_id)
+                self.hits += 1
+                return view.payload()
+            self.misses += 1
+            building = self._building.setdefault(user_id, [0, 0])
+            building[1] += 1
+            writes = building[0]
+        # Built outside the lock; a write racing the build makes it unfit to be kept
+        view = _DashboardView(user_id)
+        try:
+            for entry, count, rating_sum in build():
+                view.set(entry, count, rating_sum)
+        finally:
+            with self._lock:
+                building[1] -= 1
+                if not building[1]:
+                    del self._building[user_id]
+        with self._lock:
+            if building[0] == writes:
+                self._views[user_id] = view
+                while len(self._views) > self.max_users:
+                    self._views.popitem(last=False)
+            return view.payload()
+
+    def is_tracked(self, user_id):
+        """
+        Check whether writes to a user's places need to reach its dashboard.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            bool: True if the dashboard is in memory or being built.
+        """
+        return user_id in self._views or user_id in self._building
+
+    def _written(self, user_id):
+        building = self._building.get(user_id)
+        if building is not None:
+            building[0] += 1
+        return self._views.get(user_id)
+
+    def set_place(self, user_id, entry, count, rating_sum):
+        """
+        Add or replace a place in a user's dashboard, if the dashboard is in memory.
+
+        Writes to dashboards not in memory are dropped; callers can skip computing
+        the entry when is_tracked() is False.
+
+        Args:
+            user_id (str): The ID of the owner.
+            entry (dict): The place's entry; its 'id' identifies the place.
+            count (int): The place's number of reviews.
+            rating_sum (int): The sum of the place's ratings.
+        """
+        with self._lock:
+            view = self._written(user_id)
+            if view is not None:
+                view.set(entry, count, rating_sum)
+
+    def remove_place(self, user_id, place_id):
+        """
+        Remove a place from a user's dashboard, if the dashboard is in memory.
+
+        Args:
+            user_id (str): The ID of the owner.
+            place_id (str): The ID of the place.
+        """
+        with self._lock:
+            view = self._written(user_id)
+            if view is not None:
+                view.remove(place_id)
+
+    def clear(self):
+        """
+        Drop every dashboard; each is rebuilt on its next read.
+        """
+        with self._lock:
+            self._views.clear()
+            for building in self._building.values():
+                building[0] += 1
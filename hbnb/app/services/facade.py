@@ -1,35 +1,155 @@
-from app.persistence.repository import InMemoryRepository
+import copy
+import functools
+import logging
+import threading
+from datetime import timedelta
+from app.persistence.repository import InMemoryRepository, ConflictError
+from app.persistence.index import SortedIndex
+from app.persistence.feed import ReviewFeed
+from app.persistence.tiered import SegmentStore, TieredRepository
+from app.persistence.calendar import BookingCalendar
+from app.persistence.catalog import AmenityCatalog
+from app.persistence.similarity import SimilarityIndex
+from app.services.changes import ChangeLog
+from app.services import identity
+from app.services.coalesce import SingleFlight
+from app.services.identity import ScopedRepository
+from app.services.integrity import ReferentialIntegrity
+from app.services.dashboard import DashboardViews
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.models.booking import Booking
+from app.models.validation import validate_place, validate_review
+
+logger = logging.getLogger(__name__)
+
+
+def _write(method):
+    """
+    Mark a facade method as a write: once it returns, reads no longer join the
+    coalesced computations started before it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.flights.invalidate()
+    return wrapper
+
+
+def _check_payload(validate, data):
+    """
+    Validate the fields given for a partial update.
+
+    Raises:
+        ValueError: With the first error found.
+    """
+    errors = validate(data, required=())
+    if errors:
+        raise ValueError(f"Invalid {errors[0]['field']}: {errors[0]['error']}")
+
 
 class HBnBFacade:
     """
     Facade for managing the interactions between various models and their repositories.
 
+    Repositories are read through the identity map of the current unit of work (see
+    app.services.identity), so within one request each entity is loaded at most once
+    and serialized at most once per version. They only return live entities: deleting
+    a user, place or amenity records a tombstone that hides it and its dependents at
+    once, and the dependents are removed later by sweep() (see app.services.integrity).
+
     Attributes:
-        user_repo (InMemoryRepository): Repository for User entities.
-        place_repo (InMemoryRepository): Repository for Place entities.
-        review_repo (InMemoryRepository): Repository for Review entities.
-        amenity_repo (InMemoryRepository): Repository for Amenity entities.
+        user_repo (ScopedRepository): Repository for User entities.
+        place_repo (ScopedRepository): Repository for Place entities.
+        review_repo (ScopedRepository): Repository for Review entities.
+        amenity_repo (ScopedRepository): Repository for Amenity entities.
+        booking_repo (ScopedRepository): Repository for Booking entities.
+        change_log (ChangeLog): Ordered log of the changes made through the facade.
+        place_price_index (SortedIndex): Places ordered by price.
+        place_rating_index (SortedIndex): Places ordered by average review rating.
+        place_created_index (SortedIndex): Places ordered by creation time.
+        review_feed (ReviewFeed): Reviews of each place in creation order.
+        booking_calendar (BookingCalendar): Booked nights of each place.
+        amenity_catalog (AmenityCatalog): Amenity codes and the places offering each amenity.
+        integrity (ReferentialIntegrity): Relations between entities and pending deletions.
+        dashboards (DashboardViews): Materialized per-user dashboards.
+        similar_places (SimilarityIndex): Feature vectors of places for similarity queries.
+        flights (SingleFlight): Concurrent identical reads in progress, see coalesce().
     """
-    _shared_user_repo = InMemoryRepository()
+    # Emails are unique regardless of case; the repository enforces it atomically
+    _shared_user_repo = InMemoryRepository(unique={'email': User.normalize_email})
     _shared_place_repo = InMemoryRepository()
     _shared_review_repo = InMemoryRepository()
     _shared_amenity_repo = InMemoryRepository()
+    _shared_booking_repo = InMemoryRepository()
+    _shared_change_log = ChangeLog()
+    _shared_place_price_index = SortedIndex()
+    _shared_place_rating_index = SortedIndex()
+    _shared_place_created_index = SortedIndex()
+    _shared_review_feed = ReviewFeed()
+    _shared_booking_calendar = BookingCalendar()
+    _shared_amenity_catalog = AmenityCatalog()
+    _shared_integrity = ReferentialIntegrity()
+    # (kind, id) of the deletions published when their tombstone was recorded
+    _shared_published_deletions = set()
+    _shared_dashboards = DashboardViews()
+    _shared_similar_places = SimilarityIndex()
+    # Invalidated by every method marked with @_write
+    _shared_flights = SingleFlight()
+    # place_id -> [sum of ratings, number of reviews], backing the rating index
+    _shared_rating_totals = {}
+    _rating_lock = threading.Lock()
+
+    # Relations of a place that get_place can embed
+    PLACE_EMBEDS = ('owner', 'amenities', 'reviews')
+
+    # Index and direction used by each supported sort order
+    PLACE_SORTS = {
+        'price': ('place_price_index', False),
+        '-price': ('place_price_index', True),
+        'rating': ('place_rating_index', True),
+        'newest': ('place_created_index', True)
+    }
+
+    # Number of most recent reviews listed per place on a dashboard
+    DASHBOARD_LATEST_REVIEWS = 3
+
+    # Amenity filters matching under 1/SELECTIVE_FILTER_RATIO of the places skip the index scan
+    SELECTIVE_FILTER_RATIO = 8
+
+    # Attributes maintained by BaseModel rather than set by callers
+    _BASE_FIELDS = {'id', 'created_at', 'updated_at'}
 
     def __init__(self):
         """
         Initialize HBnBFacade with shared repositories 
         for users, places, reviews, and amenities.
         """
-        self.user_repo = HBnBFacade._shared_user_repo
-        self.place_repo = HBnBFacade._shared_place_repo
-        self.review_repo = HBnBFacade._shared_review_repo
-        self.amenity_repo = HBnBFacade._shared_amenity_repo
-
-
+        self.user_repo = ScopedRepository(HBnBFacade._shared_user_repo, 'user', self._is_live)
+        self.place_repo = ScopedRepository(HBnBFacade._shared_place_repo, 'place', self._is_live)
+        self.review_repo = ScopedRepository(HBnBFacade._shared_review_repo, 'review', self._is_live)
+        self.amenity_repo = ScopedRepository(HBnBFacade._shared_amenity_repo, 'amenity', self._is_live)
+        self.booking_repo = ScopedRepository(HBnBFacade._shared_booking_repo, 'booking', self._is_live)
+        self.change_log = HBnBFacade._shared_change_log
+        self.place_price_index = HBnBFacade._shared_place_price_index
+        self.place_rating_index = HBnBFacade._shared_place_rating_index
+        self.place_created_index = HBnBFacade._shared_place_created_index
+        self.rating_totals = HBnBFacade._shared_rating_totals
+        self.review_feed = HBnBFacade._shared_review_feed
+        self.booking_calendar = HBnBFacade._shared_booking_calendar
+        self.amenity_catalog = HBnBFacade._shared_amenity_catalog
+        self.integrity = HBnBFacade._shared_integrity
+        self.published_deletions = HBnBFacade._shared_published_deletions
+        self.dashboards = HBnBFacade._shared_dashboards
+        self.similar_places = HBnBFacade._shared_similar_places
+        self.flights = HBnBFacade._shared_flights
+
+
+    @_write
     def create_user(self, user_data):
         """
         Create a new user and add it to the user repository.
@@ -39,10 +159,15 @@ class HBnBFacade:
 
         Returns:
             User: The created User object.
+
+        Raises:
+            ConflictError: If the email is already registered.
         """
         user = User(**user_data)
-        self.user_repo.add(user)
-        print(f"User created with ID: {user.id}")  # Debug print
+        with self.change_log.lock:
+            self.user_repo.add(user)
+            self.change_log.publish('create', 'user', user, user_data.keys())
+        logger.debug("User created with ID: %s", user.id)
         return user
 
     def get_user(self, user_id):
@@ -55,17 +180,26 @@ class HBnBFacade:
         Returns:
             User: The User object if found, otherwise None.
         """
-        user = self.user_repo.get(user_id)
-        if user:
-            print(f"Found user with ID: {user.id}")  # Debug print
-        else:
-            print(f"User with ID {user_id} not found")  # Debug print
-        return user
+        return self.user_repo.get(user_id)
+
+    def get_users_by_ids(self, user_ids):
+        """
+        Retrieve several users with a single repository lookup.
+
+        Args:
+            user_ids (list): The IDs of the users to retrieve.
+
+        Returns:
+            tuple: (users, missing_ids) with users in the order of user_ids.
+        """
+        return self._get_by_ids(self.user_repo, user_ids)
 
     def get_user_by_email(self, email):
         """
         Retrieve a user by email from the user repository.
 
+        The lookup is case-insensitive and uses the repository's unique email index.
+
         Args:
             email (str): The email of the user to retrieve.
 
@@ -83,15 +217,64 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
-    def update_user(self, user):
+    @_write
+    def update_user(self, user_id, user_data, expected_version=None):
         """
         Update an existing user in the user repository.
 
+        The user is only modified once the new email is known to be free, so a
+        rejected update leaves it unchanged.
+
+        Args:
+            user_id (str): The ID of the user to update.
+            user_data (dict): Updated attributes among 'first_name', 'last_name', 'email' and 'password';
+                empty values are ignored.
+            expected_version (int, optional): Only update the user if it is still at this version.
+
+        Returns:
+            User: The updated User object, or None if not found.
+
+        Raises:
+            ValueError: If the email format is invalid.
+            ConflictError: If the email is registered to another user.
+            StaleWriteError: If the user is no longer at expected_version.
+        """
+        user = self.user_repo.get(user_id)
+        if not user:
+            return None
+
+        changes = {key: user_data[key] for key in ('first_name', 'last_name', 'email', 'password')
+                   if user_data.get(key)}
+        if 'email' in changes:
+            user.validate_email(changes['email'])
+
+        with self.change_log.lock:
+            self.user_repo.update(user_id, changes, expected_version)
+            self.change_log.publish('update', 'user', user, changes.keys())
+        return user
+
+    @_write
+    def delete_user(self, user_id):
+        """
+        Delete a user along with their places, reviews and bookings.
+
+        The user and everything depending on it stop being returned at once; the
+        entities themselves are removed in the background by sweep().
+
         Args:
-            user (User): The User object with updated attributes.
+            user_id (str): The ID of the user to delete.
+
+        Raises:
+            ValueError: If the user with the specified ID is not found.
         """
-        self.user_repo.update(user.id, user.to_dict())
+        user = self.user_repo.get(user_id)
+        if not user:
+            raise ValueError(f"User with ID {user_id} not found.")
+        self._tombstone('user', user)
+        # Their reviews may be listed on any dashboard
+        self.dashboards.clear()
 
+    @_write
     def create_amenity(self, amenity_data):
         """
         Create a new amenity and add it to the amenity repository.
@@ -103,7 +286,10 @@ class HBnBFacade:
             Amenity: The created Amenity object.
         """
         amenity = Amenity(**amenity_data)
-        self.amenity_repo.add(amenity)
+        with self.change_log.lock:
+            self.amenity_repo.add(amenity)
+            self.amenity_catalog.register(amenity.id)
+            self.change_log.publish('create', 'amenity', amenity, amenity_data.keys())
         return amenity
 
     def get_amenity(self, amenity_id):
@@ -118,6 +304,18 @@ class HBnBFacade:
         """
         return self.amenity_repo.get(amenity_id)
 
+    def get_amenities_by_ids(self, amenity_ids):
+        """
+        Retrieve several amenities with a single repository lookup.
+
+        Args:
+            amenity_ids (list): The IDs of the amenities to retrieve.
+
+        Returns:
+            tuple: (amenities, missing_ids) with amenities in the order of amenity_ids.
+        """
+        return self._get_by_ids(self.amenity_repo, amenity_ids)
+
     def get_all_amenities(self):
         """
         Retrieve all amenities from the amenity repository.
@@ -127,44 +325,69 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
-    def update_amenity(self, amenity_id, amenity_data):
+    @_write
+    def update_amenity(self, amenity_id, amenity_data, expected_version=None):
         """
         Update an existing amenity in the amenity repository.
 
         Args:
             amenity_id (str): The ID of the amenity to update.
             amenity_data (dict): Updated attributes for the amenity.
+            expected_version (int, optional): Only update the amenity if it is still at this version.
 
         Returns:
             Amenity: The updated Amenity object, or None if not found.
+
+        Raises:
+            StaleWriteError: If the amenity is no longer at expected_version.
         """
 
         # Fetch the existing amenity
         amenity = self.amenity_repo.get(amenity_id)
         if not amenity:
             return None
-        
-        # Update the amenity's attributes
-        amenity.update(name=amenity_data.get('name', amenity.name),
-                       description=amenity_data.get('description', amenity.description))
-        
-        # Update the repository
-        self.amenity_repo.update(amenity_id, amenity.to_dict())
+
+        # Only the mutable attributes; the repository assigns them, after comparing the version
+        changes = {key: amenity_data[key] for key in ('name', 'description')
+                   if amenity_data.get(key) is not None}
+        with self.change_log.lock:
+            self.amenity_repo.update(amenity_id, changes, expected_version)
+            self.change_log.publish('update', 'amenity', amenity,
+                                    amenity_data.keys() & {'name', 'description'})
         return amenity
     
+    @_write
+    def delete_amenity(self, amenity_id):
+        """
+        Delete an amenity; the places offering it keep existing without it.
+
+        Args:
+            amenity_id (str): The ID of the amenity to delete.
+
+        Raises:
+            ValueError: If the amenity with the specified ID is not found.
+        """
+        amenity = self.amenity_repo.get(amenity_id)
+        if not amenity:
+            raise ValueError(f"Amenity with ID {amenity_id} not found.")
+        self._tombstone('amenity', amenity)
+        # Filters on the amenity match nothing from now on, before its places are detached
+        self.amenity_catalog.unregister(amenity_id)
+
+    @_write
     def create_place(self, place_data):
         """
         Create a new place and add it to the place repository.
 
         Args:
             place_data (dict): Place attributes including 'title', 'description', 'price', 'latitude', 
-                               'longitude', and 'owner_id'.
+                               'longitude', 'owner_id' and optionally 'amenities', a list of amenity IDs.
 
         Returns:
             Place: The created Place object.
 
         Raises:
-            ValueError: If the owner does not exist.
+            ValueError: If the owner or one of the amenities does not exist.
         """
         owner_id = place_data['owner_id']
         owner = self.user_repo.get(owner_id)
@@ -174,20 +397,57 @@ class HBnBFacade:
         
         # Remove the 'owner' key if it exists
         place_data.pop('owner', None)
+        amenity_ids = self._check_amenities(place_data.pop('amenities', None) or [])
 
         place = Place(**place_data)
-        self.place_repo.add(place)
+        place.amenities = amenity_ids
+        with self.change_log.lock:
+            self.place_repo.add(place)
+            self.integrity.link('place', place)
+            self.amenity_catalog.set_place(place.id, amenity_ids)
+            self.place_price_index.set(place.id, place.price)
+            self.place_rating_index.set(place.id, 0.0)
+            self.place_created_index.set(place.id, place.created_at)
+            self.change_log.publish('create', 'place', place, place_data.keys())
+        self._refresh_dashboard(place)
+        self.similar_places.set(place.id, self._place_features(place))
         return place
     
-    def get_place(self, place_id):
+    def coalesce(self, key, compute):
+        """
+        Compute a read once for all the concurrent callers asking for it.
+
+        During a burst of identical requests (a listing going viral) only the first
+        one reads the repositories and serializes; the others wait for it and share
+        its result. Callers arriving after a write completed start afresh.
+
+        Args:
+            key (hashable): Identifies the read, including every input its result
+                depends on (e.g. the endpoint, path and query arguments).
+            compute (callable): Takes no argument and returns the result.
+
+        Returns:
+            The result of compute(), possibly computed for another caller; it must not be modified.
+        """
+        return self.flights.do(key, compute)
+
+    def get_place(self, place_id, fields=None, embed=PLACE_EMBEDS, reviews_limit=None):
         """
         Retrieve a place by ID from the place repository.
 
+        Relations that are not embedded are neither fetched nor serialized; the place
+        then only carries their IDs (owner_id, amenity and review IDs).
+
         Args:
             place_id (str): The ID of the place to retrieve.
+            fields (iterable, optional): Place attributes to return; None returns all of them.
+                Embedded relations are always returned.
+            embed (iterable, optional): Relations to embed among 'owner', 'amenities' and 'reviews'.
+                Defaults to all of them.
+            reviews_limit (int, optional): Embed only the most recent reviews, newest first, up to this number.
 
         Returns:
-            dict: A dictionary containing place details, including owner, amenities, and reviews.
+            dict: A dictionary containing place details, including the embedded relations.
         """
         # Retrieve the place object
         place = self.place_repo.get(place_id)
@@ -195,35 +455,123 @@ class HBnBFacade:
             return None
 
         # Ensure place is a Place object before converting to dict
-        place_dict = place.to_dict() if not isinstance(place, dict) else place
-
-        owner = self.user_repo.get(place_dict.get('owner_id'))
+        place_dict = self.serialize_place(place) if not isinstance(place, dict) else place
+        if fields is not None:
+            place_dict = {key: value for key, value in place_dict.items()
+                          if key == 'id' or key in fields}
 
         # Include owner details in the returned dictionary
-        if owner:
-            place_dict['owner'] = {
-                "id": owner.id,
-                "first_name": owner.first_name,
-                "last_name": owner.last_name,
-                "email": owner.email
-            }
-
-        # Ensure 'amenities' key exists and is iterable
-        amenities_ids = place_dict.get('amenities', [])
-        place_dict['amenities'] = [self.amenity_repo.get(amenity_id).to_dict()
-                                for amenity_id in amenities_ids]
-        
-        # Fetch reviews
-        reviews = [self.review_repo.get(review_id).to_dict()
-                for review_id in place_dict.get('reviews', [])]
-        place_dict['reviews'] = reviews
+        if 'owner' in embed:
+            owner = self.user_repo.get(place.owner_id)
+            place_dict['owner'] = identity.to_dict('user', owner) if owner else {}
+
+        if 'amenities' in embed:
+            place_dict['amenities'] = [identity.to_dict('amenity', amenity) for amenity in
+                                       self.amenity_repo.get_many(place.amenities) if amenity]
+
+        # Fetch reviews; the feed yields the most recent ones without scanning the rest
+        review_ids = place.reviews
+        if reviews_limit is not None:
+            review_ids = self.review_feed.page(place_id, reviews_limit)[0] if reviews_limit > 0 else []
+        if 'reviews' in embed:
+            place_dict['reviews'] = [identity.to_dict('review', review)
+                                     for review in self.review_repo.get_many(review_ids) if review]
+        elif 'reviews' in place_dict and reviews_limit is not None:
+            place_dict['reviews'] = self._live_ids(self.review_repo, review_ids)
+
+        return place_dict
+
+    def serialize_place(self, place):
+        """
+        Serialize a place, leaving out references to deleted amenities and reviews.
+
+        Args:
+            place (Place): The place.
 
+        Returns:
+            dict: The place's details with its amenity and review IDs.
+        """
+        place_dict = identity.to_dict('place', place)
+        place_dict['amenities'] = self._live_ids(self.amenity_repo, place.amenities)
+        place_dict['reviews'] = self._live_ids(self.review_repo, place.reviews)
         return place_dict
 
-    def get_all_places(self):
+    def _live_ids(self, repo, obj_ids):
+        """
+        Return a copy of a list of IDs without the deleted entities.
+        """
+        if not self.integrity.pending:
+            return list(obj_ids)
+        # Until the sweeper gets to them, live entities may reference deleted ones
+        return [obj.id for obj in repo.get_many(obj_ids) if obj]
+
+    def get_places_by_ids(self, place_ids):
+        """
+        Retrieve several places with a single repository lookup.
+
+        Args:
+            place_ids (list): The IDs of the places to retrieve.
+
+        Returns:
+            tuple: (places, missing_ids) with places in the order of place_ids.
+        """
+        return self._get_by_ids(self.place_repo, place_ids)
+
+    def has_place(self, place_id):
+        """
+        Check that a place exists, without serializing it.
+
+        Args:
+            place_id (str): The ID of the place.
+
+        Returns:
+            bool: True if the place exists and is not deleted.
+        """
+        return self.place_repo.get(place_id) is not None
+
+    def get_place_entities(self, place_id, embed=PLACE_EMBEDS, reviews_limit=None):
+        """
+        Retrieve the entities that make up a place's detail representation.
+
+        This is used to compute cache validators (ETag, Last-Modified) without
+        serializing the place. Relations that are not embedded are not fetched: the
+        place's own version already changes when its amenity or review IDs do. The
+        entities are kept in the identity map, so get_place() does not read them again.
+
+        Args:
+            place_id (str): The ID of the place.
+            embed (iterable, optional): Relations embedded among 'owner', 'amenities' and 'reviews'.
+                Defaults to all of them.
+            reviews_limit (int, optional): Include only the most recent reviews, up to this number.
+
+        Returns:
+            list: The place followed by its embedded owner, amenities and reviews, or None if the
+                place is not found.
+        """
+        place = self.place_repo.get(place_id)
+        if not place:
+            return None
+
+        entities = [place]
+        if 'owner' in embed:
+            entities.append(self.user_repo.get(place.owner_id))
+        if 'amenities' in embed:
+            entities.extend(self.amenity_repo.get_many(place.amenities))
+        if 'reviews' in embed:
+            review_ids = place.reviews
+            if reviews_limit is not None:
+                review_ids = self.review_feed.page(place_id, reviews_limit)[0] if reviews_limit > 0 else []
+            entities.extend(self.review_repo.get_many(review_ids))
+        return entities
+
+    def get_all_places(self, embed=('owner', 'amenities')):
         """
         Retrieve all places from the place repository.
 
+        Args:
+            embed (iterable, optional): Relations to embed among 'owner' and 'amenities'.
+                Defaults to both.
+
         Returns:
             list: A list of dictionaries representing all places.
         """
@@ -234,9 +582,9 @@ class HBnBFacade:
         place_list = []
         for place in places:
             # Ensure place is a Place object before converting to dict
-            place_dict = place.to_dict() if not isinstance(place, dict) else place
+            place_dict = self.serialize_place(place) if not isinstance(place, dict) else place
 
-            owner = self.user_repo.get(place_dict.get('owner_id'))
+            owner = self.user_repo.get(place_dict.get('owner_id')) if 'owner' in embed else None
 
             if owner:
                 place_dict['owner'] = {
@@ -248,41 +596,82 @@ class HBnBFacade:
 
             # Ensure 'amenities' key exists and is iterable
             amenities_ids = place_dict.get('amenities', [])
-            place_dict['amenities'] = [self.amenity_repo.get(amenity_id).to_dict()
-                                    for amenity_id in amenities_ids]
+            if 'amenities' in embed:
+                place_dict['amenities'] = [amenity.to_dict() for amenity in self.amenity_repo.get_many(amenities_ids)
+                                           if amenity]
+            else:
+                place_dict['amenities'] = list(amenities_ids)
 
             place_list.append(place_dict)
 
         return place_list
     
     
-    def update_place(self, place_id, place_data):
+    @_write
+    def update_place(self, place_id, place_data, expected_version=None):
         """
         Update an existing place in the place repository.
 
         Args:
             place_id (str): The ID of the place to update.
-            place_data (dict): Updated attributes for the place.
+            place_data (dict): Updated attributes for the place; 'amenities' replaces its amenity IDs.
+            expected_version (int, optional): Only update the place if it is still at this version.
 
         Returns:
             Place: The updated Place object, or None if not found.
+
+        Raises:
+            ValueError: If a value is invalid or one of the amenities does not exist; the
+                place is left unchanged.
+            StaleWriteError: If the place is no longer at expected_version; it is left unchanged.
         """
         # Fetch the existing place
         place = self.place_repo.get(place_id)
         if not place:
             return None
-
-        # Update place's attributes
-        place.title = place_data.get('title', place.title)
-        place.description = place_data.get('description', place.description)
-        place.price = place_data.get('price', place.price)
-        place.latitude = place_data.get('latitude', place.latitude)
-        place.longitude = place_data.get('longitude', place.longitude)
-
-        # Update the repository
-        self.place_repo.update(place_id, place.to_dict())
+        # Everything is checked before anything is assigned, so a bad value cannot
+        # leave the place half updated
+        _check_payload(validate_place, place_data)
+        changes = {key: place_data[key] for key in ('title', 'description', 'price', 'latitude', 'longitude')
+                   if key in place_data}
+        if place_data.get('amenities') is not None:
+            changes['amenities'] = self._check_amenities(place_data['amenities'])
+
+        # The references the place was linked with; nothing changes before the
+        # repository accepted the update
+        before = copy.copy(place) if 'amenities' in changes else None
+        # Update the repository, which assigns the attributes
+        with self.change_log.lock:
+            self.place_repo.update(place_id, changes, expected_version)
+            self.place_price_index.set(place_id, place.price)
+            if 'amenities' in changes:
+                self.integrity.unlink('place', before)
+                self.integrity.link('place', place)
+                self.amenity_catalog.set_place(place_id, changes['amenities'])
+            self.change_log.publish('update', 'place', place,
+                                    changes.keys() & place_data.keys())
+        self.similar_places.set(place_id, self._place_features(place))
+        self._refresh_dashboard(place)
         return place
     
+    @_write
+    def delete_place(self, place_id):
+        """
+        Delete a place along with its reviews and bookings.
+
+        Args:
+            place_id (str): The ID of the place to delete.
+
+        Raises:
+            ValueError: If the place with the specified ID is not found.
+        """
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise ValueError(f"Place with ID {place_id} not found.")
+        self._tombstone('place', place)
+        self.dashboards.remove_place(place.owner_id, place_id)
+
+    @_write
     def create_review(self, review_data):
         """
         Create a new review and add it to the review repository.
@@ -312,13 +701,21 @@ class HBnBFacade:
         # Create and validate the review
         review = Review(text=text, rating=rating, place_id=place_id, user_id=user_id)
         review.validate_rating()
-        self.review_repo.add(review)
+        with self.change_log.lock:
+            self.review_repo.add(review)
+            self.integrity.link('review', review)
+            self.review_feed.add(place_id, review.id, review.created_at)
+            self._adjust_rating(place_id, review.rating, 1)
+            self.change_log.publish('create', 'review', review, ['text', 'rating', 'place_id', 'user_id'])
         
         # Add review to the place
         if not hasattr(place, 'reviews'):
             place.reviews = []
         place.reviews.append(review.id)  # Ensure review ID is stored
-        self.place_repo.update(place_id, place.to_dict())
+        with self.change_log.lock:
+            self.place_repo.update(place_id, {'reviews': place.reviews})
+            self.change_log.publish('update', 'place', place, ['reviews'])
+        self._refresh_dashboard(place)
 
         return review
 
@@ -341,6 +738,18 @@ class HBnBFacade:
             raise ValueError(f"Review with ID {review_id} not found.")
         return review
 
+    def get_reviews_by_ids(self, review_ids):
+        """
+        Retrieve several reviews with a single repository lookup.
+
+        Args:
+            review_ids (list): The IDs of the reviews to retrieve.
+
+        Returns:
+            tuple: (reviews, missing_ids) with reviews in the order of review_ids.
+        """
+        return self._get_by_ids(self.review_repo, review_ids)
+
     def get_all_reviews(self):
         """
         Retrieve all reviews from the review repository.
@@ -350,12 +759,14 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
-    def update_review(self, review_id, **kwargs):
+    @_write
+    def update_review(self, review_id, expected_version=None, **kwargs):
         """
         Update an existing review in the review repository.
 
         Args:
             review_id (str): The ID of the review to update.
+            expected_version (int, optional): Only update the review if it is still at this version.
             **kwargs: Keyword arguments for updating review attributes. 
                       Possible keys are 'rating' and 'text'.
 
@@ -363,21 +774,31 @@ class HBnBFacade:
             Review: The updated Review object.
 
         Raises:
-            ValueError: If the review with the specified ID is not found.
+            ValueError: If the review with the specified ID is not found or a value is invalid;
+                the review is left unchanged then.
+            StaleWriteError: If the review is no longer at expected_version.
         """
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError(f"Review with ID {review_id} not found.")
 
-        if "rating" in kwargs:
-            review.rating = kwargs["rating"]
-            review.validate_rating()
-        if "text" in kwargs:
-            review.text = kwargs["text"]
-
-        self.review_repo.update(review_id, review.to_dict())
+        changes = {key: kwargs[key] for key in ('rating', 'text') if key in kwargs}
+        _check_payload(validate_review, changes)
+        old_rating = review.rating
+        with self.change_log.lock:
+            self.review_repo.update(review_id, changes, expected_version)
+            # An archived review is read as a copy and updated as another one moved back
+            # to the hot tier, so read the updated object again
+            review = self.review_repo.get(review_id)
+            if review.rating != old_rating:
+                self._adjust_rating(review.place_id, review.rating - old_rating, 0)
+            self.change_log.publish('update', 'review', review, kwargs.keys() & {'rating', 'text'})
+        place = self.place_repo.get(review.place_id)
+        if place:
+            self._refresh_dashboard(place)
         return review
 
+    @_write
     def delete_review(self, review_id):
         """
         Delete a review from the review repository.
@@ -391,7 +812,327 @@ class HBnBFacade:
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError(f"Review with ID {review_id} not found.")
-        self.review_repo.delete(review_id)
+        self._remove_review(review)
+
+    def _remove_review(self, review):
+        """
+        Delete a review and every reference to it.
+        """
+        with self.change_log.lock:
+            self.review_repo.delete(review.id)
+            self.integrity.unlink('review', review)
+            self.review_feed.remove(review.place_id, review.id, review.created_at)
+            self._adjust_rating(review.place_id, -review.rating, -1)
+            place = self.place_repo.backend.get(review.place_id)
+            if place is not None and review.id in place.reviews:
+                self.place_repo.update(place.id, {'reviews': [review_id for review_id in place.reviews
+                                                              if review_id != review.id]})
+            self.change_log.publish('delete', 'review', review, [])
+        # Not for a deleted place, which already left its owner's dashboard
+        if place is not None and self.place_repo.get(place.id):
+            self._refresh_dashboard(place)
+
+    @_write
+    def sweep(self, limit=500):
+        """
+        Remove up to `limit` entities depending on deleted ones, then the deleted entities.
+
+        Args:
+            limit (int, optional): Maximum number of removals. Defaults to 500.
+
+        Returns:
+            int: The number of removals done; fewer than limit once nothing is pending.
+        """
+        return self.integrity.sweep(limit, self._purge, self._detach)
+
+    def _is_live(self, kind, obj):
+        return self.integrity.is_live(kind, obj, self._get_live)
+
+    def _get_live(self, kind, obj_id):
+        return getattr(self, f"{kind}_repo").get(obj_id)
+
+    def _tombstone(self, kind, obj):
+        """
+        Record the deletion of an entity and publish it; the entity is hidden from now on.
+
+        The change feed reports the deletion at once rather than when the sweeper gets
+        to it; the dependents removed by the sweep are published as they are removed.
+        """
+        with self.change_log.lock:
+            if self.integrity.delete(kind, obj.id):
+                self.published_deletions.add((kind, obj.id))
+                self.change_log.publish('delete', kind, obj, [])
+
+    @_write
+    def _purge(self, kind, obj_id):
+        """
+        Remove an entity for good, with its index entries; return it, or None if it is gone.
+        """
+        repo = getattr(self, f"{kind}_repo")
+        # Deleted entities are hidden from the scoped repository, not from its backend
+        obj = repo.backend.get(obj_id)
+        if obj is None:
+            self.published_deletions.discard((kind, obj_id))
+            return None
+        if kind == 'review':
+            self._remove_review(obj)
+            return obj
+        if kind == 'booking':
+            self._remove_booking(obj)
+            return obj
+        if kind == 'place':
+            for index in (self.place_price_index, self.place_rating_index, self.place_created_index):
+                index.remove(obj_id)
+            with HBnBFacade._rating_lock:
+                self.rating_totals.pop(obj_id, None)
+            self.amenity_catalog.remove_place(obj_id)
+            self.dashboards.remove_place(obj.owner_id, obj_id)
+            self.similar_places.remove(obj_id)
+        with self.change_log.lock:
+            repo.delete(obj_id)
+            if (kind, obj_id) in self.published_deletions:
+                self.published_deletions.discard((kind, obj_id))
+            else:
+                # A dependent removed with its parent
+                self.change_log.publish('delete', kind, obj, [])
+        return obj
+
+    @_write
+    def _detach(self, relation, child_id, parent_id):
+        """
+        Remove a reference to a deleted parent from a list attribute of a child.
+        """
+        repo = getattr(self, f"{relation.child}_repo")
+        child = repo.backend.get(child_id)
+        if child is None:
+            return
+        remaining = [ref for ref in getattr(child, relation.attribute) if ref != parent_id]
+        with self.change_log.lock:
+            repo.update(child_id, {relation.attribute: remaining})
+            self.change_log.publish('update', relation.child, child, [relation.attribute])
+        if relation.attribute == 'amenities':
+            self.amenity_catalog.set_place(child_id, remaining)
+            self.similar_places.set(child_id, self._place_features(child))
+
+    def _check_amenities(self, amenity_ids):
+        """
+        Return amenity IDs without duplicates, checking that they all exist.
+
+        Raises:
+            ValueError: If one of the amenities does not exist.
+        """
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        missing = self._get_by_ids(self.amenity_repo, amenity_ids)[1]
+        if missing:
+            raise ValueError(f"Amenity not found: {missing[0]}")
+        return amenity_ids
+
+    def _get_by_ids(self, repo, obj_ids):
+        """
+        Split a batched repository lookup into the objects found and the IDs missing.
+        """
+        found = []
+        missing = []
+        for obj_id, obj in zip(obj_ids, repo.get_many(obj_ids)):
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found.append(obj)
+        return found, missing
+
+    def _adjust_rating(self, place_id, rating_delta, count_delta):
+        """
+        Apply a change to a place's rating totals and move it in the rating index.
+
+        Args:
+            place_id (str): The ID of the reviewed place.
+            rating_delta (int): Change to the sum of ratings.
+            count_delta (int): Change to the number of reviews.
+        """
+        with HBnBFacade._rating_lock:
+            totals = self.rating_totals.setdefault(place_id, [0, 0])
+            totals[0] += rating_delta
+            totals[1] += count_delta
+            average = totals[0] / totals[1] if totals[1] else 0.0
+        place = self.place_repo.get(place_id)
+        if place:
+            self.place_rating_index.set(place_id, average)
+            self.similar_places.set(place_id, self._place_features(place))
+
+    def get_place_rating(self, place_id):
+        """
+        Return the average review rating of a place.
+
+        Args:
+            place_id (str): The ID of the place.
+
+        Returns:
+            float: The average rating, or 0.0 if the place has no reviews.
+        """
+        total, count = self.rating_totals.get(place_id, (0, 0))
+        return total / count if count else 0.0
+
+    def get_places_sorted(self, sort='newest', min_price=None, max_price=None,
+                          min_rating=None, max_rating=None, limit=None,
+                          amenities=None, any_amenities=None):
+        """
+        Retrieve places in a given order, filtered by price and rating ranges and amenities.
+
+        The ordered indexes make this O(log n + k): the range on the sort key is a
+        slice of its index, and the other range is checked on the k places read.
+        The amenity filters are evaluated first as bitmap operations; when few places
+        match, those are sorted directly instead of scanning the index.
+
+        Args:
+            sort (str, optional): One of 'price', '-price', 'rating' or 'newest'. Defaults to 'newest'.
+            min_price (float, optional): Inclusive lower price bound.
+            max_price (float, optional): Inclusive upper price bound.
+            min_rating (float, optional): Inclusive lower average rating bound.
+            max_rating (float, optional): Inclusive upper average rating bound.
+            limit (int, optional): Maximum number of places to return.
+            amenities (iterable, optional): Amenity IDs the places must all offer.
+            any_amenities (iterable, optional): Amenity IDs the places must offer at least one of.
+
+        Returns:
+            list: The matching Place objects in the requested order.
+
+        Raises:
+            ValueError: If the sort order is not supported.
+        """
+        if sort not in self.PLACE_SORTS:
+            raise ValueError(f"Unsupported sort order: {sort}")
+        index_name, reverse = self.PLACE_SORTS[sort]
+        index = getattr(self, index_name)
+
+        price_range = (min_price, max_price)
+        rating_range = (min_rating, max_rating)
+        filters = []
+        if index is self.place_price_index:
+            low, high = price_range
+        else:
+            low, high = None, None
+            if price_range != (None, None):
+                filters.append((self.place_price_index, price_range))
+        if index is self.place_rating_index:
+            low, high = rating_range
+        elif rating_range != (None, None):
+            filters.append((self.place_rating_index, rating_range))
+
+        def in_range(key, bounds):
+            return (bounds[0] is None or key >= bounds[0]) and (bounds[1] is None or key <= bounds[1])
+
+        selection = self._select_amenities(amenities, any_amenities)
+        if selection is None:
+            # Without extra filters the index can apply the limit itself
+            ids = index.range(low, high, reverse=reverse, limit=None if filters else limit)
+        elif len(selection) * self.SELECTIVE_FILTER_RATIO < len(index):
+            # Few matches: sorting them is cheaper than scanning the index
+            filters.append((index, (low, high)))
+            ids = sorted(self.amenity_catalog.place_ids(selection),
+                         key=lambda place_id: (index.get_key(place_id), place_id), reverse=reverse)
+        else:
+            ids = (place_id for place_id in index.range(low, high, reverse=reverse)
+                   if self.amenity_catalog.contains(selection, place_id))
+        places = []
+        for place_id in ids:
+            if all(in_range(f.get_key(place_id), bounds) for f, bounds in filters):
+                place = self.place_repo.get(place_id)
+                if place:
+                    places.append(place)
+                    if limit is not None and len(places) >= limit:
+                        break
+        return places
+
+    def _select_amenities(self, amenities, any_amenities):
+        """
+        Compute the amenity selection of a listing, or None when it filters nothing.
+        """
+        if not amenities and not any_amenities:
+            return None
+        return self.amenity_catalog.select(amenities or (), any_amenities or ())
+
+    def get_similar_places(self, place_id, limit=10):
+        """
+        Retrieve the places most similar to a place in price, location, rating and amenities.
+
+        Args:
+            place_id (str): The ID of the reference place.
+            limit (int, optional): Maximum number of places to return. Defaults to 10.
+
+        Returns:
+            list: (Place, similarity) pairs, most similar first, or None if the place is not found.
+        """
+        if not self.place_repo.get(place_id):
+            return None
+        # Deleted places stay indexed until swept; ask for more to make up for them
+        wanted = limit * 2 if self.integrity.pending else limit
+        pairs = self.similar_places.similar(place_id, wanted) or []
+        places = self.place_repo.get_many([similar_id for similar_id, _ in pairs])
+        return [(place, score) for place, (_, score) in zip(places, pairs) if place][:limit]
+
+    def _place_features(self, place):
+        """
+        Compute the similarity features of a place.
+        """
+        codes = (self.amenity_catalog.code(amenity_id) for amenity_id in place.amenities)
+        return self.similar_places.features(place.price, place.latitude, place.longitude,
+                                            self.get_place_rating(place.id),
+                                            [code for code in codes if code is not None])
+
+    def get_user_dashboard(self, user_id):
+        """
+        Retrieve a user's places with their review counts, average ratings and latest reviews.
+
+        The dashboard is maintained incrementally by the place and review write paths,
+        so serving it does not depend on the number of places.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            dict: The dashboard (see DashboardViews), or None if the user is not found.
+        """
+        if not self.user_repo.get(user_id):
+            return None
+        return self.dashboards.get(user_id, lambda: self._build_dashboard(user_id))
+
+    def _build_dashboard(self, user_id):
+        """
+        Compute the dashboard entries of all of a user's places, oldest place first.
+        """
+        places = [place for place in self.place_repo.get_many(self.integrity.children('user', user_id, 'place'))
+                  if place]
+        places.sort(key=lambda place: place.created_at)
+        return [self._dashboard_entry(place) for place in places]
+
+    def _dashboard_entry(self, place):
+        """
+        Compute a place's dashboard entry.
+
+        Returns:
+            tuple: (entry, review_count, rating_sum).
+        """
+        with HBnBFacade._rating_lock:
+            rating_sum, count = self.rating_totals.get(place.id, (0, 0))
+        review_ids = self.review_feed.page(place.id, self.DASHBOARD_LATEST_REVIEWS)[0]
+        entry = {
+            'id': place.id,
+            'title': place.title,
+            'price': place.price,
+            'review_count': count,
+            'average_rating': rating_sum / count if count else 0.0,
+            'latest_reviews': [{'id': review.id, 'user_id': review.user_id, 'rating': review.rating,
+                                'text': review.text, 'created_at': review.created_at.isoformat()}
+                               for review in self.review_repo.get_many(review_ids) if review]
+        }
+        return entry, count, rating_sum
+
+    def _refresh_dashboard(self, place):
+        """
+        Replace a place's entry in its owner's dashboard, if the dashboard is kept.
+        """
+        if self.dashboards.is_tracked(place.owner_id):
+            self.dashboards.set_place(place.owner_id, *self._dashboard_entry(place))
 
     def get_reviews_for_place(self, place_id):
         """
@@ -411,5 +1152,319 @@ class HBnBFacade:
             raise ValueError(f"Place with ID {place_id} not found.")
         
         # Assuming reviews are stored as a list of review IDs in the place model
-        reviews = [self.review_repo.get(review_id) for review_id in place.reviews]
-        return reviews
\ No newline at end of file
+        return [review for review in self.review_repo.get_many(place.reviews) if review]
+
+    def get_review_page(self, place_id, limit, before=None):
+        """
+        Retrieve a page of a place's reviews, newest first.
+
+        Args:
+            place_id (str): The ID of the reviewed place.
+            limit (int): Maximum number of reviews to return.
+            before (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (reviews, next_cursor) where next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the place with the specified ID is not found or the cursor is invalid.
+        """
+        if not self.place_repo.get(place_id):
+            raise ValueError(f"Place with ID {place_id} not found.")
+        review_ids, next_cursor = self.review_feed.page(place_id, limit, before)
+        return [review for review in self.review_repo.get_many(review_ids) if review], next_cursor
+
+    @_write
+    def create_booking(self, place_id, booking_data):
+        """
+        Book a place for a stay.
+
+        The calendar reserves the nights atomically, so concurrent requests for
+        overlapping stays cannot both succeed.
+
+        Args:
+            place_id (str): The ID of the place to book.
+            booking_data (dict): Booking attributes including 'user_id', 'check_in' and 'check_out'.
+
+        Returns:
+            Booking: The created Booking object.
+
+        Raises:
+            ValueError: If the place or user does not exist or the dates are invalid.
+            ConflictError: If the place is already booked for one of the nights.
+        """
+        user_id = booking_data.get('user_id')
+        if not self.place_repo.get(place_id):
+            raise ValueError(f"Place with ID {place_id} not found.")
+        if not self.user_repo.get(user_id):
+            raise ValueError(f"User with ID {user_id} not found.")
+
+        booking = Booking(place_id=place_id, user_id=user_id,
+                          check_in=booking_data.get('check_in'), check_out=booking_data.get('check_out'))
+        self.booking_calendar.reserve(place_id, booking.id, booking.check_in, booking.check_out)
+        with self.change_log.lock:
+            self.booking_repo.add(booking)
+            self.integrity.link('booking', booking)
+            self.change_log.publish('create', 'booking', booking, ['place_id', 'user_id', 'check_in', 'check_out'])
+        return booking
+
+    def get_booking(self, booking_id):
+        """
+        Retrieve a booking by ID from the booking repository.
+
+        Args:
+            booking_id (str): The ID of the booking to retrieve.
+
+        Returns:
+            Booking: The Booking object if found, otherwise None.
+        """
+        return self.booking_repo.get(booking_id)
+
+    def get_bookings_for_place(self, place_id, start=None, end=None):
+        """
+        Retrieve the bookings of a place, optionally only those overlapping a date window.
+
+        Args:
+            place_id (str): The ID of the place.
+            start (date, optional): Start of the window.
+            end (date, optional): End of the window.
+
+        Returns:
+            list: The Booking objects in check-in order.
+
+        Raises:
+            ValueError: If the place with the specified ID is not found.
+        """
+        if not self.place_repo.get(place_id):
+            raise ValueError(f"Place with ID {place_id} not found.")
+        booking_ids = self.booking_calendar.booking_ids(place_id, start, end)
+        return [booking for booking in self.booking_repo.get_many(booking_ids) if booking]
+
+    @_write
+    def cancel_booking(self, booking_id):
+        """
+        Cancel a booking and free its nights.
+
+        Args:
+            booking_id (str): The ID of the booking to cancel.
+
+        Raises:
+            ValueError: If the booking with the specified ID is not found.
+        """
+        booking = self.booking_repo.get(booking_id)
+        if not booking:
+            raise ValueError(f"Booking with ID {booking_id} not found.")
+        self._remove_booking(booking)
+
+    def _remove_booking(self, booking):
+        """
+        Delete a booking and free its nights.
+        """
+        self.booking_calendar.release(booking.id)
+        with self.change_log.lock:
+            self.booking_repo.delete(booking.id)
+            self.integrity.unlink('booking', booking)
+            self.change_log.publish('delete', 'booking', booking, [])
+
+    def search_available_places(self, check_in, check_out, min_price=None, max_price=None,
+                                bounds=None, limit=None, amenities=None, any_amenities=None):
+        """
+        Retrieve the places free for a whole stay, cheapest first.
+
+        Candidates come from the price index, so the price range costs a binary
+        search; each candidate then takes an area check and an O(log n) calendar check.
+
+        Args:
+            check_in (date): The day of arrival.
+            check_out (date): The day of departure.
+            min_price (float, optional): Inclusive lower price bound.
+            max_price (float, optional): Inclusive upper price bound.
+            bounds (tuple, optional): (min_latitude, max_latitude, min_longitude, max_longitude).
+            limit (int, optional): Maximum number of places to return.
+            amenities (iterable, optional): Amenity IDs the places must all offer.
+            any_amenities (iterable, optional): Amenity IDs the places must offer at least one of.
+
+        Returns:
+            list: The available Place objects ordered by price.
+
+        Raises:
+            ValueError: If check_out is not after check_in.
+        """
+        if check_out <= check_in:
+            raise ValueError("check_out must be after check_in")
+
+        selection = self._select_amenities(amenities, any_amenities)
+        places = []
+        for place_id in self.place_price_index.range(min_price, max_price):
+            if selection is not None and not self.amenity_catalog.contains(selection, place_id):
+                continue
+            if not self.booking_calendar.is_free(place_id, check_in, check_out):
+                continue
+            place = self.place_repo.get(place_id)
+            if not place:
+                continue
+            if bounds and not (bounds[0] <= place.latitude <= bounds[1]
+                               and bounds[2] <= place.longitude <= bounds[3]):
+                continue
+            places.append(place)
+            if limit is not None and len(places) >= limit:
+                break
+        return places
+
+    @_write
+    def import_users(self, users):
+        """
+        Add already validated users in one batched repository write.
+
+        Bulk imports maintain the indexes but are not published to the change log.
+
+        Args:
+            users (list): The User objects to add.
+
+        Returns:
+            list: (user, ConflictError) pairs for the users whose email is already registered.
+        """
+        return self.user_repo.add_many(users)
+
+    @_write
+    def import_amenities(self, amenities):
+        """
+        Add already validated amenities in one batched repository write.
+
+        Args:
+            amenities (list): The Amenity objects to add.
+
+        Returns:
+            list: (amenity, ConflictError) pairs for the rejected amenities.
+        """
+        rejected = self.amenity_repo.add_many(amenities)
+        skipped = {id(amenity) for amenity, _ in rejected}
+        for amenity in amenities:
+            if id(amenity) not in skipped:
+                self.amenity_catalog.register(amenity.id)
+        return rejected
+
+    @_write
+    def import_places(self, places):
+        """
+        Add already validated places, whose owners and amenities exist, in one batched repository write.
+
+        Args:
+            places (list): The Place objects to add.
+
+        Returns:
+            list: (place, ConflictError) pairs for the rejected places.
+        """
+        rejected = self.place_repo.add_many(places)
+        skipped = {id(place) for place, _ in rejected}
+        for place in places:
+            if id(place) not in skipped:
+                self.place_price_index.set(place.id, place.price)
+                self.place_rating_index.set(place.id, self.get_place_rating(place.id))
+                self.place_created_index.set(place.id, place.created_at)
+        self.amenity_catalog.set_places((place.id, place.amenities) for place in places
+                                        if id(place) not in skipped)
+        for place in places:
+            if id(place) not in skipped:
+                self.integrity.link('place', place)
+                self._refresh_dashboard(place)
+        self.similar_places.set_many((place.id, self._place_features(place)) for place in places
+                                     if id(place) not in skipped)
+        return rejected
+
+    @_write
+    def import_reviews(self, reviews):
+        """
+        Add already validated reviews, whose places and users exist, in one batched repository write.
+
+        Args:
+            reviews (list): The Review objects to add.
+
+        Returns:
+            list: (review, ConflictError) pairs for the rejected reviews.
+        """
+        rejected = self.review_repo.add_many(reviews)
+        skipped = {id(review) for review, _ in rejected}
+        place_ids = list({review.place_id for review in reviews})
+        places = dict(zip(place_ids, self.place_repo.get_many(place_ids)))
+        totals = {}
+        added = {}
+        for review in reviews:
+            if id(review) in skipped:
+                continue
+            added.setdefault(review.place_id, []).append(review.id)
+            self.integrity.link('review', review)
+            self.review_feed.add(review.place_id, review.id, review.created_at)
+            place_totals = totals.setdefault(review.place_id, [0, 0])
+            place_totals[0] += review.rating
+            place_totals[1] += 1
+        # One repository update, hence one version bump, and one rating update per
+        # place rather than per review
+        for place_id, (rating_sum, count) in totals.items():
+            place = places[place_id]
+            self.place_repo.update(place_id, {'reviews': place.reviews + added[place_id]})
+            self._adjust_rating(place_id, rating_sum, count)
+            self._refresh_dashboard(place)
+        return rejected
+
+    @classmethod
+    def enable_review_archive(cls, path, max_age_days, interval=None):
+        """
+        Move reviews older than max_age_days out of memory into a memory-mapped segment file.
+
+        The shared review repository becomes a TieredRepository over the current one, so
+        reviews are still read through get/get_many. Ratings, the review feed and the
+        place indexes are kept in memory regardless of where the reviews are.
+
+        Only the first call has an effect, as every application created calls this
+        again; the later calls return the repository of the first one.
+
+        Args:
+            path (str): Path of the segment file; it is truncated.
+            max_age_days (float): Age in days after which a review is archived.
+            interval (float, optional): Seconds between archive runs in a background thread;
+                None archives only when archive() is called.
+
+        Returns:
+            TieredRepository: The review repository.
+        """
+        # Another store would truncate the segment file the current one still maps
+        if isinstance(cls._shared_review_repo, TieredRepository):
+            return cls._shared_review_repo
+        repo = TieredRepository(cls._shared_review_repo, SegmentStore(path), timedelta(days=max_age_days))
+        cls._shared_review_repo = repo
+        if _facade is not None:
+            _facade.review_repo = ScopedRepository(repo, 'review', _facade._is_live)
+        if interval:
+            repo.start_archiver(interval)
+        return repo
+
+    @classmethod
+    def start_sweeper(cls, interval, batch_size):
+        """
+        Sweep deletions in a background thread.
+
+        Args:
+            interval (float): Seconds between two sweeps while nothing is pending.
+            batch_size (int): Maximum number of removals per sweep, bounding how long the
+                sweeper holds the repositories busy at a time.
+
+        Returns:
+            Thread: The started thread.
+        """
+        facade = get_facade()
+        return cls._shared_integrity.start_sweeper(interval, batch_size, facade._purge, facade._detach)
+
+_facade = None
+
+def get_facade():
+    """
+    Return the process-wide HBnBFacade, creating it on first use.
+
+    Returns:
+        HBnBFacade: The shared facade instance.
+    """
+    global _facade
+    if _facade is None:
+        _facade = HBnBFacade()
+    return _facade
@@ -0,0 +1,242 @@
+from contextvars import ContextVar
+from app.persistence.repository import Repository
+
+# The identity map of the unit of work in progress, if any
+_current = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    """
+    Entities and serializations loaded during one unit of work, typically one request.
+
+    Entities are kept by (kind, id), including misses, so each one is read from its
+    repository at most once per unit of work. to_dict() results are kept by
+    (kind, id, version); a write bumps the version, so a memoized serialization is
+    never stale.
+    """
+    def __init__(self):
+        self._objects = {}
+        self._dicts = {}
+
+    def to_dict(self, kind, obj):
+        """
+        Return a copy of obj.to_dict(), computing it once per entity version.
+
+        Args:
+            kind (str): The entity kind, e.g. 'user'.
+            obj (BaseModel): The entity.
+
+        Returns:
+            dict: A shallow copy the caller may modify.
+        """
+        key = (kind, obj.id, getattr(obj, 'version', None))
+        data = self._dicts.get(key)
+        if data is None:
+            data = self._dicts[key] = obj.to_dict()
+        return dict(data)
+
+
+def begin():
+    """
+    Start a unit of work in the current context.
+
+    Returns:
+        Token: Token to pass to end().
+    """
+    return _current.set(IdentityMap())
+
+
+def end(token=None):
+    """
+    End the unit of work started by begin().
+
+    Args:
+        token (Token, optional): The token begin() returned.
+    """
+    if token is not None:
+        _current.reset(token)
+    else:
+        _current.set(None)
+
+
+def current():
+    """
+    Return the identity map of the unit of work in progress.
+
+    Returns:
+        IdentityMap: The current identity map, or None outside a unit of work.
+    """
+    return _current.get()
+
+
+def to_dict(kind, obj):
+    """
+    Serialize an entity, memoized within the unit of work in progress.
+
+    Args:
+        kind (str): The entity kind, e.g. 'user'.
+        obj (BaseModel): The entity.
+
+    Returns:
+        dict: The serialization; a fresh dict the caller may modify.
+    """
+    identity_map = _current.get()
+    return identity_map.to_dict(kind, obj) if identity_map is not None else obj.to_dict()
+
+
+class ScopedRepository(Repository):
+    """
+    Repository wrapper reading through the identity map of the current unit of work.
+
+    Outside a unit of work every call goes straight to the wrapped repository.
+    Inside one, get() and get_many() only read the IDs not seen yet; writes keep the
+    map consistent (add records the object, update and delete evict it so the next
+    read sees the repository's state). Reads only return the objects accepted by the
+    `live` predicate, checked on every read so that a deletion shows at once.
+
+    Attributes:
+        backend (Repository): The wrapped repository.
+        kind (str): The entity kind keying this repository's entries in the map.
+        live (callable): live(kind, obj) telling whether an object may be returned, or None.
+    """
+    def __init__(self, backend, kind, live=None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            backend (Repository): The wrapped repository.
+            kind (str): The entity kind, e.g. 'user'.
+            live (callable, optional): Predicate hiding deleted objects. Defaults to none.
+        """
+        self.backend = backend
+        self.kind = kind
+        self.live = live
+
+    def _visible(self, obj):
+        return None if obj is None or (self.live is not None and not self.live(self.kind, obj)) else obj
+
+    def add(self, obj):
+        """
+        Add an object to the backend and record it in the identity map.
+
+        Args:
+            obj (BaseModel): The object to add.
+        """
+        self.backend.add(obj)
+        identity_map = _current.get()
+        if identity_map is not None:
+            identity_map._objects[(self.kind, obj.id)] = obj
+
+    def add_many(self, objs):
+        """
+        Add several objects to the backend; they are read through the map when next needed.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            list: (obj, ConflictError) pairs for the objects the backend rejected.
+        """
+        objs = list(objs)
+        rejected = self.backend.add_many(objs)
+        self._evict(obj.id for obj in objs)
+        return rejected
+
+    def get(self, obj_id):
+        """
+        Retrieve an object by its ID, at most once per unit of work.
+
+        Args:
+            obj_id (str): The ID of the object to retrieve.
+
+        Returns:
+            BaseModel: The object with the specified ID, or None if not found.
+        """
+        identity_map = _current.get()
+        if identity_map is None:
+            return self._visible(self.backend.get(obj_id))
+        key = (self.kind, obj_id)
+        if key in identity_map._objects:
+            return self._visible(identity_map._objects[key])
+        obj = identity_map._objects[key] = self.backend.get(obj_id)
+        return self._visible(obj)
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs, reading only the ones not loaded yet.
+
+        Args:
+            obj_ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of obj_ids, with None for IDs that are not found.
+        """
+        identity_map = _current.get()
+        if identity_map is None:
+            return [self._visible(obj) for obj in self.backend.get_many(obj_ids)]
+        objects = identity_map._objects
+        kind = self.kind
+        unseen = list(dict.fromkeys(obj_id for obj_id in obj_ids if (kind, obj_id) not in objects))
+        if unseen:
+            for obj_id, obj in zip(unseen, self.backend.get_many(unseen)):
+                objects[(kind, obj_id)] = obj
+        return [self._visible(objects[(kind, obj_id)]) for obj_id in obj_ids]
+
+    def get_all(self):
+        """
+        Retrieve all live objects from the backend.
+
+        Returns:
+            list: A list of all objects in the repository.
+        """
+        objs = self.backend.get_all()
+        if self.live is None:
+            return objs
+        return [obj for obj in objs if self.live(self.kind, obj)]
+
+    def update(self, obj_id, data, expected_version=None):
+        """
+        Update an object in the backend and evict it from the identity map.
+
+        Args:
+            obj_id (str): The ID of the object to update.
+            data (dict): A dictionary of attributes to update.
+            expected_version (int, optional): Only update the object if it is still at this version.
+        """
+        try:
+            self.backend.update(obj_id, data, expected_version)
+        finally:
+            self._evict([obj_id])
+
+    def delete(self, obj_id):
+        """
+        Delete an object from the backend and evict it from the identity map.
+
+        Args:
+            obj_id (str): The ID of the object to delete.
+        """
+        self.backend.delete(obj_id)
+        self._evict([obj_id])
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve an object by a specific attribute from the backend.
+
+        Args:
+            attr_name (str): The name of the attribute to search by.
+            attr_value: The value of the attribute to match.
+
+        Returns:
+            BaseModel: The object with the specified attribute value, or None if not found.
+        """
+        return self._visible(self.backend.get_by_attribute(attr_name, attr_value))
+
+    def _evict(self, obj_ids):
+        identity_map = _current.get()
+        if identity_map is not None:
+            for obj_id in obj_ids:
+                identity_map._objects.pop((self.kind, obj_id), None)
+
+    def __getattr__(self, name):
+        # Expose backend-specific operations, e.g. TieredRepository.archive()
+        return getattr(self.backend, name)
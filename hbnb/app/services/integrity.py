@@ -0,0 +1,289 @@
+import threading
+from collections import deque
+
+
+class Relation:
+    """
+    Declared reference from a child entity to a parent entity.
+
+    Attributes:
+        parent (str): Kind of the referenced entity, e.g. 'user'.
+        child (str): Kind of the referencing entity, e.g. 'place'.
+        attribute (str): Child attribute holding the parent ID, or a list of them.
+        action (str): What deleting the parent does to the child: 'cascade' deletes it,
+            'detach' removes the reference and keeps it.
+    """
+    def __init__(self, parent, child, attribute, action='cascade'):
+        self.parent = parent
+        self.child = child
+        self.attribute = attribute
+        self.action = action
+
+    def parent_ids(self, obj):
+        """
+        Return the IDs of the parents a child references through this relation.
+        """
+        value = getattr(obj, self.attribute, None)
+        if value is None:
+            return ()
+        return value if isinstance(value, list) else (value,)
+
+
+RELATIONS = (
+    Relation('user', 'place', 'owner_id'),
+    Relation('user', 'review', 'user_id'),
+    Relation('user', 'booking', 'user_id'),
+    Relation('place', 'review', 'place_id'),
+    Relation('place', 'booking', 'place_id'),
+    Relation('amenity', 'place', 'amenities', action='detach')
+)
+
+
+class ReferentialIntegrity:
+    """
+    Soft deletes with tombstones and incremental removal of the dependents.
+
+    Deleting an entity only records a tombstone, which takes effect at once: an
+    entity is live when it has no tombstone and, through the 'cascade' relations,
+    neither have its parents, so a deleted user's places and reviews disappear from
+    every read immediately. The sweeper then removes the dependents for real, child
+    before parent, in batches of bounded size, and finally the deleted entity itself.
+
+    The children of every parent are indexed as relations are linked, so finding
+    what to remove never scans a repository.
+
+    Attributes:
+        relations (tuple): The declared Relation objects.
+    """
+    def __init__(self, relations=RELATIONS):
+        """
+        Initialize the engine.
+
+        Args:
+            relations (tuple, optional): The declared relations. Defaults to RELATIONS.
+        """
+        self.relations = relations
+        self._parents = {}
+        for relation in relations:
+            self._parents.setdefault(relation.child, []).append(relation)
+        self._children = {relation: {} for relation in relations}
+        self._parent_kinds = {relation.parent for relation in relations}
+        self._tombstones = {}
+        self._pending = deque()
+        self._lock = threading.RLock()
+        # Held for a whole sweep: a sweep reads the front of the queue and pops it later
+        self._sweep_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper = None
+
+    @property
+    def pending(self):
+        """
+        Get the number of deleted entities not swept yet.
+
+        Returns:
+            int: The number of tombstones.
+        """
+        return len(self._pending)
+
+    def link(self, kind, obj):
+        """
+        Index an entity under the parents it references.
+
+        Args:
+            kind (str): The entity kind.
+            obj (BaseModel): The entity.
+        """
+        with self._lock:
+            for relation in self._parents.get(kind, ()):
+                children = self._children[relation]
+                for parent_id in relation.parent_ids(obj):
+                    children.setdefault(parent_id, set()).add(obj.id)
+
+    def unlink(self, kind, obj):
+        """
+        Remove an entity from the children of the parents it references.
+
+        Args:
+            kind (str): The entity kind.
+            obj (BaseModel): The entity, with the references it was linked with.
+        """
+        with self._lock:
+            for relation in self._parents.get(kind, ()):
+                children = self._children[relation]
+                for parent_id in relation.parent_ids(obj):
+                    siblings = children.get(parent_id)
+                    if siblings is not None:
+                        siblings.discard(obj.id)
+                        if not siblings:
+                            del children[parent_id]
+
+    def children(self, kind, obj_id, child_kind):
+        """
+        Return the IDs of the entities of a kind referencing an entity.
+
+        Args:
+            kind (str): The parent's kind, e.g. 'user'.
+            obj_id (str): The parent's ID.
+            child_kind (str): The children's kind, e.g. 'place'.
+
+        Returns:
+            list: The children's IDs, in no particular order.
+        """
+        with self._lock:
+            return [child_id for relation in self.relations
+                    if relation.parent == kind and relation.child == child_kind
+                    for child_id in self._children[relation].get(obj_id, ())]
+
+    def delete(self, kind, obj_id):
+        """
+        Record the deletion of an entity; it and its dependents stop being live at once.
+
+        Args:
+            kind (str): The entity kind.
+            obj_id (str): The ID of the entity.
+
+        Returns:
+            bool: False if the entity was already deleted.
+        """
+        with self._lock:
+            tombstones = self._tombstones.setdefault(kind, set())
+            if obj_id in tombstones:
+                return False
+            tombstones.add(obj_id)
+            self._pending.append((kind, obj_id))
+            return True
+
+    def is_live(self, kind, obj, resolve):
+        """
+        Check that neither an entity nor any of its cascade ancestors is deleted.
+
+        Args:
+            kind (str): The entity kind.
+            obj (BaseModel): The entity.
+            resolve (callable): resolve(kind, obj_id) returning the live parent, or None.
+
+        Returns:
+            bool: True if the entity is live.
+        """
+        if not self._pending:
+            return True
+        if obj.id in self._tombstones.get(kind, ()):
+            return False
+        for relation in self._parents.get(kind, ()):
+            if relation.action != 'cascade':
+                continue
+            for parent_id in relation.parent_ids(obj):
+                if parent_id in self._tombstones.get(relation.parent, ()):
+                    return False
+                # Grandparents are checked when resolving the parent
+                if relation.parent in self._parents and resolve(relation.parent, parent_id) is None:
+                    return False
+        return True
+
+    def sweep(self, limit, purge, detach):
+        """
+        Remove up to `limit` dependents or deleted entities.
+
+        Concurrent calls, e.g. an explicit sweep while the sweeper runs, take turns.
+
+        Args:
+            limit (int): Maximum number of removals in this call.
+            purge (callable): purge(kind, obj_id) removing an entity for good and returning it,
+                or None if it was already gone.
+            detach (callable): detach(relation, child_id, parent_id) removing a reference.
+
+        Returns:
+            int: The number of removals done.
+        """
+        with self._sweep_lock:
+            return self._sweep(limit, purge, detach)
+
+    def _sweep(self, limit, purge, detach):
+        done = 0
+        # The front of the queue is the entity being emptied; dependents with dependents
+        # of their own are pushed in front of it
+        while done < limit:
+            with self._lock:
+                if not self._pending:
+                    break
+                kind, obj_id = self._pending[0]
+                step = self._next_dependent(kind, obj_id)
+            if step is None:
+                obj = purge(kind, obj_id)
+                with self._lock:
+                    if obj is not None:
+                        self.unlink(kind, obj)
+                    self._pending.popleft()
+                    self._tombstones[kind].discard(obj_id)
+            else:
+                relation, child_id = step
+                if relation.action == 'detach':
+                    detach(relation, child_id, obj_id)
+                    with self._lock:
+                        self._discard_child(relation, obj_id, child_id)
+                elif relation.child in self._parent_kinds:
+                    # Emptied depth-first, so a place's reviews go before the place
+                    with self._lock:
+                        self._tombstones.setdefault(relation.child, set()).add(child_id)
+                        self._pending.appendleft((relation.child, child_id))
+                    continue
+                else:
+                    child = purge(relation.child, child_id)
+                    with self._lock:
+                        if child is not None:
+                            self.unlink(relation.child, child)
+                        self._discard_child(relation, obj_id, child_id)
+            done += 1
+        return done
+
+    def _next_dependent(self, kind, obj_id):
+        for relation in self.relations:
+            if relation.parent == kind:
+                children = self._children[relation].get(obj_id)
+                if children:
+                    return relation, next(iter(children))
+        return None
+
+    def _discard_child(self, relation, parent_id, child_id):
+        children = self._children[relation].get(parent_id)
+        if children is not None:
+            children.discard(child_id)
+            if not children:
+                del self._children[relation][parent_id]
+
+    def start_sweeper(self, interval, batch_size, purge, detach):
+        """
+        Run sweep() every `interval` seconds in a daemon thread while deletions are pending.
+
+        A single sweeper runs per engine; later calls return it.
+
+        Args:
+            interval (float): Seconds between two sweeps.
+            batch_size (int): Maximum number of removals per sweep.
+            purge (callable): As for sweep().
+            detach (callable): As for sweep().
+
+        Returns:
+            Thread: The started thread.
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return self._sweeper
+
+        def run():
+            while not self._stop.wait(interval):
+                while self._pending and self.sweep(batch_size, purge, detach) == batch_size:
+                    # More to do: go on with the next batch rather than waiting a whole interval
+                    if self._stop.wait(0):
+                        return
+
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=run, name='integrity-sweeper', daemon=True)
+        self._sweeper.start()
+        return self._sweeper
+
+    def stop_sweeper(self):
+        """
+        Stop the thread started by start_sweeper().
+        """
+        self._stop.set()
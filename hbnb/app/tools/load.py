@@ -0,0 +1,339 @@
+"""
+Bulk loader for users, amenities, places and reviews.
+
+Streams CSV or NDJSON files straight into the repositories instead of going
+through the REST API:
+
+    python -m app.tools.load --users users.csv --places places.ndjson --serve
+
+Records are parsed and validated with the model classes in a pool of worker
+processes, references between them are resolved a chunk at a time and the
+accepted objects are written with batched repository inserts. The repositories
+live in memory, so the data only outlives the loader when it goes on to serve
+the API (--serve); without it the run is a validation and throughput check.
+
+A record may carry its own `id`, which other files can then reference
+(owner_id, amenities, place_id, user_id), and a `created_at` ISO timestamp.
+In CSV files a place's amenities are separated by semicolons.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+
+# Entity kinds in dependency order: each one only references the kinds before it
+KINDS = ('users', 'amenities', 'places', 'reviews')
+
+CHUNK_SIZE = 5000
+
+# Facade method looking up several entities of each kind by ID
+LOOKUPS = {
+    'users': 'get_users_by_ids',
+    'amenities': 'get_amenities_by_ids',
+    'places': 'get_places_by_ids',
+    'reviews': 'get_reviews_by_ids'
+}
+
+
+class RecordError(ValueError):
+    """
+    Raised when a record cannot be turned into a valid model object.
+    """
+
+
+def _require(record, *names):
+    missing = [name for name in names if record.get(name) in (None, '')]
+    if missing:
+        raise RecordError(f"Missing field(s): {', '.join(missing)}")
+
+
+def _stamp(obj, record):
+    """
+    Apply the record's own id and creation time, if any, to a new model object.
+    """
+    if record.get('id'):
+        obj.id = str(record['id'])
+    if record.get('created_at'):
+        obj.created_at = obj.updated_at = datetime.fromisoformat(record['created_at'])
+    return obj
+
+
+def _build_user(record):
+    _require(record, 'first_name', 'last_name', 'email', 'password')
+    is_admin = record.get('is_admin', False)
+    if isinstance(is_admin, str):
+        is_admin = is_admin.strip().lower() in ('1', 'true', 'yes')
+    user = User(record['first_name'], record['last_name'], record['email'].strip(),
+                record['password'], is_admin=bool(is_admin))
+    user.validate_email()
+    return _stamp(user, record)
+
+
+def _build_amenity(record):
+    _require(record, 'name')
+    return _stamp(Amenity(record['name'], record.get('description') or ''), record)
+
+
+def _build_place(record):
+    _require(record, 'title', 'price', 'latitude', 'longitude', 'owner_id')
+    # The setters validate the ranges
+    place = Place(record['title'], record.get('description') or '', float(record['price']),
+                  float(record['latitude']), float(record['longitude']), record['owner_id'])
+    amenities = record.get('amenities') or []
+    if isinstance(amenities, str):
+        amenities = [amenity_id.strip() for amenity_id in amenities.split(';') if amenity_id.strip()]
+    place.amenities = list(amenities)
+    return _stamp(place, record)
+
+
+def _build_review(record):
+    _require(record, 'text', 'rating', 'place_id', 'user_id')
+    # The constructor validates the rating
+    return _stamp(Review(record['text'], int(record['rating']), record['place_id'], record['user_id']), record)
+
+
+BUILDERS = {
+    'users': _build_user,
+    'amenities': _build_amenity,
+    'places': _build_place,
+    'reviews': _build_review
+}
+
+
+def build_chunk(task):
+    """
+    Parse and validate one chunk of records; runs in a worker process.
+
+    Args:
+        task (tuple): (kind, header, lines) where lines are (line_no, raw) pairs. header is the
+            CSV header and raw a list of CSV fields, or header is None and raw an NDJSON line.
+
+    Returns:
+        tuple: (objects, rejects) as (line_no, model object) and (line_no, error message) pairs.
+    """
+    kind, header, lines = task
+    build = BUILDERS[kind]
+    objects = []
+    rejects = []
+    for line_no, raw in lines:
+        try:
+            if header is None:
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise RecordError("Record is not a JSON object")
+            else:
+                if len(raw) != len(header):
+                    raise RecordError(f"Expected {len(header)} fields, got {len(raw)}")
+                record = dict(zip(header, raw))
+            objects.append((line_no, build(record)))
+        except (ValueError, TypeError) as e:
+            rejects.append((line_no, str(e)))
+    return objects, rejects
+
+
+def read_chunks(kind, path, chunk_size=CHUNK_SIZE):
+    """
+    Stream a CSV or NDJSON file as tasks for build_chunk.
+
+    The format is taken from the extension: .csv, otherwise NDJSON.
+
+    Yields:
+        tuple: (kind, header, lines) tasks of up to chunk_size records.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            # line_num is read after each row so multi-line fields are numbered correctly
+            rows = ((reader.line_num, row) for row in reader if row)
+        else:
+            header = None
+            rows = ((line_no, line) for line_no, line in enumerate(f, 1) if line.strip())
+        while True:
+            lines = list(islice(rows, chunk_size))
+            if not lines:
+                return
+            yield kind, header, lines
+
+
+class Loader:
+    """
+    Resolves references between validated records and writes them through the facade.
+
+    Attributes:
+        facade (HBnBFacade): The facade whose repositories are loaded.
+        stats (dict): Per kind, the number of records loaded and rejected and the seconds spent.
+        rejects (list): (kind, line_no, error message) for every rejected record.
+    """
+    def __init__(self, facade):
+        """
+        Initialize the loader.
+
+        Args:
+            facade (HBnBFacade): The facade whose repositories are loaded.
+        """
+        self.facade = facade
+        self.stats = {}
+        self.rejects = []
+
+    @staticmethod
+    def _missing(lookup, ids):
+        """
+        Return the IDs among ids that do not exist, with one batched lookup.
+        """
+        ids = list(set(ids))
+        return set(lookup(ids)[1]) if ids else set()
+
+    def _check_references(self, kind, objects):
+        """
+        Return an error message for each object, by id(obj), that references a missing entity.
+        """
+        facade = self.facade
+        errors = {}
+        # IDs given in the files must not overwrite existing entities
+        free = self._missing(getattr(facade, LOOKUPS[kind]), (obj.id for obj in objects))
+        seen = set()
+        for obj in objects:
+            if obj.id not in free or obj.id in seen:
+                errors[id(obj)] = f"ID {obj.id} already exists"
+            seen.add(obj.id)
+
+        if kind == 'places':
+            missing_owners = self._missing(facade.get_users_by_ids, (place.owner_id for place in objects))
+            missing_amenities = self._missing(facade.get_amenities_by_ids,
+                                              (amenity_id for place in objects for amenity_id in place.amenities))
+            for place in objects:
+                dangling = missing_amenities.intersection(place.amenities)
+                if id(place) in errors:
+                    continue
+                if place.owner_id in missing_owners:
+                    errors[id(place)] = f"Owner {place.owner_id} not found"
+                elif dangling:
+                    errors[id(place)] = f"Amenity {min(dangling)} not found"
+        elif kind == 'reviews':
+            missing_places = self._missing(facade.get_places_by_ids, (review.place_id for review in objects))
+            missing_users = self._missing(facade.get_users_by_ids, (review.user_id for review in objects))
+            for review in objects:
+                if id(review) in errors:
+                    continue
+                if review.place_id in missing_places:
+                    errors[id(review)] = f"Place {review.place_id} not found"
+                elif review.user_id in missing_users:
+                    errors[id(review)] = f"User {review.user_id} not found"
+        return errors
+
+    def write(self, kind, entries):
+        """
+        Resolve the references of a chunk of validated objects and add the valid ones.
+
+        Args:
+            kind (str): One of KINDS.
+            entries (list): (line_no, model object) pairs.
+
+        Returns:
+            int: The number of objects added.
+        """
+        objects = [obj for _, obj in entries]
+        errors = self._check_references(kind, objects)
+        importer = getattr(self.facade, f"import_{kind}")
+        for obj, error in importer([obj for obj in objects if id(obj) not in errors]):
+            errors[id(obj)] = str(error)
+
+        for line_no, obj in entries:
+            if id(obj) in errors:
+                self.rejects.append((kind, line_no, errors[id(obj)]))
+        return len(objects) - len(errors)
+
+    def load(self, kind, path, pool=None, chunk_size=CHUNK_SIZE):
+        """
+        Load one file.
+
+        Args:
+            kind (str): One of KINDS.
+            path (str): The CSV or NDJSON file.
+            pool (Pool, optional): Worker processes for parsing and validation; None parses inline.
+            chunk_size (int, optional): Number of records per chunk.
+        """
+        start = time.perf_counter()
+        loaded = rejected = 0
+        tasks = read_chunks(kind, path, chunk_size)
+        # imap keeps the chunks in file order while the workers run ahead
+        for entries, rejects in (pool.imap(build_chunk, tasks) if pool else map(build_chunk, tasks)):
+            self.rejects.extend((kind, line_no, error) for line_no, error in rejects)
+            added = self.write(kind, entries)
+            loaded += added
+            rejected += len(rejects) + len(entries) - added
+        self.stats[kind] = {'loaded': loaded, 'rejected': rejected, 'seconds': time.perf_counter() - start}
+
+    def report(self, out=sys.stdout):
+        """
+        Print the throughput and reject counts of every file loaded.
+        """
+        total = total_seconds = 0
+        for kind, stats in self.stats.items():
+            rate = stats['loaded'] / stats['seconds'] if stats['seconds'] else 0
+            print(f"{kind:<10} {stats['loaded']:>10} loaded {stats['rejected']:>8} rejected "
+                  f"{stats['seconds']:>8.2f}s {rate:>12,.0f} records/s", file=out)
+            total += stats['loaded']
+            total_seconds += stats['seconds']
+        if total_seconds:
+            print(f"{'total':<10} {total:>10} loaded in {total_seconds:.2f}s "
+                  f"({total / total_seconds * 60:,.0f} records/min)", file=out)
+
+
+def main(argv=None):
+    """
+    Run the loader from the command line.
+
+    Returns:
+        int: The exit status; 1 if any record was rejected.
+    """
+    parser = argparse.ArgumentParser(prog='python -m app.tools.load', description=__doc__.strip().splitlines()[0])
+    for kind in KINDS:
+        parser.add_argument(f'--{kind}', metavar='FILE', help=f'CSV or NDJSON file of {kind}')
+    parser.add_argument('--workers', type=int, default=cpu_count(),
+                        help='Worker processes for parsing and validation; 0 parses inline')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Records per chunk')
+    parser.add_argument('--rejects', metavar='FILE', help='Write the rejected records as NDJSON')
+    parser.add_argument('--serve', action='store_true', help='Serve the API with the loaded data')
+    args = parser.parse_args(argv)
+    if not any(getattr(args, kind) for kind in KINDS):
+        parser.error('give at least one of ' + ', '.join(f'--{kind}' for kind in KINDS))
+
+    from app.services.facade import get_facade
+    loader = Loader(get_facade())
+    pool = Pool(args.workers) if args.workers > 0 else None
+    try:
+        for kind in KINDS:
+            if getattr(args, kind):
+                loader.load(kind, getattr(args, kind), pool, args.chunk_size)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    loader.report()
+    if args.rejects:
+        with open(args.rejects, 'w', encoding='utf-8') as f:
+            for kind, line_no, error in loader.rejects:
+                f.write(json.dumps({'kind': kind, 'line': line_no, 'error': error}) + '\n')
+    else:
+        for kind, line_no, error in loader.rejects[:20]:
+            print(f"{kind} line {line_no}: {error}", file=sys.stderr)
+
+    if args.serve:
+        from app import create_app
+        create_app().run()
+    return 1 if loader.rejects else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
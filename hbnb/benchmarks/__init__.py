@@ -0,0 +1,75 @@
+"""
+Micro-benchmarks for the performance-sensitive parts of the application.
+
+Each module is a script printing its measurements, run from the project root:
+
+    python -m benchmarks.startup --help
+
+Sizes default to values that run in seconds; the options take the sizes quoted in
+the module docstrings for full runs. Everything runs in-process against the
+in-memory repositories, except the HTTP benchmarks, which need Flask.
+"""
+import time
+
+
+def best_of(func, repeat=5, number=1):
+    """
+    Time a callable, keeping the best of several runs to filter out noise.
+
+    Args:
+        func (callable): Takes no argument.
+        repeat (int, optional): Number of runs. Defaults to 5.
+        number (int, optional): Calls per run. Defaults to 1.
+
+    Returns:
+        float: The best run's time per call, in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def report(title, columns, rows):
+    """
+    Print a table of results.
+
+    Args:
+        title (str): Printed above the table.
+        columns (list): Column headers.
+        rows (list): One sequence of values per row; floats are printed with 4 significant digits.
+    """
+    cells = [[f"{value:.4g}" if isinstance(value, float) else str(value) for value in row] for row in rows]
+    widths = [max(len(str(column)), *(len(row[i]) for row in cells)) for i, column in enumerate(columns)]
+    print(title)
+    print('  '.join(str(column).rjust(width) for column, width in zip(columns, widths)))
+    for row in cells:
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+    print()
+
+
+def http_client(**config):
+    """
+    Create the application with configuration overrides and return a test client.
+
+    Requests go through the whole Flask stack, hooks included, without a network.
+    Request coalescing is off unless overridden, so every request does its own work,
+    and so is rate limiting, which would reject most of a benchmark's requests.
+
+    Args:
+        **config: app.config values to override.
+
+    Returns:
+        FlaskClient: The test client.
+    """
+    from app import create_app
+    from config import config as configs
+
+    # The hooks read their settings when the application is created, so the
+    # overrides go into the configuration class rather than into app.config
+    overrides = {'TESTING': True, 'COALESCING_ENABLED': False, 'RATE_LIMIT_ENABLED': False, **config}
+    configs['benchmark'] = type('BenchmarkConfig', (configs['production'],), overrides)
+    return create_app('benchmark').test_client()
@@ -0,0 +1,71 @@
+"""
+Amenity filter benchmark: bitmap AND/OR filters against a scan (user-045).
+
+    python -m benchmarks.amenities --places 1000000 --amenities 200
+
+Gives every place a few amenities, popular ones (wifi) far more often than rare
+ones (sauna), records them in an AmenityCatalog, then times "all of" and "any of"
+filters as posting bitmap intersections and unions, decoded into place IDs. For
+comparison it times the same filters as a scan of every place's amenity list,
+which is what answering them from Place.amenities costs.
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from itertools import accumulate
+from benchmarks import best_of, report
+from app.persistence.catalog import AmenityCatalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.amenities', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--places', type=int, default=100000)
+    parser.add_argument('--amenities', type=int, default=200)
+    parser.add_argument('--per-place', type=int, default=10, help='Amenities drawn per place')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    amenity_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(args.amenities)]
+    # Zipf-like popularity: the n-th amenity is drawn n times less often than the first
+    weights = list(accumulate(1 / (n + 1) for n in range(args.amenities)))
+    places = [(str(uuid.UUID(int=rng.getrandbits(128))),
+               list(set(rng.choices(amenity_ids, cum_weights=weights, k=args.per_place))))
+              for _ in range(args.places)]
+
+    catalog = AmenityCatalog()
+    for amenity_id in amenity_ids:
+        catalog.register(amenity_id)
+    start = time.perf_counter()
+    catalog.set_places(places)
+    build_seconds = time.perf_counter() - start
+
+    filters = [
+        ('all of 2 popular', amenity_ids[:2], ()),
+        ('all of 3 mixed', [amenity_ids[0], amenity_ids[5], amenity_ids[50]], ()),
+        ('all of 2 rare', amenity_ids[-2:], ()),
+        ('any of 3 rare', (), amenity_ids[-3:]),
+        ('popular and any of 3', amenity_ids[:1], amenity_ids[10:13]),
+    ]
+    rows = []
+    for name, all_of, any_of in filters:
+        def bitmaps():
+            return catalog.place_ids(catalog.select(all_of, any_of))
+
+        def scan():
+            required = set(all_of)
+            wanted = set(any_of)
+            return [place_id for place_id, amenities in places
+                    if required.issubset(amenities) and (not wanted or not wanted.isdisjoint(amenities))]
+
+        matches = bitmaps()
+        assert sorted(matches) == sorted(scan())
+        rows.append((name, len(matches), best_of(bitmaps) * 1000, best_of(scan, repeat=3) * 1000))
+    report(f"{args.places} places, {args.amenities} amenities (postings built in {build_seconds:.2f} s)",
+           ['filter', 'places', 'bitmap ms', 'scan ms'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Batch lookup benchmark: GET ?ids= against N single requests (user-035).
+
+    python -m benchmarks.batch_lookup --counts 10 50 100
+
+Fetches the same users with one GET /api/v1/users/?ids=... and with one
+GET /api/v1/users/<id> per user, through the Flask test client.
+"""
+import argparse
+import sys
+from benchmarks import best_of, http_client, report
+from app.services.facade import get_facade
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.batch_lookup', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 50, 100], help='Users per page')
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    users = [facade.create_user({'first_name': 'Ada', 'last_name': f"Lovelace {i}",
+                                 'email': f"user{i}@example.com", 'password': 'secret'})
+             for i in range(max(args.counts))]
+    client = http_client(COMPRESSION_ENABLED=False)
+
+    rows = []
+    for count in args.counts:
+        ids = [user.id for user in users[:count]]
+
+        def batched():
+            response = client.get(f"/api/v1/users/?ids={','.join(ids)}")
+            assert response.status_code == 200 and len(response.get_json()['items']) == count
+
+        def singles():
+            for user_id in ids:
+                assert client.get(f"/api/v1/users/{user_id}").status_code == 200
+
+        batch_seconds = best_of(batched, number=10)
+        single_seconds = best_of(singles, repeat=3)
+        rows.append((count, batch_seconds * 1000, single_seconds * 1000, single_seconds / batch_seconds))
+    report('Fetching a page of users', ['users', 'batch ms', 'singles ms', 'speed-up'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Batch endpoint benchmark: POST /api/v1/batch against sequential calls (user-036).
+
+    python -m benchmarks.batch_requests --reads 10
+
+Times two workloads through the Flask test client, once as separate requests
+and once as a single batch:
+    - the mobile flow: create a place, attach an amenity, post a review, each
+      operation referencing the place created by the first one;
+    - independent reads of several places, which the batch runs in parallel.
+"""
+import argparse
+import sys
+from benchmarks import best_of, http_client, report
+from app.services.facade import get_facade
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.batch_requests', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reads', type=int, default=10, help='Places read by the read workload (at most 20)')
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                'email': 'owner@example.com', 'password': 'secret'})
+    guest = facade.create_user({'first_name': 'Alan', 'last_name': 'Turing',
+                                'email': 'guest@example.com', 'password': 'secret'})
+    wifi = facade.create_amenity({'name': 'Wifi', 'description': ''})
+    place_body = {'title': 'Cottage', 'description': '', 'price': 100.0, 'latitude': 48.0,
+                  'longitude': 2.0, 'owner_id': owner.id}
+    place_ids = [facade.create_place(dict(place_body)).id for _ in range(args.reads)]
+    client = http_client(COMPRESSION_ENABLED=False)
+
+    def sequential_flow():
+        place_id = client.post('/api/v1/places/', json=place_body).get_json()['id']
+        client.put(f"/api/v1/places/{place_id}", json={'amenities': [wifi.id]})
+        client.post('/api/v1/reviews/', json={'text': 'Great', 'rating': 5, 'place_id': place_id,
+                                              'user_id': guest.id})
+
+    def batched_flow():
+        client.post('/api/v1/batch/', json={'operations': [
+            {'method': 'POST', 'path': '/api/v1/places/', 'body': place_body, 'name': 'place'},
+            {'method': 'PUT', 'path': '/api/v1/places/${place.id}', 'body': {'amenities': [wifi.id]}},
+            {'method': 'POST', 'path': '/api/v1/reviews/',
+             'body': {'text': 'Great', 'rating': 5, 'place_id': '${place.id}', 'user_id': guest.id}}
+        ]})
+
+    def sequential_reads():
+        for place_id in place_ids:
+            client.get(f"/api/v1/places/{place_id}")
+
+    def batched_reads():
+        client.post('/api/v1/batch/', json={'operations': [
+            {'method': 'GET', 'path': f"/api/v1/places/{place_id}"} for place_id in place_ids
+        ]})
+
+    rows = []
+    for name, sequential, batched in (('create/attach/review', sequential_flow, batched_flow),
+                                      (f"{args.reads} place reads", sequential_reads, batched_reads)):
+        sequential_seconds = best_of(sequential, number=20)
+        batch_seconds = best_of(batched, number=20)
+        rows.append((name, sequential_seconds * 1000, batch_seconds * 1000,
+                     sequential_seconds / batch_seconds))
+    report('Latency per workload', ['workload', 'sequential ms', 'batch ms', 'speed-up'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Booking calendar benchmark: reservation and overlap checks at 1M bookings (user-042).
+
+    python -m benchmarks.bookings --places 10000 --bookings 1000000
+
+Fills the booking calendar with back-to-back stays spread over the places, then
+times an availability check, a rejected overlapping reservation, and an
+availability search through the facade. For comparison it times the overlap
+check as a scan of the bookings, which is what answering it from the booking
+repository alone costs. The calendar checks should take about the same time
+whatever the number of bookings.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from benchmarks import best_of, report
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.repository import ConflictError
+from app.services.facade import get_facade
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bookings', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--places', type=int, default=1000)
+    parser.add_argument('--bookings', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    facade = get_facade()
+    owner = User('Ada', 'Lovelace', 'owner@example.com', 'secret')
+    facade.import_users([owner])
+    places = [Place(f"Place {i}", '', rng.randint(20, 500), 0.0, 0.0, owner.id) for i in range(args.places)]
+    facade.import_places(places)
+
+    # Stays of 1 to 7 nights separated by 0 to 3 free nights, so none overlap
+    first_day = date(2026, 1, 1)
+    stays = []
+    cursors = {place.id: first_day for place in places}
+    for i in range(args.bookings):
+        place_id = places[i % args.places].id
+        check_in = cursors[place_id] + timedelta(days=rng.randint(0, 3))
+        check_out = check_in + timedelta(days=rng.randint(1, 7))
+        cursors[place_id] = check_out
+        stays.append((place_id, f"booking-{i}", check_in, check_out))
+
+    calendar = facade.booking_calendar
+    start = time.perf_counter()
+    for stay in stays:
+        calendar.reserve(*stay)
+    reserve_seconds = (time.perf_counter() - start) / len(stays)
+
+    queries = []
+    for _ in range(1000):
+        place_id, _, check_in, check_out = rng.choice(stays)
+        day = check_in + timedelta(days=rng.randint(-3, 3))
+        queries.append((place_id, day, day + timedelta(days=2)))
+
+    def check():
+        for query in queries:
+            calendar.is_free(*query)
+
+    def conflict():
+        # Reserving a booked stay again: found by the overlap check, nothing is written
+        for place_id, _, check_in, check_out in stays[:1000]:
+            try:
+                calendar.reserve(place_id, 'conflict', check_in, check_out)
+            except ConflictError:
+                pass
+
+    def scan():
+        place_id, check_in, check_out = queries[0]
+        return not any(stay[0] == place_id and stay[2] < check_out and stay[3] > check_in for stay in stays)
+
+    assert scan() == calendar.is_free(*queries[0])
+    middle = first_day + (max(cursors.values()) - first_day) / 2
+
+    def search():
+        return facade.search_available_places(middle, middle + timedelta(days=3), 100, 200, limit=20)
+
+    rows = [
+        ('reserve (fill)', reserve_seconds * 1e6),
+        ('is_free', best_of(check) / len(queries) * 1e6),
+        ('reserve (conflict)', best_of(conflict) / 1000 * 1e6),
+        ('scan of the bookings', best_of(scan, repeat=3) * 1e6),
+        ('search_available_places, 20 results', best_of(search, number=10) * 1e6),
+    ]
+    report(f"{args.bookings} bookings over {args.places} places", ['operation', 'us'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Bulk import benchmark: loader throughput against the 1M records/minute target (user-039).
+
+    python -m benchmarks.bulk_load --places 200000 --reviews 1000000 --workers 8
+
+Writes a synthetic NDJSON dataset to a temporary directory, then loads it with
+app.tools.load as `python -m app.tools.load` would. The script exits with
+status 1 when the overall rate is below --target records per minute.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from multiprocessing import Pool, cpu_count
+from app.services.facade import get_facade
+from app.tools.load import CHUNK_SIZE, KINDS, Loader
+
+
+def _write(directory, kind, records):
+    path = os.path.join(directory, f"{kind}.ndjson")
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return path
+
+
+def _dataset(directory, counts, seed=0):
+    """
+    Write users, amenities, places and reviews referencing each other by ID.
+
+    Returns:
+        dict: Kind mapped to the path of its file.
+    """
+    rng = random.Random(seed)
+    ids = {kind: [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(counts[kind])] for kind in KINDS}
+    return {
+        'users': _write(directory, 'users', (
+            {'id': user_id, 'first_name': 'Ada', 'last_name': f"Lovelace {i}",
+             'email': f"user{i}@example.com", 'password': 'secret'}
+            for i, user_id in enumerate(ids['users']))),
+        'amenities': _write(directory, 'amenities', (
+            {'id': amenity_id, 'name': f"Amenity {i}", 'description': ''}
+            for i, amenity_id in enumerate(ids['amenities']))),
+        'places': _write(directory, 'places', (
+            {'id': place_id, 'title': f"Place {i}", 'description': 'Quiet', 'price': rng.randint(20, 500),
+             'latitude': rng.uniform(-60, 60), 'longitude': rng.uniform(-180, 180),
+             'owner_id': rng.choice(ids['users']),
+             'amenities': rng.sample(ids['amenities'], min(5, len(ids['amenities'])))}
+            for i, place_id in enumerate(ids['places']))),
+        'reviews': _write(directory, 'reviews', (
+            {'id': review_id, 'text': 'Great stay', 'rating': rng.randint(1, 5),
+             'place_id': rng.choice(ids['places']), 'user_id': rng.choice(ids['users'])}
+            for review_id in ids['reviews'])),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bulk_load', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--amenities', type=int, default=200)
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='Worker processes; 0 parses inline')
+    parser.add_argument('--target', type=float, default=1000000, help='Records per minute to reach')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _dataset(directory, {kind: getattr(args, kind) for kind in KINDS})
+        loader = Loader(get_facade())
+        pool = Pool(args.workers) if args.workers > 0 else None
+        try:
+            for kind in KINDS:
+                loader.load(kind, paths[kind], pool, CHUNK_SIZE)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+    loader.report()
+    loaded = sum(stats['loaded'] for stats in loader.stats.values())
+    per_minute = loaded / sum(stats['seconds'] for stats in loader.stats.values()) * 60
+    if loader.rejects or per_minute < args.target:
+        print(f"FAIL: {len(loader.rejects)} rejects, {per_minute:,.0f} records/min for a target of {args.target:,.0f}")
+        return 1
+    print(f"OK: {per_minute:,.0f} records/min")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Request coalescing benchmark: backend work against concurrent identical reads (user-050).
+
+    python -m benchmarks.coalescing --concurrency 1 10 100 500
+
+Releases bursts of threads at once, all reading the same place as
+GET /api/v1/places/<id> does (get_place with its owner, amenities and reviews),
+once through HBnBFacade.coalesce() and once directly. Each read first waits
+--latency seconds, standing for the round trip to a remote repository, so that
+the reads of a burst overlap as they do under a real server. Coalesced, a burst
+should run one read whatever its size; directly, it runs one per thread.
+"""
+import argparse
+import sys
+import threading
+import time
+from benchmarks import report
+from app.services.facade import get_facade
+
+
+def _burst(threads, read):
+    """
+    Run read() in `threads` threads released together.
+
+    Returns:
+        float: Seconds until the last thread finished.
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def run():
+        barrier.wait()
+        read()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.coalescing', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50, 200], help='Threads per burst')
+    parser.add_argument('--latency', type=float, default=0.005, help='Seconds of backend latency per read')
+    parser.add_argument('--reviews', type=int, default=20, help='Reviews of the place read')
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                'email': 'owner@example.com', 'password': 'secret'})
+    guest = facade.create_user({'first_name': 'Alan', 'last_name': 'Turing',
+                                'email': 'guest@example.com', 'password': 'secret'})
+    amenities = [facade.create_amenity({'name': f"Amenity {i}", 'description': ''}).id for i in range(5)]
+    place = facade.create_place({'title': 'Cottage', 'description': '', 'price': 100.0, 'latitude': 48.0,
+                                 'longitude': 2.0, 'owner_id': owner.id, 'amenities': amenities})
+    for _ in range(args.reviews):
+        facade.create_review({'text': 'Great stay', 'rating': 5, 'place_id': place.id, 'user_id': guest.id})
+
+    reads = [0]
+    lock = threading.Lock()
+
+    def backend_read():
+        with lock:
+            reads[0] += 1
+        time.sleep(args.latency)
+        return facade.get_place(place.id)
+
+    rows = []
+    for threads in args.concurrency:
+        row = [threads]
+        for read in (lambda: facade.coalesce(('place', place.id), backend_read), backend_read):
+            reads[0] = 0
+            seconds = _burst(threads, read)
+            row += [reads[0], seconds * 1000]
+        rows.append(row)
+    report(f"Bursts of identical reads, {args.latency * 1000:g} ms backend latency",
+           ['threads', 'coalesced reads', 'coalesced ms', 'direct reads', 'direct ms'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Columnar storage benchmark: filters and aggregates against InMemoryRepository (user-031).
+
+    python -m benchmarks.columnar --rows 10000000
+
+Both repositories hold the same places. InMemoryRepository answers each query
+with a scan over the objects, which is what the facade would do without the
+columns; ColumnarRepository answers it from its float columns (vectorized when
+NumPy is installed).
+"""
+import argparse
+import random
+import statistics
+import sys
+import uuid
+from benchmarks import best_of, report
+from app.models.place import Place
+from app.persistence.columnar import ColumnarRepository, np
+from app.persistence.repository import InMemoryRepository
+
+
+def _places(rows, seed=0):
+    rng = random.Random(seed)
+    owner_id = str(uuid.uuid4())
+    for i in range(rows):
+        yield Place(f"Place {i}", '', rng.uniform(20, 500), rng.uniform(-60, 60),
+                    rng.uniform(-180, 180), owner_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.columnar', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help='Number of places')
+    args = parser.parse_args(argv)
+
+    objects = InMemoryRepository()
+    columns = ColumnarRepository(('price', 'latitude', 'longitude'))
+    for place in _places(args.rows):
+        objects.add(place)
+        columns.add(place)
+
+    def scan(predicate):
+        return lambda: [place for place in objects.get_all() if predicate(place)]
+
+    price = (100, 120)
+    box = {'latitude': (40.0, 50.0), 'longitude': (-10.0, 10.0)}
+    queries = [
+        ('price range', scan(lambda p: price[0] <= p.price <= price[1]),
+         lambda: columns.filter(price=price)),
+        ('geo box', scan(lambda p: 40.0 <= p.latitude <= 50.0 and -10.0 <= p.longitude <= 10.0),
+         lambda: columns.filter(**box)),
+        ('mean price in box',
+         lambda: statistics.fmean(p.price for p in objects.get_all()
+                                  if 40.0 <= p.latitude <= 50.0 and -10.0 <= p.longitude <= 10.0),
+         lambda: columns.aggregate('price', 'mean', **box)),
+        ('max price', lambda: max(p.price for p in objects.get_all()),
+         lambda: columns.aggregate('price', 'max')),
+    ]
+    rows = []
+    for name, baseline, columnar in queries:
+        scan_seconds = best_of(baseline, repeat=3)
+        column_seconds = best_of(columnar, repeat=3)
+        rows.append((name, scan_seconds * 1000, column_seconds * 1000, scan_seconds / column_seconds))
+    report(f"{args.rows} places, NumPy {'on' if np is not None else 'off'}",
+           ['query', 'objects ms', 'columns ms', 'speed-up'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
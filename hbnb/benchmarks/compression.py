@@ -0,0 +1,65 @@
+"""
+Compression benchmark: CPU cost against bytes saved at various payload sizes (user-034).
+
+    python -m benchmarks.compression --sizes 1000 10000 100000 1000000 --levels 1 6 9
+
+Compresses JSON place listings of growing size with Compressor.compress() for
+each encoding and level, and compares with serving the body from the
+compressed-body cache.
+"""
+import argparse
+import json
+import random
+import sys
+import uuid
+from benchmarks import best_of, report
+from app.persistence.cache import LRUCache
+
+
+def _listing(size, seed=0):
+    """
+    Return a JSON place listing of about `size` bytes, as GET /api/v1/places/ returns.
+    """
+    rng = random.Random(seed)
+    places = []
+    body = b'[]'
+    while len(body) < size:
+        places.extend({'id': str(uuid.UUID(int=rng.getrandbits(128))), 'title': f"Place {len(places) + i}",
+                       'latitude': round(rng.uniform(-60, 60), 6), 'longitude': round(rng.uniform(-180, 180), 6)}
+                      for i in range(max(1, (size - len(body)) // 120)))
+        body = json.dumps(places).encode()
+    return body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compression', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                        help='Approximate body sizes in bytes')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 6, 9], help='Compression levels')
+    args = parser.parse_args(argv)
+
+    from app.api.compression import Compressor, brotli
+
+    compressor = Compressor()
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    rows = []
+    for size in args.sizes:
+        body = _listing(size)
+        for encoding in encodings:
+            for level in args.levels:
+                compressor.level = level
+                compressed = compressor.compress(body, encoding)
+                seconds = best_of(lambda: compressor.compress(body, encoding), number=max(1, 100000 // size))
+                rows.append((len(body), encoding, level, len(compressed), 1 - len(compressed) / len(body),
+                             seconds * 1e6, len(body) / seconds / 1e6))
+    report('Compressor.compress()', ['bytes', 'encoding', 'level', 'compressed', 'saved', 'us', 'MB/s'], rows)
+
+    cache = LRUCache(512)
+    cache.set(('/api/v1/places/', '"etag"', 'gzip'), b'body')
+    seconds = best_of(lambda: cache.get(('/api/v1/places/', '"etag"', 'gzip')), number=100000)
+    report('Compressed-body cache', ['operation', 'us'], [('hit', seconds * 1e6)])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Host dashboard benchmark: serve time against portfolio size (user-047).
+
+    python -m benchmarks.dashboard --sizes 1 10 100 1000 10000
+
+For hosts owning from one to thousands of places, each with a few reviews,
+times get_user_dashboard() once its view is in memory, which should not depend
+on the portfolio size, the first read that builds the view, and a review
+posted on one of the places, which updates the view incrementally. For
+comparison it times the aggregation the dashboard replaces: listing every
+place, then reading the reviews of each of the host's places.
+"""
+import argparse
+import random
+import sys
+import time
+from benchmarks import best_of, report
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services.facade import get_facade
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.dashboard', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000], help='Places per host')
+    parser.add_argument('--reviews', type=int, default=5, help='Reviews per place')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    facade = get_facade()
+    guest = User('Alan', 'Turing', 'guest@example.com', 'secret')
+    hosts = [User('Ada', 'Lovelace', f"host{size}@example.com", 'secret') for size in args.sizes]
+    facade.import_users([guest, *hosts])
+    for host, size in zip(hosts, args.sizes):
+        places = [Place(f"Place {i}", '', rng.randint(20, 500), 0.0, 0.0, host.id) for i in range(size)]
+        facade.import_places(places)
+        facade.import_reviews([Review('Great stay', rng.randint(1, 5), place.id, guest.id)
+                               for place in places for _ in range(args.reviews)])
+
+    rows = []
+    for host, size in zip(hosts, args.sizes):
+        start = time.perf_counter()
+        dashboard = facade.get_user_dashboard(host.id)
+        build_seconds = time.perf_counter() - start
+        assert dashboard['place_count'] == size
+
+        def serve():
+            return facade.get_user_dashboard(host.id)
+
+        place_id = dashboard['places'][0]['id']
+
+        def review():
+            facade.create_review({'text': 'Lovely', 'rating': 4, 'place_id': place_id, 'user_id': guest.id})
+
+        def aggregate():
+            places = [place for place in facade.get_all_places() if place['owner_id'] == host.id]
+            totals = []
+            for place in places:
+                ratings = [review.rating for review in facade.get_reviews_for_place(place['id'])]
+                totals.append((place['id'], len(ratings), sum(ratings) / len(ratings) if ratings else 0.0))
+            return totals
+
+        rows.append((size, best_of(serve, number=1000) * 1e6, build_seconds * 1e6,
+                     best_of(review, number=20) * 1e6, best_of(aggregate, repeat=3) * 1e6))
+    report('get_user_dashboard()', ['places', 'served us', 'built us', 'review us', 'aggregate us'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Unique email index benchmark: lookup time against the number of users (user-038).
+
+    python -m benchmarks.email_lookup --sizes 10000 100000 1000000
+
+Looks users up by email, in a different case than they registered with, through
+the normalized unique index of the user repository. The indexed lookup should
+take the same time at every size. For comparison it also times the full scan
+that a repository without the index does.
+"""
+import argparse
+import sys
+from benchmarks import best_of, report
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.email_lookup', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Numbers of users')
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        indexed = InMemoryRepository(unique={'email': User.normalize_email})
+        plain = InMemoryRepository()
+        users = [User('Ada', 'Lovelace', f"user{i}@example.com", 'secret') for i in range(size)]
+        indexed.add_many(users)
+        plain.add_many(users)
+        # The last user registered, so the scan goes through every user
+        wanted = users[-1].email.upper()
+
+        index_seconds = best_of(lambda: indexed.get_by_attribute('email', wanted), number=10000)
+        scan_seconds = best_of(lambda: plain.get_by_attribute('email', users[-1].email), repeat=3)
+        assert indexed.get_by_attribute('email', wanted) is users[-1]
+        rows.append((size, index_seconds * 1e6, scan_seconds * 1e6))
+    report('get_by_attribute(\'email\', ...)', ['users', 'index us', 'scan us'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Ordered index benchmark: sorted range queries at growing collection sizes (user-032).
+
+    python -m benchmarks.indexes --sizes 10000 100000 1000000
+
+For each size, a page of the cheapest places within a price range is read from
+the price index, as get_places_sorted() does, and by sorting the whole
+repository, as the listing did before. The index latency should stay flat as
+the collection grows; the sort grows linearly.
+"""
+import argparse
+import random
+import sys
+import uuid
+from benchmarks import best_of, report
+from app.models.place import Place
+from app.persistence.index import SortedIndex
+from app.persistence.repository import InMemoryRepository
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.indexes', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Numbers of places')
+    parser.add_argument('--page', type=int, default=20, help='Places per page')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    owner_id = str(uuid.uuid4())
+    rows = []
+    for size in args.sizes:
+        repo = InMemoryRepository()
+        prices = SortedIndex()
+        for i in range(size):
+            place = Place(f"Place {i}", '', rng.uniform(20, 500), 0.0, 0.0, owner_id)
+            repo.add(place)
+            prices.set(place.id, place.price)
+
+        def indexed():
+            return repo.get_many(prices.range(100, 200, limit=args.page))
+
+        def sorted_scan():
+            matching = [place for place in repo.get_all() if 100 <= place.price <= 200]
+            return sorted(matching, key=lambda place: (place.price, place.id))[:args.page]
+
+        assert [place.id for place in indexed()] == [place.id for place in sorted_scan()]
+        rows.append((size, best_of(indexed, number=100) * 1e6, best_of(sorted_scan, repeat=3) * 1e6))
+    report(f"Cheapest {args.page} places priced 100-200", ['places', 'index us', 'sort us'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+String interning benchmark: memory held by a synthetic dataset (user-049).
+
+    python -m benchmarks.interning --users 100000 --places 200000 --reviews 1000000
+
+Builds users, amenities, places and reviews from NDJSON lines with the bulk
+loader's record builders and imports them through the facade, as
+`python -m app.tools.load` does. Every line is parsed on its own, so each record
+arrives with its own copies of the names, descriptions and referenced IDs, which
+repeat heavily across the dataset.
+
+It then walks the interned attributes of every loaded object and compares the
+bytes held by the distinct string objects they reference with the bytes they
+would hold with one copy per reference, as they would without interning.
+"""
+import argparse
+import json
+import random
+import sys
+import uuid
+from benchmarks import report
+from app.models.interning import pool_size
+from app.services.facade import get_facade
+from app.tools.load import BUILDERS, KINDS
+
+FIRST_NAMES = ['Ada', 'Alan', 'Grace', 'Edsger', 'Barbara', 'Donald', 'Frances', 'John', 'Margaret', 'Ken']
+LAST_NAMES = ['Lovelace', 'Turing', 'Hopper', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'McCarthy', 'Hamilton']
+DESCRIPTIONS = ['Quiet flat close to the city centre, ideal for a weekend.',
+                'Spacious family house with a garden and free parking.',
+                'Cosy studio near the beach. Check-in from 3pm, check-out before 11am.',
+                'Renovated loft in a lively neighbourhood, bars and restaurants nearby.',
+                '']
+
+
+def _lines(counts, rng):
+    """
+    Yield (kind, NDJSON line) pairs, users first, then amenities, places and reviews.
+    """
+    ids = {kind: [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(counts[kind])] for kind in KINDS}
+    for i, user_id in enumerate(ids['users']):
+        yield 'users', json.dumps({'id': user_id, 'first_name': rng.choice(FIRST_NAMES),
+                                   'last_name': rng.choice(LAST_NAMES), 'email': f"user{i}@example.com",
+                                   'password': 'secret'})
+    for i, amenity_id in enumerate(ids['amenities']):
+        yield 'amenities', json.dumps({'id': amenity_id, 'name': f"Amenity {i}",
+                                       'description': rng.choice(DESCRIPTIONS)})
+    for i, place_id in enumerate(ids['places']):
+        yield 'places', json.dumps({'id': place_id, 'title': f"{rng.choice(('Flat', 'House', 'Studio', 'Loft'))} "
+                                                              f"in {rng.choice(LAST_NAMES)}ville",
+                                    'description': rng.choice(DESCRIPTIONS), 'price': rng.randint(20, 500),
+                                    'latitude': rng.uniform(-60, 60), 'longitude': rng.uniform(-180, 180),
+                                    'owner_id': rng.choice(ids['users']),
+                                    'amenities': rng.sample(ids['amenities'], min(5, counts['amenities']))})
+    for review_id in ids['reviews']:
+        yield 'reviews', json.dumps({'id': review_id, 'text': 'Great stay', 'rating': rng.randint(1, 5),
+                                     'place_id': rng.choice(ids['places']), 'user_id': rng.choice(ids['users'])})
+
+
+def _strings(objs):
+    """
+    Size the strings referenced by the interned attributes of objects.
+
+    Returns:
+        tuple: (references, bytes with one copy per reference, bytes of the distinct objects).
+    """
+    references = 0
+    copies = 0
+    distinct = {}
+    for obj in objs:
+        for name in type(obj).INTERNED:
+            value = getattr(obj, name, None)
+            for item in value if type(value) is list else (value,):
+                if type(item) is str:
+                    size = sys.getsizeof(item)
+                    references += 1
+                    copies += size
+                    distinct[id(item)] = size
+    return references, copies, sum(distinct.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.interning', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--amenities', type=int, default=200)
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    counts = {kind: getattr(args, kind) for kind in KINDS}
+    batches = {kind: [] for kind in KINDS}
+    for kind, line in _lines(counts, random.Random(0)):
+        batches[kind].append(BUILDERS[kind](json.loads(line)))
+        # Imported in dependency order, a kind once all of its records are built
+        if len(batches[kind]) == counts[kind]:
+            getattr(facade, f"import_{kind}")(batches.pop(kind))
+
+    repositories = {'users': facade.user_repo, 'amenities': facade.amenity_repo,
+                    'places': facade.place_repo, 'reviews': facade.review_repo}
+    rows = []
+    for kind in KINDS:
+        rows.append((kind, *_strings(repositories[kind].get_all())))
+    # IDs are shared between kinds, so the whole dataset is sized on its own
+    rows.append(('all', *_strings(obj for repository in repositories.values() for obj in repository.get_all())))
+    rows = [(kind, references, copies / 2**20, distinct / 2**20, (1 - distinct / copies) * 100)
+            for kind, references, copies, distinct in rows]
+    report(f"Interned attributes ({pool_size()} strings in the pool)",
+           ['kind', 'references', 'one copy each MiB', 'interned MiB', 'saved %'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Sparse fieldset and embed benchmark: payload size and latency of a place (user-033).
+
+    python -m benchmarks.payloads --reviews 10000
+
+Builds GET /api/v1/places/<id> representations through HBnBFacade.get_place()
+for a place with many reviews, with every relation embedded and with narrower
+fields/embed/reviews_limit choices. Each call runs in a fresh unit of work, as
+a request does, so no entity is served from a previous call.
+"""
+import argparse
+import json
+import sys
+from benchmarks import best_of, report
+from app.models.review import Review
+from app.services import identity
+from app.services.facade import get_facade
+
+VARIANTS = (
+    ('embed=owner,amenities,reviews', {}),
+    ('reviews_limit=10', {'reviews_limit': 10}),
+    ('embed=owner,amenities', {'embed': ('owner', 'amenities')}),
+    ('embed=', {'embed': ()}),
+    ('fields=title&embed=', {'fields': ('title',), 'embed': ()}),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.payloads', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reviews', type=int, default=2000, help='Reviews of the place')
+    parser.add_argument('--amenities', type=int, default=20, help='Amenities of the place')
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                'email': 'owner@example.com', 'password': 'secret'})
+    amenities = [facade.create_amenity({'name': f"Amenity {i}", 'description': 'Included'})
+                 for i in range(args.amenities)]
+    place = facade.create_place({'title': 'Cottage', 'description': 'Quiet and bright', 'price': 120.0,
+                                 'latitude': 48.0, 'longitude': 2.0, 'owner_id': owner.id,
+                                 'amenities': [amenity.id for amenity in amenities]})
+    facade.import_reviews([Review(f"Review {i}", 1 + i % 5, place.id, owner.id) for i in range(args.reviews)])
+
+    def request(options):
+        token = identity.begin()
+        try:
+            return facade.get_place(place.id, **options)
+        finally:
+            identity.end(token)
+
+    rows = []
+    for name, options in VARIANTS:
+        size = len(json.dumps(request(options), default=str))
+        rows.append((name, size, best_of(lambda: request(options), number=20) * 1e6))
+    report(f"Place with {args.reviews} reviews and {args.amenities} amenities",
+           ['query', 'bytes', 'us/request'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Profiler overhead benchmark: request latency with profiling off and on (user-043).
+
+    python -m benchmarks.profiling --requests 2000
+
+Times GET /api/v1/places/<id> through the Flask test client on applications
+that differ only in their profiling configuration:
+    - disabled, the production default: no hook is installed, so the latency is
+      the baseline the others are compared with and the overhead must be near zero;
+    - enabled with a sample rate of 0: the hooks run but profile nothing;
+    - enabled at the configured sample rate, and with every request profiled.
+"""
+import argparse
+import sys
+from benchmarks import best_of, http_client, report
+from app.services.facade import get_facade
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.profiling', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per timed run')
+    parser.add_argument('--sample-rate', type=float, default=0.01, help='Sample rate of the sampled run')
+    args = parser.parse_args(argv)
+
+    facade = get_facade()
+    owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                'email': 'owner@example.com', 'password': 'secret'})
+    place = facade.create_place({'title': 'Cottage', 'description': '', 'price': 100.0, 'latitude': 48.0,
+                                 'longitude': 2.0, 'owner_id': owner.id})
+    url = f"/api/v1/places/{place.id}"
+
+    configurations = [
+        ('disabled', {'PROFILING_ENABLED': False}),
+        ('enabled, rate 0', {'PROFILING_ENABLED': True, 'PROFILING_SAMPLE_RATE': 0}),
+        (f"enabled, rate {args.sample_rate:g}", {'PROFILING_ENABLED': True, 'PROFILING_SAMPLE_RATE': args.sample_rate}),
+        ('enabled, rate 1', {'PROFILING_ENABLED': True, 'PROFILING_SAMPLE_RATE': 1}),
+    ]
+    rows = []
+    baseline = None
+    for name, config in configurations:
+        # The profiler reads its configuration when the application is created
+        client = http_client(COMPRESSION_ENABLED=False, **config)
+        assert client.get(url).status_code == 200
+
+        def run():
+            for _ in range(args.requests):
+                client.get(url)
+
+        seconds = best_of(run) / args.requests
+        baseline = baseline or seconds
+        rows.append((name, seconds * 1e6, (seconds / baseline - 1) * 100))
+    report(f"GET {url}", ['profiling', 'us/request', 'overhead %'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
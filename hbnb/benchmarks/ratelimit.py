@@ -0,0 +1,38 @@
+"""
+Admission control benchmark: limiter overhead per request (user-030).
+
+    python -m benchmarks.ratelimit --requests 20000
+
+Times the same cheap request with the rate limiter off and on, with a bucket
+large enough never to reject, and the token bucket on its own.
+"""
+import argparse
+import sys
+from benchmarks import best_of, report, http_client
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ratelimit', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per measurement')
+    args = parser.parse_args(argv)
+
+    from app.api.ratelimit import InMemoryBucketStore
+
+    rows = []
+    for enabled in (False, True):
+        client = http_client(RATE_LIMIT_ENABLED=enabled, RATE_LIMIT_RATE=1e9, RATE_LIMIT_BURST=1e9,
+                             COMPRESSION_ENABLED=False)
+        seconds = best_of(lambda: client.get('/api/v1/amenities/unknown'), repeat=3, number=args.requests)
+        rows.append(('on' if enabled else 'off', seconds * 1e6))
+    rows.append(('overhead', rows[1][1] - rows[0][1]))
+    report('GET /api/v1/amenities/<id> through the test client', ['limiter', 'us/request'], rows)
+
+    store = InMemoryBucketStore()
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+    seconds = best_of(lambda: [store.take(key, 1, 1e9, 1e9) for key in keys], number=100)
+    report('InMemoryBucketStore.take() alone', ['clients', 'us/take'], [(len(keys), seconds / len(keys) * 1e6)])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
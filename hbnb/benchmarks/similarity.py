@@ -0,0 +1,82 @@
+"""
+Similar places benchmark: index build time and query latency at 1M places (user-048).
+
+    python -m benchmarks.similarity --sizes 100000 1000000
+
+For each size, builds a SimilarityIndex from synthetic places (clustered
+locations, log-normal prices, a handful of amenities), then times:
+    - the build, split into feature vectors plus rows, and the clustering done by
+      the first query once the index exceeds its exact limit;
+    - a top-10 query, exact (a matrix-vector product over every row) and
+      approximate (only the probed clusters), with the recall of the latter;
+    - an incremental update of one place.
+Needs NumPy; without it queries are plain Python scans, far too slow at these sizes.
+"""
+import argparse
+import random
+import sys
+import time
+from benchmarks import best_of, report
+from app.persistence import similarity
+from app.persistence.similarity import SimilarityIndex
+
+
+def _places(count, amenities, rng):
+    cities = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(200)]
+    for i in range(count):
+        lat, lon = rng.choice(cities)
+        yield (f"place-{i}", rng.lognormvariate(4.5, 0.6), lat + rng.gauss(0, 0.5), lon + rng.gauss(0, 0.5),
+               rng.choice((0.0, rng.uniform(1, 5))), rng.sample(range(amenities), rng.randint(0, 8)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.similarity', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Numbers of places')
+    parser.add_argument('--amenities', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=100, help='Queries timed and checked for recall')
+    parser.add_argument('--exact-limit', type=int, default=50000, help='Rows up to which queries are exact')
+    args = parser.parse_args(argv)
+    if similarity.np is None:
+        parser.error('NumPy is not installed')
+
+    rng = random.Random(0)
+    rows = []
+    for size in args.sizes:
+        index = SimilarityIndex(exact_limit=args.exact_limit)
+        start = time.perf_counter()
+        index.set_many((place_id, index.features(*features)) for place_id, *features in _places(size, args.amenities, rng))
+        build_seconds = time.perf_counter() - start
+
+        queried = [f"place-{rng.randrange(size)}" for _ in range(args.queries)]
+        start = time.perf_counter()
+        index.similar(queried[0])
+        cluster_seconds = time.perf_counter() - start
+
+        def query():
+            for place_id in queried:
+                index.similar(place_id)
+
+        approximate_seconds = best_of(query, repeat=3) / len(queried)
+        approximate = [{place_id for place_id, _ in index.similar(queried_id)} for queried_id in queried]
+        # Lifting the limit makes the same index answer exactly
+        index.exact_limit = size
+        exact_seconds = best_of(query, repeat=3) / len(queried)
+        exact = [{place_id for place_id, _ in index.similar(queried_id)} for queried_id in queried]
+        index.exact_limit = args.exact_limit
+        recall = sum(len(a & e) for a, e in zip(approximate, exact)) / sum(map(len, exact))
+
+        _, *features = next(_places(1, args.amenities, rng))
+        vector = index.features(*features)
+        update_seconds = best_of(lambda: index.set('place-0', vector), number=1000)
+
+        approximate_ms = approximate_seconds * 1000 if size > args.exact_limit else '-'
+        rows.append((size, build_seconds, cluster_seconds if size > args.exact_limit else '-',
+                     exact_seconds * 1000, approximate_ms, f"{recall:.1%}" if size > args.exact_limit else '-',
+                     update_seconds * 1e6))
+    report('SimilarityIndex, top 10', ['places', 'build s', 'cluster s', 'exact ms', 'approx ms', 'recall', 'update us'],
+           rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
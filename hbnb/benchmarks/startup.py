@@ -0,0 +1,73 @@
+"""
+Startup benchmark: create_app() wall time and import time (user-028).
+
+    python -m benchmarks.startup --runs 5 --budget 0.5
+
+Each run starts a fresh interpreter, so module caches do not hide import costs.
+The import time is the cumulative time `-X importtime` reports for `import app`
+and the modules create_app() imports. The script exits with status 1 when the
+median create_app() time exceeds the budget, so it can guard against regressions.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from benchmarks import report
+
+# Prints the seconds create_app() took; Swagger is left as configured
+PROGRAM = """
+import time
+start = time.perf_counter()
+from app import create_app
+create_app({config!r})
+print(time.perf_counter() - start)
+"""
+
+
+def _run(config_name):
+    """
+    Create the application in a fresh interpreter.
+
+    Returns:
+        tuple: (create_app seconds, import microseconds of the top-level modules).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROGRAM.format(config=config_name)],
+                            capture_output=True, text=True, check=True)
+    imports = 0
+    started = False
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; nested imports are
+        # indented further, and the interpreter's own start-up imports come before app
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            started = started or name.strip() == 'app'
+            if started and cumulative.strip().isdigit() and not name[1:].startswith(' '):
+                imports += int(cumulative)
+    return float(result.stdout.strip().splitlines()[-1]), imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per configuration')
+    parser.add_argument('--budget', type=float, default=0.5,
+                        help='Maximum median create_app() seconds in production mode')
+    args = parser.parse_args(argv)
+
+    rows = []
+    medians = {}
+    for config_name in ('development', 'production'):
+        runs = [_run(config_name) for _ in range(args.runs)]
+        medians[config_name] = statistics.median(seconds for seconds, _ in runs)
+        rows.append((config_name, medians[config_name] * 1000,
+                     statistics.median(imports for _, imports in runs) / 1000))
+    report('create_app() in a fresh interpreter (medians)', ['config', 'create_app ms', 'imports ms'], rows)
+
+    if medians['production'] > args.budget:
+        print(f"FAIL: create_app() took {medians['production']:.3f}s, over the {args.budget}s budget")
+        return 1
+    print(f"OK: within the {args.budget}s budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Review tiering benchmark: resident memory and cold-read latency (user-040).
+
+    python -m benchmarks.tiering --reviews 50000000
+
+Loads the same old reviews twice, each time in a fresh process: once into a
+TieredRepository that is never archived, and once archiving after every batch
+of 10000 reviews, as the background archiver does. It then reports the
+resulting RSS and the latency of reads by ID from each tier. RSS is split into
+anonymous memory and the file-backed pages of the segment mapping, which the
+kernel can reclaim. Linux only, as it reads /proc/self/status.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from benchmarks import best_of, report
+from app.models import interning
+from app.models.review import Review
+from app.persistence.repository import InMemoryRepository
+from app.persistence.tiered import SegmentStore, TieredRepository
+
+BATCH_SIZE = 10000
+
+# Review texts are drawn from these, so that they differ as real ones do
+WORDS = ('great', 'stay', 'clean', 'quiet', 'host', 'friendly', 'location', 'close', 'beach',
+         'bed', 'comfortable', 'would', 'come', 'back', 'kitchen', 'view', 'noisy', 'small',
+         'bright', 'spacious', 'station', 'walk', 'recommend', 'the', 'and', 'very', 'with')
+
+
+def _rss_mb():
+    """
+    Return the resident memory in MB as (anonymous, file-backed).
+    """
+    sizes = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in ('RssAnon', 'RssFile'):
+                sizes[name] = int(value.split()[0]) / 1024
+    return sizes.get('RssAnon', 0.0), sizes.get('RssFile', 0.0)
+
+
+def _release_memory():
+    """
+    Hand freed memory back to the system, so that RSS reflects the memory in use
+    rather than what the allocators kept.
+    """
+    interning.prune()
+    gc.collect()
+    libc = ctypes.util.find_library('c')
+    if libc and hasattr(ctypes.CDLL(libc), 'malloc_trim'):
+        ctypes.CDLL(libc).malloc_trim(0)
+
+
+def _fill(reviews, words, archive, directory, conn):
+    """
+    Load the reviews, archiving after each batch if asked, and send back
+    (anonymous MB, file MB, get seconds, get_many seconds per ID, segment MB).
+    """
+    rng = random.Random(0)
+    place_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(1000)]
+    user_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(1000)]
+    old = datetime.now() - timedelta(days=365)
+    baseline = _rss_mb()
+
+    repo = TieredRepository(InMemoryRepository(), SegmentStore(os.path.join(directory, f"{archive}.seg")),
+                            timedelta(days=180))
+    sample = []
+    for start in range(0, reviews, BATCH_SIZE):
+        batch = []
+        for i in range(start, min(reviews, start + BATCH_SIZE)):
+            review = Review(' '.join(rng.choices(WORDS, k=words)), 1 + i % 5,
+                            rng.choice(place_ids), rng.choice(user_ids))
+            review.created_at = review.updated_at = old
+            batch.append(review)
+        repo.add_many(batch)
+        sample.extend(review.id for review in rng.sample(batch, min(len(batch), 1000 * BATCH_SIZE // reviews + 1)))
+        if archive:
+            repo.archive()
+    del batch, review
+    _release_memory()
+    anon, file = [now - before for now, before in zip(_rss_mb(), baseline)]
+
+    sample = sample[:1000]
+    get = best_of(lambda: [repo.get(obj_id) for obj_id in sample], repeat=3) / len(sample)
+    get_many = best_of(lambda: repo.get_many(sample), repeat=3) / len(sample)
+    conn.send((anon, file, get, get_many, os.path.getsize(repo.cold.path) / 2 ** 20))
+    repo.cold.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.tiering', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reviews', type=int, default=200000, help='Number of reviews')
+    parser.add_argument('--words', type=int, default=60, help='Words per review text')
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, archive in (('hot', False), ('cold', True)):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_fill, args=(args.reviews, args.words, archive,
+                                                                  directory, sender))
+            process.start()
+            anon, file, get, get_many, segment = receiver.recv()
+            process.join()
+            rows.append((name, anon, file, segment, get * 1e6, get_many * 1e6))
+    report(f"{args.reviews} reviews", ['tier', 'anon MB', 'file MB', 'segment MB', 'get us', 'get_many us/id'],
+           rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Validation benchmark: throughput of the compiled validators on bulk payloads (user-041).
+
+    python -m benchmarks.validation --payloads 1000000
+
+Validates arrays of user, place and review payloads, one in ten invalid, with
+validate_many(), and compares with the model-object path: building each object
+with its validating setters and checks, and catching the ValueError.
+"""
+import argparse
+import random
+import sys
+import uuid
+from benchmarks import best_of, report
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.models.validation import validate_many, validate_place, validate_review, validate_user
+
+
+def _payloads(kind, count, rng):
+    owner_id = str(uuid.uuid4())
+    for i in range(count):
+        bad = i % 10 == 0
+        if kind == 'users':
+            yield {'first_name': 'Ada', 'last_name': 'Lovelace', 'password': 'secret',
+                   'email': f"user{i}example.com" if bad else f"user{i}@example.com"}
+        elif kind == 'places':
+            yield {'title': f"Place {i}", 'description': '', 'price': -1.0 if bad else rng.uniform(20, 500),
+                   'latitude': rng.uniform(-60, 60), 'longitude': rng.uniform(-180, 180), 'owner_id': owner_id}
+        else:
+            yield {'text': 'Great stay', 'rating': 6 if bad else rng.randint(1, 5),
+                   'place_id': owner_id, 'user_id': owner_id}
+
+
+def _build_user(payload):
+    User(payload['first_name'], payload['last_name'], payload['email'], payload['password']).validate_email()
+
+
+def _build_place(payload):
+    Place(payload['title'], payload['description'], payload['price'], payload['latitude'],
+          payload['longitude'], payload['owner_id'])
+
+
+def _build_review(payload):
+    Review(payload['text'], payload['rating'], payload['place_id'], payload['user_id']).validate_rating()
+
+
+def _objects(build, payloads):
+    errors = 0
+    for payload in payloads:
+        try:
+            build(payload)
+        except ValueError:
+            errors += 1
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.validation', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=100000, help='Payloads per kind')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    rows = []
+    for kind, validate, build in (('users', validate_user, _build_user),
+                                  ('places', validate_place, _build_place),
+                                  ('reviews', validate_review, _build_review)):
+        payloads = list(_payloads(kind, args.payloads, rng))
+        assert len(validate_many(validate, payloads)) == _objects(build, payloads) == len(payloads[::10])
+        compiled = best_of(lambda: validate_many(validate, payloads), repeat=3)
+        objects = best_of(lambda: _objects(build, payloads), repeat=3)
+        rows.append((kind, len(payloads) / compiled, len(payloads) / objects, objects / compiled))
+    report(f"{args.payloads} payloads per kind, 10% invalid",
+           ['kind', 'compiled /s', 'model objects /s', 'speed-up'], rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,11 +3,54 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Serve the Swagger UI and /swagger.json (the spec itself is built on first request)
+    SWAGGER_ENABLED = True
+    # Admission control (see app.api.ratelimit)
+    RATE_LIMIT_ENABLED = False
+    RATE_LIMIT_RATE = 20
+    RATE_LIMIT_BURST = 40
+    # Unpaginated collections are weighted by how much work they do
+    RATE_LIMIT_COSTS = {
+        'GET /api/v1/places/': 10,
+        'GET /api/v1/reviews/': 10,
+        'GET /api/v1/users/': 5,
+        'GET /api/v1/amenities/': 2,
+        # A batch runs up to 20 sub-requests that bypass the per-request hooks
+        'POST /api/v1/batch/': 20
+    }
+    MAX_CONCURRENT_REQUESTS = 64
+    # Header naming the client (set by an authenticating proxy); unset keys on the remote address
+    RATE_LIMIT_KEY_HEADER = os.getenv('RATE_LIMIT_KEY_HEADER')
+    # Response compression (see app.api.compression)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_LEVEL = 6
+    COMPRESSION_CACHE_SIZE = 512
+    # Cold storage for old reviews (see app.persistence.tiered); disabled without a path
+    REVIEW_ARCHIVE_PATH = os.getenv('REVIEW_ARCHIVE_PATH')
+    REVIEW_ARCHIVE_AFTER_DAYS = 180
+    REVIEW_ARCHIVE_INTERVAL = 3600
+    # Background removal of the dependents of deleted entities (see app.services.integrity)
+    INTEGRITY_SWEEP_INTERVAL = 1.0
+    INTEGRITY_SWEEP_BATCH = 500
+    # Request profiling (see app.api.profiling)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '').lower() in ('1', 'true')
+    PROFILING_SAMPLE_RATE = 0.01
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')
+    PROFILING_INTERVAL = 0.005
+    PROFILING_MAX_STACKS = 10000
+    # Concurrent identical reads share one computation (see app.api.coalescing)
+    COALESCING_ENABLED = True
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
+class ProductionConfig(Config):
+    SWAGGER_ENABLED = False
+    RATE_LIMIT_ENABLED = True
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
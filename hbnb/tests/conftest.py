@@ -0,0 +1,67 @@
+import uuid
+import pytest
+from app.services import identity
+from app.services.facade import get_facade
+
+
+@pytest.fixture
+def facade():
+    """
+    The application facade. Its repositories are shared by every test, so tests
+    create their own entities and never assume the repositories are empty.
+    """
+    return get_facade()
+
+
+@pytest.fixture
+def unit_of_work():
+    """
+    Run the test inside a unit of work, as a request would.
+    """
+    token = identity.begin()
+    yield identity.current()
+    identity.end(token)
+
+
+@pytest.fixture
+def make_user(facade):
+    """
+    Create users with unique emails.
+    """
+    def make(**attrs):
+        data = {'first_name': 'Ada', 'last_name': 'Lovelace', 'password': 'secret',
+                'email': f"{uuid.uuid4().hex}@example.com"}
+        data.update(attrs)
+        return facade.create_user(data)
+    return make
+
+
+@pytest.fixture
+def make_place(facade, make_user):
+    """
+    Create places, each owned by a new user unless an owner is given.
+    """
+    def make(owner=None, **attrs):
+        data = {'title': 'Cottage', 'description': '', 'price': 100.0,
+                'latitude': 48.0, 'longitude': 2.0,
+                'owner_id': (owner or make_user()).id}
+        data.update(attrs)
+        return facade.create_place(data)
+    return make
+
+
+@pytest.fixture
+def make_app():
+    """
+    Create applications with configuration overrides, applied before create_app() reads them.
+    """
+    from app import create_app
+    from config import config
+
+    def make(**overrides):
+        settings = {'TESTING': True, 'COALESCING_ENABLED': False, 'INTEGRITY_SWEEP_INTERVAL': 0}
+        settings.update(overrides)
+        config['test'] = type('TestConfig', (config['default'],), settings)
+        return create_app('test')
+    yield make
+    config.pop('test', None)
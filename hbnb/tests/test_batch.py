@@ -0,0 +1,85 @@
+import uuid
+import pytest
+from flask import g, request
+from app.services import identity
+
+
+def _user():
+    return {'first_name': 'Ada', 'last_name': 'Lovelace', 'password': 'secret',
+            'email': f"{uuid.uuid4().hex}@example.com"}
+
+
+def _place(owner_id):
+    return {'title': 'Cottage', 'description': '', 'price': 100.0, 'latitude': 48.0,
+            'longitude': 2.0, 'owner_id': owner_id}
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+
+def test_operations_reference_earlier_results(client):
+    response = client.post('/api/v1/batch/', json={'operations': [
+        {'method': 'POST', 'path': '/api/v1/users/', 'body': _user(), 'name': 'owner'},
+        {'method': 'POST', 'path': '/api/v1/places/', 'body': _place('${owner.id}'), 'name': 'place'},
+        {'method': 'GET', 'path': '/api/v1/places/${place.id}'},
+        {'method': 'GET', 'path': '/api/v1/users/${0.id}'}
+    ]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == [201, 201, 200, 200]
+    owner_id = results[0]['body']['id']
+    assert results[2]['body']['id'] == results[1]['body']['id']
+    assert results[2]['body']['owner']['id'] == owner_id
+    assert results[3]['body']['id'] == owner_id
+
+
+def test_operation_referencing_a_failed_one_is_not_run(client, facade):
+    places = len(facade.get_all_places())
+    response = client.post('/api/v1/batch/', json={'operations': [
+        {'method': 'POST', 'path': '/api/v1/users/', 'body': {'first_name': 'Ada'}, 'name': 'owner'},
+        {'method': 'POST', 'path': '/api/v1/places/', 'body': _place('${owner.id}')},
+        {'method': 'GET', 'path': '/api/v1/places/${9.id}'}
+    ]})
+    results = response.get_json()['results']
+    assert results[0]['status'] == 400
+    assert results[1]['status'] == 424
+    assert results[2]['status'] == 400
+    assert len(facade.get_all_places()) == places
+
+
+def test_nested_batches_are_rejected(client):
+    response = client.post('/api/v1/batch/', json={'operations': [
+        {'method': 'POST', 'path': '/api/v1/batch/', 'body': {'operations': []}},
+        {'method': 'POST', 'path': '/api/v1/batch', 'body': {'operations': []}}
+    ]})
+    assert [result['status'] for result in response.get_json()['results']] == [400, 400]
+
+
+def test_batch_keeps_its_unit_of_work_and_concurrency_slot(make_app):
+    app = make_app(RATE_LIMIT_ENABLED=True, RATE_LIMIT_RATE=1e9, RATE_LIMIT_BURST=1e9,
+                   MAX_CONCURRENT_REQUESTS=1)
+    seen = []
+
+    # Registered last, so it runs before the application's own teardown hooks
+    @app.teardown_request
+    def record(exc=None):
+        seen.append((request.path, g.get('identity_token') is not None,
+                     g.get('rate_limit_slot', False), identity.current() is not None))
+
+    client = app.test_client()
+    response = client.post('/api/v1/batch/', json={'operations': [
+        {'method': 'POST', 'path': '/api/v1/users/', 'body': _user(), 'name': 'owner'},
+        {'method': 'GET', 'path': '/api/v1/users/${owner.id}'},
+        {'method': 'POST', 'path': '/api/v1/users/', 'body': _user()}
+    ]})
+    assert [result['status'] for result in response.get_json()['results']] == [201, 200, 201]
+
+    *operations, batch = seen
+    assert [path for path, *_ in operations][::2] == ['/api/v1/users/', '/api/v1/users/']
+    # Every sub-request ran inside the batch's unit of work and left the batch's state alone
+    assert all(in_unit for *_, in_unit in operations)
+    assert batch == ('/api/v1/batch/', True, True, True)
+    # The one slot was given back once the batch was over
+    assert client.get('/api/v1/amenities/').status_code == 200
@@ -0,0 +1,153 @@
+import socketserver
+import threading
+import time
+import pytest
+from app.models.amenity import Amenity
+from app.persistence.cache import CachedRepository, MemcachedClient
+from app.persistence.repository import InMemoryRepository
+
+
+class _MemcachedHandler(socketserver.StreamRequestHandler):
+    """
+    Serves the get/set/delete subset of the memcached text protocol MemcachedClient uses.
+    """
+    def handle(self):
+        store = self.server.store
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, *args = line.split()
+            if command == b'get':
+                self.server.gets += 1
+                for key in args:
+                    data = store.get(key)
+                    if data is not None:
+                        self.wfile.write(b'VALUE %s 0 %d\r\n%s\r\n' % (key, len(data), data))
+                self.wfile.write(b'END\r\n')
+            elif command == b'set':
+                data = self.rfile.read(int(args[3]) + 2)[:-2]
+                store[args[0]] = data
+                self.wfile.write(b'STORED\r\n')
+            elif command == b'delete':
+                found = store.pop(args[0], None) is not None
+                self.wfile.write(b'DELETED\r\n' if found else b'NOT_FOUND\r\n')
+
+
+@pytest.fixture
+def memcached():
+    """
+    A local stand-in memcached server; yields a client connected to it.
+    """
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _MemcachedHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.gets = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield MemcachedClient(*server.server_address)
+    server.shutdown()
+    server.server_close()
+
+
+class CountingRepository(InMemoryRepository):
+    """
+    In-memory repository counting the objects looked up, optionally slowly.
+    """
+    def __init__(self, delay=0):
+        super().__init__()
+        self.delay = delay
+        self.loads = 0
+
+    def get(self, obj_id):
+        self.loads += 1
+        time.sleep(self.delay)
+        return super().get(obj_id)
+
+    def get_many(self, obj_ids):
+        self.loads += len(obj_ids)
+        time.sleep(self.delay)
+        return super().get_many(obj_ids)
+
+
+def _amenities(repo, count):
+    amenities = [Amenity(f"amenity {i}", "") for i in range(count)]
+    repo.add_many(amenities)
+    return [amenity.id for amenity in amenities]
+
+
+def test_get_many_reads_through_the_shared_tier(memcached):
+    backend = CountingRepository()
+    ids = _amenities(backend, 5)
+    CachedRepository(backend, shared=memcached, namespace='amenity').get_many(ids)
+    assert backend.loads == 5
+
+    # Another process: empty local tier, same shared tier
+    other = CachedRepository(backend, shared=memcached, namespace='amenity')
+    assert [amenity.name for amenity in other.get_many(ids)] == [f"amenity {i}" for i in range(5)]
+    assert backend.loads == 5
+    # Now served by the local tier
+    other.get_many(ids)
+    assert backend.loads == 5
+
+
+def test_get_many_caches_missing_ids(memcached):
+    backend = CountingRepository()
+    ids = _amenities(backend, 2)
+    cache = CachedRepository(backend, shared=memcached, namespace='amenity')
+    assert cache.get_many(ids + ['unknown'])[2] is None
+    assert cache.get_many(['unknown']) == [None]
+    assert backend.loads == 3
+
+
+def test_write_invalidates_both_tiers(memcached):
+    backend = CountingRepository()
+    [amenity_id] = _amenities(backend, 1)
+    cache = CachedRepository(backend, shared=memcached, namespace='amenity')
+    other = CachedRepository(backend, shared=memcached, namespace='amenity', local_ttl=0.05)
+    cache.get_many([amenity_id])
+    other.get(amenity_id)
+    cache.update(amenity_id, {'name': 'renamed'})
+    assert cache.get_many([amenity_id])[0].name == 'renamed'
+    # The other process only sees the write once its local entry expires
+    time.sleep(0.1)
+    assert other.get(amenity_id).name == 'renamed'
+
+
+def test_concurrent_get_and_get_many_share_one_load():
+    backend = CountingRepository(delay=0.1)
+    ids = _amenities(backend, 3)
+    cache = CachedRepository(backend)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_many(ids)))
+               for _ in range(4)]
+    threads += [threading.Thread(target=lambda: results.append([cache.get(ids[0])]))
+                for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.loads == 3
+    assert all(result[0].id == ids[0] for result in results)
+
+
+def test_load_racing_with_a_write_is_not_cached():
+    backend = CountingRepository(delay=0.1)
+    [amenity_id] = _amenities(backend, 1)
+    cache = CachedRepository(backend)
+    reader = threading.Thread(target=cache.get_many, args=([amenity_id],))
+    reader.start()
+    time.sleep(0.05)
+    cache.update(amenity_id, {'name': 'renamed'})
+    reader.join()
+    loads = backend.loads
+    cache.get_many([amenity_id])
+    assert backend.loads == loads + 1
+
+
+def test_unavailable_shared_tier_falls_back_to_the_backend():
+    backend = CountingRepository()
+    ids = _amenities(backend, 2)
+    # Nothing listens on port 1
+    cache = CachedRepository(backend, shared=MemcachedClient(port=1, timeout=0.1), namespace='amenity')
+    assert [amenity.id for amenity in cache.get_many(ids)] == ids
@@ -0,0 +1,67 @@
+import threading
+from app.services.changes import ChangeLog
+
+
+def test_concurrent_writers_are_delivered_without_gaps(facade, make_user, make_place):
+    place = make_place()
+    users = [make_user() for _ in range(4)]
+    since = facade.change_log.last_seq
+    writes_per_thread = 200
+    received = []
+    done = threading.Event()
+
+    def consume():
+        seq = since
+        while not done.is_set() or seq < facade.change_log.last_seq:
+            events, seq, truncated = facade.change_log.read(seq, limit=50, timeout=0.1)
+            assert not truncated
+            received.extend(events)
+
+    def write(user):
+        for i in range(writes_per_thread):
+            facade.update_place(place.id, {'price': float(i)})
+            facade.update_user(user.id, {'first_name': f"Ada {i}"})
+
+    consumer = threading.Thread(target=consume)
+    writers = [threading.Thread(target=write, args=(user,)) for user in users]
+    consumer.start()
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    done.set()
+    consumer.join()
+
+    assert [event['seq'] for event in received] == list(range(since + 1, since + 1 + len(received)))
+    assert len(received) == 2 * writes_per_thread * len(users)
+    # Events follow commit order, so each entity's versions come in order, once
+    # each, up to its current version
+    for entity in [place] + users:
+        versions = [event['version'] for event in received if event['id'] == entity.id]
+        assert versions == sorted(set(versions))
+        assert versions[-1] == entity.version
+
+
+def test_consumer_behind_the_capacity_is_told_to_resynchronise(facade, make_user):
+    log = ChangeLog(capacity=3)
+    user = make_user()
+    for _ in range(5):
+        log.publish('update', 'user', user, ['first_name'])
+
+    events, next_seq, truncated = log.read(since=1)
+    assert truncated
+    assert [event['seq'] for event in events] == [3, 4, 5]
+    assert next_seq == 5
+
+    assert log.read(since=5) == ([], 5, False)
+
+
+def test_read_waits_for_the_next_event(facade, make_user):
+    log = ChangeLog()
+    user = make_user()
+    timer = threading.Timer(0.05, log.publish, ('create', 'user', user, ['email']))
+    timer.start()
+    events, next_seq, _ = log.read(since=0, timeout=5)
+    timer.join()
+    assert [event['id'] for event in events] == [user.id]
+    assert next_seq == 1
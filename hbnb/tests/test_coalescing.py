@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app(COALESCING_ENABLED=True).test_client()
+
+
+@pytest.fixture
+def views(facade, monkeypatch):
+    """
+    Count the runs of the place detail view, which start with get_place_entities().
+    The first run waits for `release` to be set, so that other requests arrive while it
+    is in flight.
+    """
+    runs = []
+    release = threading.Event()
+    get_place_entities = facade.get_place_entities
+
+    def counting(*args, **kwargs):
+        runs.append(args)
+        if len(runs) == 1:
+            assert release.wait(5)
+        return get_place_entities(*args, **kwargs)
+
+    monkeypatch.setattr(facade, 'get_place_entities', counting)
+    yield runs, release
+    release.set()
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def _get(client, url, responses, **kwargs):
+    thread = threading.Thread(target=lambda: responses.append(client.get(url, **kwargs)))
+    thread.start()
+    return thread
+
+
+def test_concurrent_identical_reads_run_the_view_once(facade, make_place, client, views):
+    runs, release = views
+    place = make_place()
+    shared = facade.flights.shared
+    responses = []
+    threads = [_get(client, f"/api/v1/places/{place.id}", responses) for _ in range(8)]
+    # Every follower has joined the leader's computation
+    assert _wait_until(lambda: facade.flights.shared - shared == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(runs) == 1
+    assert [response.status_code for response in responses] == [200] * 8
+    assert len({response.get_data() for response in responses}) == 1
+    assert len({response.headers['ETag'] for response in responses}) == 1
+
+
+def test_read_after_a_write_is_not_served_stale(facade, make_place, client, views):
+    runs, release = views
+    place = make_place(price=100.0)
+    url = f"/api/v1/places/{place.id}"
+    before, after = [], []
+    first = _get(client, url, before)
+    assert _wait_until(lambda: len(runs) == 1)
+
+    facade.update_place(place.id, {'price': 80.0})
+    second = _get(client, url, after)
+    # The read arriving after the write runs the view again instead of joining
+    second.join(5)
+    release.set()
+    first.join()
+
+    assert len(runs) == 2
+    assert after[0].get_json()['price'] == 80.0
+
+
+def test_reads_with_different_validators_are_not_merged(make_place, client, views):
+    runs, release = views
+    place = make_place()
+    url = f"/api/v1/places/{place.id}"
+    responses = []
+    threads = [_get(client, url, responses, headers={'If-None-Match': '"stale-a"'})]
+    assert _wait_until(lambda: len(runs) == 1)
+    threads.append(_get(client, url, responses, headers={'If-None-Match': '"stale-b"'}))
+    assert _wait_until(lambda: len(runs) == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert [response.status_code for response in responses] == [200, 200]
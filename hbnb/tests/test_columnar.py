@@ -0,0 +1,103 @@
+import random
+import uuid
+import pytest
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence import columnar
+from app.persistence.columnar import ColumnarRepository
+from app.persistence.repository import InMemoryRepository, StaleWriteError
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def repos(request, monkeypatch):
+    """
+    A ColumnarRepository and an InMemoryRepository holding the same places, with
+    the columnar scans vectorized or in plain Python.
+    """
+    if request.param == 'python':
+        monkeypatch.setattr(columnar, 'np', None)
+    elif columnar.np is None:
+        pytest.skip('NumPy is not installed')
+    rng = random.Random(0)
+    owner_id = str(uuid.uuid4())
+    columns = ColumnarRepository(('price', 'latitude', 'longitude'))
+    objects = InMemoryRepository()
+    for i in range(500):
+        place = Place(f"Place {i}", '', float(rng.randint(20, 60)), rng.uniform(-60, 60),
+                      rng.uniform(-180, 180), owner_id)
+        columns.add(place)
+        objects.add(place)
+    return columns, objects
+
+
+def _ids(objs):
+    return sorted(obj.id for obj in objs)
+
+
+def test_filter_matches_a_scan(repos):
+    columns, objects = repos
+    found = columns.filter(price=(30, 40), latitude=(0, None))
+    assert _ids(found) == _ids(place for place in objects.get_all()
+                               if 30 <= place.price <= 40 and place.latitude >= 0)
+    assert found and all(place.to_dict() == objects.get(place.id).to_dict() for place in found)
+
+
+def test_aggregates_match_a_scan(repos):
+    columns, objects = repos
+    prices = [place.price for place in objects.get_all() if place.longitude < 0]
+    assert columns.aggregate('price', 'count', longitude=(None, 0)) == len(prices)
+    assert columns.aggregate('price', 'sum', longitude=(None, 0)) == pytest.approx(sum(prices))
+    assert columns.aggregate('price', 'mean', longitude=(None, 0)) == pytest.approx(sum(prices) / len(prices))
+    assert columns.aggregate('price', 'min', longitude=(None, 0)) == min(prices)
+    assert columns.aggregate('price', 'max', longitude=(None, 0)) == max(prices)
+    assert columns.aggregate('price', 'max', price=(1000, None)) is None
+
+
+def test_histogram_matches_a_scan(repos):
+    columns, objects = repos
+    counts = {}
+    for place in objects.get_all():
+        counts[place.price] = counts.get(place.price, 0) + 1
+    assert columns.histogram('price') == dict(sorted(counts.items()))
+
+
+def test_delete_moves_the_last_row_into_the_freed_slot(repos):
+    columns, objects = repos
+    first, last = columns.get_all()[0], columns.get_all()[-1]
+    columns.delete(first.id)
+    objects.delete(first.id)
+
+    assert columns.get(first.id) is None
+    assert columns.get_all()[0].id == last.id
+    assert columns.get(last.id).to_dict() == objects.get(last.id).to_dict()
+    assert last.id in _ids(columns.filter(price=(last.price, last.price)))
+    assert columns.aggregate('price', 'count') == len(objects.get_all())
+    assert columns.aggregate('price', 'sum') == pytest.approx(sum(place.price for place in objects.get_all()))
+    assert _ids(columns.filter(price=(20, 60))) == _ids(objects.get_all())
+
+
+def test_reads_are_copies_and_updates_write_the_row(repos):
+    columns, _ = repos
+    place = columns.get_all()[0]
+    place.price = 999.0
+    place.amenities.append('wifi')
+    assert columns.get(place.id).price != 999.0
+    assert columns.get(place.id).amenities == []
+
+    version = columns.get(place.id).version
+    columns.update(place.id, {'price': 999.0, 'amenities': ['wifi']}, expected_version=version)
+    stored = columns.get(place.id)
+    assert (stored.price, stored.amenities, stored.version) == (999.0, ['wifi'], version + 1)
+    assert _ids(columns.filter(price=(999.0, None))) == [place.id]
+    with pytest.raises(StaleWriteError):
+        columns.update(place.id, {'price': 1.0}, expected_version=version)
+
+
+def test_rows_of_other_models_keep_their_attributes():
+    repo = ColumnarRepository(('rating',))
+    review = Review('Great', 5, str(uuid.uuid4()), str(uuid.uuid4()))
+    repo.add(review)
+    stored = repo.get_by_attribute('place_id', review.place_id)
+    assert type(stored) is Review
+    assert stored.to_dict() == review.to_dict()
+    assert repo.get_by_attribute('rating', 5).id == review.id
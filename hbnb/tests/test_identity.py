@@ -0,0 +1,145 @@
+from collections import Counter
+import pytest
+from app.models.place import Place
+from app.services import identity
+
+
+@pytest.fixture
+def loads(facade, monkeypatch):
+    """
+    Count the IDs each repository backend is asked for, by (kind, ID), and the
+    full reads of each backend, by (kind, '*').
+    """
+    counts = Counter()
+    for kind in ('user', 'place', 'review', 'amenity', 'booking'):
+        backend = getattr(facade, f"{kind}_repo").backend
+
+        def get(obj_id, kind=kind, get=backend.get):
+            counts[(kind, obj_id)] += 1
+            return get(obj_id)
+
+        def get_many(obj_ids, kind=kind, get_many=backend.get_many):
+            counts.update((kind, obj_id) for obj_id in obj_ids)
+            return get_many(obj_ids)
+
+        def get_all(kind=kind, get_all=backend.get_all):
+            counts[(kind, '*')] += 1
+            return get_all()
+
+        monkeypatch.setattr(backend, 'get', get)
+        monkeypatch.setattr(backend, 'get_many', get_many)
+        monkeypatch.setattr(backend, 'get_all', get_all)
+    return counts
+
+
+@pytest.fixture
+def place(facade, make_user, make_place):
+    amenity = facade.create_amenity({'name': 'Wifi', 'description': ''})
+    place = make_place(amenities=[amenity.id])
+    for _ in range(3):
+        facade.create_review({'text': 'Great', 'rating': 5, 'place_id': place.id,
+                              'user_id': make_user().id})
+    return place
+
+
+def _read_place(facade, place_id):
+    # What GET /api/v1/places/<id> does: validators first, then the representation
+    facade.get_place_entities(place_id)
+    return facade.get_place(place_id)
+
+
+def test_unit_of_work_loads_each_entity_once(facade, place, loads, unit_of_work):
+    place_dict = _read_place(facade, place.id)
+    assert len(place_dict['reviews']) == 3
+    assert loads[('place', place.id)] == 1
+    assert loads[('user', place.owner_id)] == 1
+    assert loads[('amenity', place.amenities[0])] == 1
+    assert all(loads[('review', review_id)] == 1 for review_id in place.reviews)
+    assert max(loads.values()) == 1
+
+    # A second read in the same unit of work hits no repository at all
+    before = sum(loads.values())
+    _read_place(facade, place.id)
+    assert sum(loads.values()) == before
+
+
+def test_without_a_unit_of_work_lookups_repeat(facade, place, loads):
+    _read_place(facade, place.id)
+    assert loads[('place', place.id)] > 1
+    assert loads[('user', place.owner_id)] > 1
+
+
+def test_serializations_are_memoized_per_version(facade, place, monkeypatch, unit_of_work):
+    calls = Counter()
+    to_dict = Place.to_dict
+
+    def counting_to_dict(self):
+        calls[self.version] += 1
+        return to_dict(self)
+
+    monkeypatch.setattr(Place, 'to_dict', counting_to_dict)
+    first = identity.to_dict('place', place)
+    first['title'] = 'Changed by the caller'
+    assert identity.to_dict('place', place)['title'] == place.title
+    assert sum(calls.values()) == 1
+
+    # A write bumps the version, so the next serialization is fresh
+    facade.update_place(place.id, {'title': 'Renamed'})
+    assert facade.get_place(place.id)['title'] == 'Renamed'
+    assert calls[place.version] == 1
+
+
+def test_writes_evict_the_entity(facade, place, loads, unit_of_work):
+    facade.get_place(place.id)
+    facade.update_place(place.id, {'price': 80.0})
+    assert facade.get_place(place.id)['price'] == 80.0
+    assert loads[('place', place.id)] == 2
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+
+def test_place_endpoint_loads_each_entity_once(place, loads, client):
+    response = client.get(f"/api/v1/places/{place.id}")
+    assert response.status_code == 200
+    assert loads[('place', place.id)] == 1
+    assert loads[('user', place.owner_id)] == 1
+    assert loads[('amenity', place.amenities[0])] == 1
+    assert all(loads[('review', review_id)] == 1 for review_id in place.reviews)
+    assert max(loads.values()) == 1
+
+
+def test_place_update_loads_the_place_once(facade, place, loads, client):
+    response = client.put(f"/api/v1/places/{place.id}", json={'price': 90.0})
+    assert response.status_code == 200
+    # The precondition check and the update share one load
+    assert loads == {('place', place.id): 1}
+    assert facade.get_place(place.id)['price'] == 90.0
+
+
+@pytest.mark.parametrize('kind', ['user', 'review', 'amenity'])
+def test_entity_endpoints_load_the_entity_once(place, loads, client, kind):
+    obj_id = {'user': place.owner_id, 'review': place.reviews[0], 'amenity': place.amenities[0]}[kind]
+    path = {'user': 'users', 'review': 'reviews', 'amenity': 'amenities'}[kind]
+    response = client.get(f"/api/v1/{path}/{obj_id}")
+    assert response.status_code == 200
+    assert loads == {(kind, obj_id): 1}
+
+
+def test_place_reviews_endpoint_loads_each_review_once(place, loads, client):
+    response = client.get(f"/api/v1/places/{place.id}/reviews")
+    assert response.status_code == 200
+    assert loads[('place', place.id)] == 1
+    assert all(loads[('review', review_id)] == 1 for review_id in place.reviews)
+    assert max(loads.values()) == 1
+
+
+@pytest.mark.parametrize('kind, path', [('place', 'places'), ('user', 'users'),
+                                        ('review', 'reviews'), ('amenity', 'amenities')])
+def test_list_endpoints_read_their_repository_once(place, loads, client, kind, path):
+    response = client.get(f"/api/v1/{path}/")
+    assert response.status_code == 200
+    # One full read, and no lookup by ID per listed entity
+    assert loads == {(kind, '*'): 1}
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from datetime import date
+import pytest
+from app.services.integrity import ReferentialIntegrity
+
+
+@pytest.fixture
+def world(facade, make_user, make_place):
+    """
+    A host and a guest who review and book each other's places, and an amenity both places offer.
+    """
+    host = make_user()
+    guest = make_user()
+    wifi = facade.create_amenity({'name': 'Wifi', 'description': ''})
+    host_place = make_place(owner=host, amenities=[wifi.id])
+    guest_place = make_place(owner=guest, amenities=[wifi.id])
+    guest_review = facade.create_review({'text': 'Lovely', 'rating': 5,
+                                         'place_id': host_place.id, 'user_id': guest.id})
+    host_review = facade.create_review({'text': 'Fine', 'rating': 3,
+                                        'place_id': guest_place.id, 'user_id': host.id})
+    booking = facade.create_booking(host_place.id, {'user_id': guest.id, 'check_in': date(2030, 1, 1),
+                                                    'check_out': date(2030, 1, 4)})
+    return {'host': host, 'guest': guest, 'wifi': wifi, 'host_place': host_place,
+            'guest_place': guest_place, 'guest_review': guest_review, 'host_review': host_review,
+            'booking': booking}
+
+
+def _responses(facade, world):
+    """
+    What the read endpoints build their responses from, serialized.
+    """
+    host, host_place = world['host'], world['host_place']
+    responses = [
+        facade.get_place(host_place.id),
+        facade.get_place(host_place.id, embed=()),
+        facade.get_place(host_place.id, embed=(), reviews_limit=10),
+        facade.get_all_places(),
+        [facade.serialize_place(place) for place in facade.get_places_sorted('price')],
+        [review.to_dict() for review in facade.get_all_reviews()],
+        [review.to_dict() for review in facade.get_reviews_for_place(host_place.id)],
+        [review.to_dict() for review in facade.get_review_page(host_place.id, 10)[0]],
+        [user.to_dict() for user in facade.get_all_users()],
+        [amenity.to_dict() for amenity in facade.get_all_amenities()],
+        facade.get_user_dashboard(host.id),
+        [facade.serialize_place(place) for place, _ in facade.get_similar_places(host_place.id, 50)],
+        [booking.to_dict() for booking in facade.get_bookings_for_place(host_place.id)],
+        [facade.serialize_place(place) for place in facade.search_available_places(date(2030, 1, 1), date(2030, 1, 2))],
+    ]
+    return json.dumps(responses, default=str)
+
+
+def _assert_absent(facade, world, *names):
+    body = _responses(facade, world)
+    for name in names:
+        assert world[name].id not in body, f"{name} is still referenced"
+
+
+def test_deleted_user_and_dependents_disappear_at_once(facade, world):
+    facade.delete_user(world['guest'].id)
+
+    assert facade.get_user(world['guest'].id) is None
+    assert facade.get_place(world['guest_place'].id) is None
+    with pytest.raises(ValueError):
+        facade.get_review(world['guest_review'].id)
+    assert facade.get_booking(world['booking'].id) is None
+    _assert_absent(facade, world, 'guest', 'guest_place', 'guest_review', 'host_review', 'booking')
+    assert facade.get_place(world['host_place'].id)['amenities'][0]['id'] == world['wifi'].id
+
+
+def test_sweep_removes_dependents_without_leaving_references(facade, world):
+    facade.delete_user(world['guest'].id)
+    while facade.sweep():
+        pass
+
+    for kind, name in (('user', 'guest'), ('place', 'guest_place'), ('review', 'guest_review'),
+                       ('review', 'host_review'), ('booking', 'booking')):
+        assert getattr(facade, f"{kind}_repo").backend.get(world[name].id) is None
+    assert world['guest_review'].id not in world['host_place'].reviews
+    _assert_absent(facade, world, 'guest', 'guest_place', 'guest_review', 'host_review', 'booking')
+    assert facade.get_place_rating(world['host_place'].id) == 0.0
+
+
+def test_deleted_amenity_is_detached_from_places(facade, world):
+    facade.delete_amenity(world['wifi'].id)
+
+    assert facade.get_place(world['host_place'].id)['amenities'] == []
+    _assert_absent(facade, world, 'wifi')
+
+    while facade.sweep():
+        pass
+    assert world['host_place'].amenities == []
+    assert facade.get_place(world['host_place'].id) is not None
+    _assert_absent(facade, world, 'wifi')
+
+
+def test_deleted_place_takes_its_reviews_and_bookings(facade, world):
+    facade.delete_place(world['host_place'].id)
+
+    with pytest.raises(ValueError):
+        facade.get_review(world['guest_review'].id)
+    assert facade.get_user(world['guest'].id) is not None
+    assert facade.get_user_dashboard(world['host'].id)['places'] == []
+    while facade.sweep():
+        pass
+    assert facade.booking_calendar.is_free(world['host_place'].id, date(2030, 1, 1), date(2030, 1, 4))
+
+
+def test_concurrent_sweeps_purge_every_deletion(make_user, make_place):
+    engine = ReferentialIntegrity()
+    users = [make_user() for _ in range(20)]
+    places = [make_place(owner=user) for user in users]
+    for user, place in zip(users, places):
+        engine.link('place', place)
+        engine.delete('user', user.id)
+    objects = {obj.id: obj for obj in users + places}
+    purged = []
+
+    def purge(kind, obj_id):
+        # Yield mid-sweep, between reading the front of the queue and popping it
+        time.sleep(0.001)
+        purged.append((kind, obj_id))
+        return objects.pop(obj_id, None)
+
+    threads = [threading.Thread(target=engine.sweep, args=(1000, purge, None)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert engine.pending == 0
+    assert sorted(purged) == sorted([('user', user.id) for user in users] + [('place', place.id) for place in places])
+    assert not any(engine._tombstones.values())
@@ -0,0 +1,32 @@
+from app.api.ratelimit import InMemoryBucketStore
+
+
+def _limited_client(make_app, **config):
+    app = make_app(RATE_LIMIT_ENABLED=True, RATE_LIMIT_RATE=0.001, RATE_LIMIT_BURST=3, RATE_LIMIT_COSTS={},
+                   **config)
+    return app.test_client()
+
+
+def test_client_supplied_header_does_not_reset_the_bucket(make_app):
+    client = _limited_client(make_app)
+    statuses = [client.get('/api/v1/amenities/', headers={'X-User-Id': str(i)}).status_code for i in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+
+
+def test_key_header_is_opt_in(make_app):
+    client = _limited_client(make_app, RATE_LIMIT_KEY_HEADER='X-User-Id')
+    for _ in range(3):
+        assert client.get('/api/v1/amenities/', headers={'X-User-Id': 'alice'}).status_code == 200
+    assert client.get('/api/v1/amenities/', headers={'X-User-Id': 'alice'}).status_code == 429
+    assert client.get('/api/v1/amenities/', headers={'X-User-Id': 'bob'}).status_code == 200
+
+
+def test_store_evicts_least_recently_used_buckets():
+    store = InMemoryBucketStore(max_keys=3)
+    for key in ('a', 'b', 'c'):
+        store.take(key, 1, 0.001, 1)
+    assert store.take('a', 1, 0.001, 1)[0] is False
+    # 'b' is now the least recently used and makes room for 'd'
+    store.take('d', 1, 0.001, 1)
+    assert list(store._buckets) == ['c', 'a', 'd']
+    assert store.take('a', 1, 0.001, 1)[0] is False
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.review import Review
+from app.persistence.repository import InMemoryRepository
+from app.persistence.tiered import SegmentStore, TieredRepository
+from app.services.facade import HBnBFacade
+from app.services.identity import ScopedRepository
+
+
+@pytest.fixture
+def archive(facade, monkeypatch, tmp_path):
+    """
+    Give the facade a tiered review repository of its own for the test.
+    """
+    repo = TieredRepository(InMemoryRepository(), SegmentStore(str(tmp_path / 'reviews.seg')), timedelta(days=1))
+    monkeypatch.setattr(facade, 'review_repo', ScopedRepository(repo, 'review', facade._is_live))
+    yield repo
+    repo.cold.close()
+
+
+def test_update_of_archived_review_keeps_rating_current(facade, archive, make_user, make_place):
+    place = make_place()
+    review = facade.create_review({'text': 'Poor', 'rating': 1, 'place_id': place.id,
+                                   'user_id': make_user().id})
+    assert archive.archive(now=datetime.now() + timedelta(days=2)) == 1
+    assert review.id in archive.cold
+
+    updated = facade.update_review(review.id, rating=5)
+
+    assert updated.rating == 5
+    assert facade.get_review(review.id).rating == 5
+    assert facade.rating_totals[place.id] == [5, 1]
+    assert facade.get_place_rating(place.id) == 5.0
+    event = facade.change_log.read(facade.change_log.last_seq - 1)[0][-1]
+    assert (event['id'], event['version']) == (review.id, updated.version)
+    assert updated.version > review.version
+
+
+def test_review_archive_is_enabled_once(facade, monkeypatch, tmp_path):
+    monkeypatch.setattr(HBnBFacade, '_shared_review_repo', InMemoryRepository())
+    monkeypatch.setattr(facade, 'review_repo', facade.review_repo)
+    first = HBnBFacade.enable_review_archive(str(tmp_path / 'reviews.seg'), 1)
+    try:
+        first.cold.append([Review('Fine', 3, 'place', 'user')])
+        second = HBnBFacade.enable_review_archive(str(tmp_path / 'reviews.seg'), 1)
+
+        assert second is first
+        assert type(second.hot) is InMemoryRepository
+        assert len(first.cold) == 1
+        assert first.cold.get(first.cold.ids()[0]) is not None
+    finally:
+        first.cold.close()
@@ -0,0 +1,66 @@
+import threading
+import uuid
+import pytest
+from app.persistence.repository import ConflictError
+
+
+def test_concurrent_signups_with_one_email_create_one_user(facade):
+    email = f"{uuid.uuid4().hex}@example.com"
+    barrier = threading.Barrier(32)
+    created = []
+    conflicts = []
+
+    def signup(i):
+        # The same address, differently cased
+        address = email.upper() if i % 2 else email
+        barrier.wait()
+        try:
+            created.append(facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                               'email': address, 'password': 'secret'}))
+        except ConflictError as e:
+            conflicts.append(e)
+
+    threads = [threading.Thread(target=signup, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert len(conflicts) == 31
+    assert all(e.attr_name == 'email' for e in conflicts)
+    assert facade.get_user_by_email(email.upper()).id == created[0].id
+
+
+def test_concurrent_email_changes_to_one_address_keep_it_unique(facade, make_user):
+    email = f"{uuid.uuid4().hex}@example.com"
+    users = [make_user() for _ in range(16)]
+    barrier = threading.Barrier(len(users))
+    moved = []
+
+    def change(user):
+        barrier.wait()
+        try:
+            facade.update_user(user.id, {'email': email})
+            moved.append(user)
+        except ConflictError:
+            pass
+
+    threads = [threading.Thread(target=change, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(moved) == 1
+    assert [user.email for user in users].count(email) == 1
+    assert facade.get_user_by_email(email) is moved[0]
+
+
+def test_released_email_can_be_registered_again(facade, make_user):
+    user = make_user()
+    email = user.email
+    facade.update_user(user.id, {'email': f"{uuid.uuid4().hex}@example.com"})
+    assert make_user(email=email.title()).email == email.title()
+    with pytest.raises(ConflictError):
+        make_user(email=email)